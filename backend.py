@@ -1,13 +1,35 @@
+import os
+import asyncio
 import pandas as pd
-import io
-import aiohttp
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import shutil
+import tempfile
+from functools import partial
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import create_engine
+from typing import Any, Dict, List, Optional
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
 # ✅ Clean Imports (No sys.path hacks needed if file is in root)
 from scripts.ai_agent import AIAgent
+from scripts.api_ingestion import (
+    API_MAX_CONCURRENCY, API_MAX_PAGES, ApiClient, ApiError, Pagination, find_records, flatten_records,
+)
+from scripts.backpressure import BlockingWorkPool, Overloaded
+from scripts.batch_stream import STREAM_FORMATS, BatchStream, format_event
+from scripts.csv_ingestion import CSV_SNIFF_BYTES, pandas_read_kwargs, read_csv_fast, sniff_csv
 from scripts.data_cleaning import DataCleaning
+from scripts.data_ingestions import read_sql_chunks, reservoir_sample
+from scripts.deduplication import drop_near_duplicates
+from scripts.db_engines import engine_registry
+from scripts.db_writer import BulkLoad, write_frames
+from scripts.excel_ingestion import read_excel_fast
+from scripts.incremental_cleaning import IncrementalCleaner, WatermarkStore
+from scripts.jobs import FINISHED, JobManager
+from scripts.response_formats import MEDIA_TYPES, encode_result, negotiate
+from scripts.streaming_pipeline import CsvSink, StreamingCleaner
 
 app = FastAPI()
 
@@ -15,43 +37,266 @@ app = FastAPI()
 ai_agent = AIAgent()
 cleaner = DataCleaning()
 
+# CSV uploads larger than this are cleaned chunk by chunk and returned as a CSV download
+STREAMING_THRESHOLD_MB = int(os.getenv("STREAMING_THRESHOLD_MB", "200"))
+STREAMING_CHUNKSIZE = int(os.getenv("STREAMING_CHUNKSIZE", "100000"))
+
+# Incremental /clean-db runs: per-query watermark and global fill statistics
+incremental_cleaner = IncrementalCleaner(
+    cleaner=cleaner,
+    store=WatermarkStore(os.getenv("INCREMENTAL_STATE_PATH") or None),
+    chunksize=STREAMING_CHUNKSIZE,
+)
+
+# Parsing, cleaning and LLM calls are blocking; they run on this bounded pool, never on the event loop
+work_pool = BlockingWorkPool(
+    max_in_flight=int(os.getenv("MAX_INFLIGHT_JOBS", "4")),
+    max_queued=int(os.getenv("MAX_QUEUED_JOBS", "16")),
+)
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request, exc):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# Long cleaning runs go through the job API instead of holding a request open
+job_manager = JobManager(
+    max_workers=int(os.getenv("JOB_WORKERS", "2")),
+    max_queued=int(os.getenv("JOB_MAX_QUEUED", "32")),
+    max_retained=int(os.getenv("JOB_MAX_RETAINED", "50")),
+    retention_seconds=float(os.getenv("JOB_RETENTION_SECONDS", "3600")),
+)
+
+# One pooled HTTP session for every /clean-api fetch, opened and closed with the app
+api_client = ApiClient()
+
+@app.on_event("startup")
+async def start_api_client():
+    await api_client.start()
+
+@app.on_event("shutdown")
+async def close_api_client():
+    await api_client.close()
+
+@app.on_event("shutdown")
+def shutdown_work_pool():
+    work_pool.shutdown()
+    job_manager.shutdown()
+    engine_registry.dispose_all()
+
+@app.get("/health")
+async def health():
+    """Liveness check that also reports how busy the blocking work pool is."""
+    return {"status": "ok", "work_pool": work_pool.stats()}
+
+@app.get("/db/pool-stats")
+async def db_pool_stats():
+    """Shared database engines and their connection pool status."""
+    return engine_registry.stats()
+
+def response_format(request, fmt=None):
+    """Negotiated body format: ?format= (json, columns, arrow, parquet) or the Accept header."""
+    try:
+        return negotiate(request.headers.get("accept"), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def render(result, fmt="json", frame=None):
+    """
+    Encodes a pipeline helper's result (frames + extras) in the negotiated format.
+    arrow/parquet bodies hold one frame: ?frame= (default cleaned_data). Results without frames are JSON.
+    """
+    if not isinstance(result, dict):
+        return result
+    if fmt in ("arrow", "parquet") and not any(isinstance(value, pd.DataFrame) for value in result.values()):
+        fmt = "json"
+    try:
+        body = encode_result(result, fmt, frame)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    if fmt == "json":
+        return JSONResponse(jsonable_encoder(body))
+    return Response(body, media_type=MEDIA_TYPES[fmt])
+
+def as_response(fmt, frame, fn, *args):
+    """Runs `fn` and also encodes its result on the worker, so big responses don't stall the loop."""
+    return render(fn(*args), fmt, frame)
+
+def stream_cleaning(fmt, fn, *args):
+    """
+    Streams a pipeline helper's progress as NDJSON (?stream=ndjson) or SSE (?stream=sse):
+    cleaned rows are sent batch by batch as the LLM answers, then a final "done" event.
+    """
+    if fmt not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown stream format '{fmt}'. Use ndjson or sse.")
+    work_pool.ensure_capacity()
+    stream = BatchStream(asyncio.get_running_loop(), fmt)
+    task = asyncio.ensure_future(work_pool.run(fn, *args, stream))
+    return StreamingResponse(stream.events(task), media_type=stream.media_type)
+
 # ----------------------- CSV / Excel Cleaning Endpoint -----------------------------
 
+def agent_hooks(job):
+    """Progress/cancel hooks for AIAgent.process_data when running as a job."""
+    if job is None:
+        return {}
+    job.set_stage("ai cleaning")
+    return job.agent_hooks()
+
+def clean_in_chunks(source, filename, job=None, **read_kwargs):
+    """
+    Rule-based cleaning of a CSV file or chunk factory in bounded memory. The cleaned rows go
+    out as rows events on a streamed response, or to a CSV file returned as a download.
+    `read_kwargs` go to pd.read_csv for CSV sources.
+    """
+    if isinstance(job, BatchStream):
+        # Streamed response: each cleaned chunk goes straight out as a rows event
+        job.set_stage("streaming rule-based cleaning")
+        StreamingCleaner(cleaner=cleaner, chunksize=STREAMING_CHUNKSIZE).run(source, job, **read_kwargs)
+        return None
+    output = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
+    output.close()
+    if job is not None:
+        job.set_stage("streaming rule-based cleaning")
+        # A job's result can be downloaded more than once; the file goes when the job is evicted
+        job.temp_files.append(output.name)
+    StreamingCleaner(cleaner=cleaner, chunksize=STREAMING_CHUNKSIZE).run(source, CsvSink(output.name), **read_kwargs)
+    return FileResponse(
+        output.name,
+        media_type="text/csv",
+        filename=f"cleaned_{filename}",
+        background=None if job is not None else BackgroundTask(os.remove, output.name),
+    )
+
+def excel_options(sheets=None, header=None):
+    """
+    /clean-data Excel query parameters -> read_excel_fast options. `sheets` is "all" or a
+    comma-separated list of sheet names, read into one frame with a "sheet" column; `header`
+    is "auto" or the 0-based header row.
+    """
+    options = {}
+    if sheets:
+        options["sheet_name"] = None if sheets == "all" else [name.strip() for name in sheets.split(",")]
+        options["combine"] = True
+    if header:
+        if header != "auto" and not header.isdigit():
+            raise HTTPException(status_code=400, detail="header must be 'auto' or a row number.")
+        options["header"] = header if header == "auto" else int(header)
+    return options
+
+def near_duplicate_columns(near_duplicates=None):
+    """?near_duplicates=city,name -> ["city", "name"], or None."""
+    if not near_duplicates:
+        return None
+    return [col.strip() for col in near_duplicates.split(",") if col.strip()]
+
+def remove_near_duplicates(df, columns):
+    """(deduplicated frame, cluster report) for the near-duplicate `columns` of a cleaned frame."""
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown near_duplicates column(s): {', '.join(map(str, missing))}.")
+    return drop_near_duplicates(df, columns, return_clusters=True)
+
+def clean_upload(upload, filename, job=None, excel=None, near_duplicates=None):
+    """
+    Blocking part of /clean-data: parse the spooled upload and run both cleaning stages.
+    `excel` holds read_excel_fast options for .xlsx uploads (see excel_options).
+    `near_duplicates` lists columns on which near-duplicate rows are dropped before the AI
+    stage; the clusters found are returned as "duplicate_clusters".
+    """
+    file_extension = filename.split(".")[-1]
+
+    # The upload is already spooled to disk by Starlette; parse it from there
+    # instead of copying the bytes and a decoded string into memory
+    upload.seek(0, os.SEEK_END)
+    file_size = upload.tell()
+    upload.seek(0)
+
+    if file_extension == "csv":
+        # Encoding and delimiter from the first bytes, for whichever reader parses the rest
+        dialect = sniff_csv(upload.read(CSV_SNIFF_BYTES))
+        upload.seek(0)
+
+    # Large CSVs: rule-based cleaning in bounded-memory chunks, streamed to a CSV download
+    if file_extension == "csv" and file_size > STREAMING_THRESHOLD_MB * 1024 * 1024:
+        return clean_in_chunks(upload, filename, job, **pandas_read_kwargs(dialect))
+
+    # Load file into Pandas DataFrame
+    if file_extension == "csv":
+        # Multithreaded parse straight from a memory map of the spooled file
+        df = read_csv_fast(upload, dialect)
+    elif file_extension == "xlsx":
+        # An upload saved to a named file (jobs, streams) lets sheets be read by parallel processes
+        path = getattr(upload, "name", None)
+        df = read_excel_fast(path if isinstance(path, str) and os.path.isfile(path) else upload, **(excel or {}))
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file format. Use CSV or Excel.")
+
+    # Step 1: Rule-Based Cleaning (Fast, handles obvious errors)
+    if job is not None:
+        job.set_stage("rule-based cleaning")
+    df_cleaned = cleaner.clean_data(df)
+    extra = {}
+    if near_duplicates:
+        # Rows the LLM would otherwise be asked to merge never reach it
+        df_cleaned, extra["duplicate_clusters"] = remove_near_duplicates(df_cleaned, near_duplicates)
+
+    # Step 2: AI-Powered Cleaning (Smart, handles logic/context)
+    df_ai_cleaned = ai_agent.process_data(df_cleaned, **agent_hooks(job))
+
+    # Ensure AI output is converted back to a DataFrame
+    # Note: This assumes the AI returns a valid CSV string.
+    if isinstance(df_ai_cleaned, str):
+        from io import StringIO
+        # Wrap in try-except in case AI returns conversational text
+        try:
+            df_ai_cleaned = pd.read_csv(StringIO(df_ai_cleaned))
+        except Exception:
+            # Fallback: if AI output isn't perfect CSV, return the raw text for debugging
+            return {"cleaned_data": pd.DataFrame(), "raw_ai_response": df_ai_cleaned, **extra}
+
+    return {"cleaned_data": df_ai_cleaned, **extra}
+
+def save_upload(upload, suffix):
+    """Copies a spooled upload to a temp file that outlives the request."""
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as output:
+        upload.seek(0)
+        shutil.copyfileobj(upload, output)
+    return output.name
+
+def clean_saved_upload(path, filename, job=None, excel=None, near_duplicates=None):
+    """clean_upload for an upload copied out with save_upload; the copy is removed afterwards."""
+    try:
+        with open(path, "rb") as upload:
+            return clean_upload(upload, filename, job, excel, near_duplicates)
+    finally:
+        os.remove(path)
+
 @app.post("/clean-data")
 
-async def clean_data(file: UploadFile = File(...)):
+async def clean_data(request: Request, file: UploadFile = File(...), stream: Optional[str] = None,
+                     fmt: Optional[str] = Query(None, alias="format"), sheets: Optional[str] = None,
+                     header: Optional[str] = None, near_duplicates: Optional[str] = None,
+                     frame: Optional[str] = None):
     """Receives file from UI, cleans it using rule-based & AI methods, and returns cleaned JSON."""
     try:
-        contents = await file.read()
-        file_extension = file.filename.split(".")[-1]
-
-        # Load file into Pandas DataFrame
-        if file_extension == "csv":
-            df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
-        elif file_extension == "xlsx":
-            df = pd.read_excel(io.BytesIO(contents))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Use CSV or Excel.")
-
-        # Step 1: Rule-Based Cleaning (Fast, handles obvious errors)
-        df_cleaned = cleaner.clean_data(df)
-
-        # Step 2: AI-Powered Cleaning (Smart, handles logic/context)
-        df_ai_cleaned = ai_agent.process_data(df_cleaned)
-
-        # Ensure AI output is converted back to a DataFrame
-        # Note: This assumes the AI returns a valid CSV string.
-        if isinstance(df_ai_cleaned, str):
-            from io import StringIO
-            # Wrap in try-except in case AI returns conversational text
+        fmt = response_format(request, fmt)
+        options = {"excel": excel_options(sheets, header), "near_duplicates": near_duplicate_columns(near_duplicates)}
+        if stream:
+            # The upload is closed when this handler returns, before the stream is consumed
+            path = await run_in_threadpool(save_upload, file.file, os.path.splitext(file.filename)[1])
             try:
-                df_ai_cleaned = pd.read_csv(StringIO(df_ai_cleaned))
+                return stream_cleaning(stream, partial(clean_saved_upload, **options), path, file.filename)
             except Exception:
-                # Fallback: if AI output isn't perfect CSV, return the raw text for debugging
-                return {"cleaned_data": [], "raw_ai_response": df_ai_cleaned}
-
-        return {"cleaned_data": df_ai_cleaned.to_dict(orient="records")}
+                os.remove(path)
+                raise
+        return await work_pool.run(as_response, fmt, frame, partial(clean_upload, **options), file.file, file.filename)
 
+    except (HTTPException, Overloaded):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
@@ -60,87 +305,279 @@ async def clean_data(file: UploadFile = File(...)):
 class DBQuery(BaseModel):
     db_url: str
     query: str
+    # Preview controls: keep only the first `limit` rows / a uniform sample of `sample_rows` rows
+    limit: Optional[int] = None
+    sample_rows: Optional[int] = None
+    # Rule-based cleaning only, chunk by chunk over a server-side cursor, returned as a CSV download
+    chunked: bool = False
+    # Write the cleaned rows back to this table: append, replace (atomic swap) or upsert on key_columns
+    write_table: Optional[str] = None
+    write_mode: str = "append"
+    key_columns: Optional[List[str]] = None
+    # Incremental mode: only rows with watermark_column at or above the last run's are cleaned and
+    # upserted into write_table on key_columns (AI stage included unless chunked)
+    watermark_column: Optional[str] = None
+    full_refresh: bool = False
 
-@app.post("/clean-db")
-async def clean_db(query: DBQuery):
-    """Fetches data from a database, cleans it using AI, and returns raw and cleaned JSON."""
-    try:
-        engine = create_engine(query.db_url)
-        df = pd.read_sql(query.query, engine)
+def clean_db_query(query, job=None):
+    """Blocking part of /clean-db: stream the query result and run both cleaning stages."""
+    # Shared pooled engine: repeated queries reuse open connections
+    engine = engine_registry.get(query.db_url)
 
-        # Step 1: Rule-Based Cleaning
-        df_cleaned = cleaner.clean_data(df)
+    if query.watermark_column:
+        if not (query.write_table and query.key_columns):
+            raise HTTPException(status_code=400, detail="Incremental cleaning needs write_table and key_columns.")
+        if job is not None:
+            job.set_stage("incremental cleaning")
+        stats = incremental_cleaner.run(
+            engine, query.query, query.watermark_column, query.write_table, query.key_columns,
+            db_url=query.db_url,
+            ai_agent=None if query.chunked else ai_agent,
+            full_refresh=query.full_refresh,
+            **agent_hooks(job),
+        )
+        return {"incremental": stats}
 
-        # Step 2: AI-Powered Cleaning
-        df_ai_cleaned = ai_agent.process_data(df_cleaned)
+    if query.chunked:
+        # Results larger than RAM: the cursor is read twice (profile, then clean), one chunk at a time
+        chunks = lambda: read_sql_chunks(engine, query.query, chunksize=STREAMING_CHUNKSIZE, limit=query.limit)
+        if query.write_table:
+            # Cleaned chunks are bulk-loaded into the table instead of being returned
+            if job is not None:
+                job.set_stage("streaming rule-based cleaning")
+            sink = BulkLoad(engine, query.write_table, mode=query.write_mode, key_columns=query.key_columns)
+            try:
+                StreamingCleaner(cleaner=cleaner, chunksize=STREAMING_CHUNKSIZE).run(chunks, sink)
+            except Exception:
+                sink.abort()
+                raise
+            return {"written": sink.stats}
+        return clean_in_chunks(chunks, "query.csv", job)
 
-        # Convert AI cleaned data to DataFrame
-        if isinstance(df_ai_cleaned, str):
-            from io import StringIO
-            df_ai_cleaned = pd.read_csv(StringIO(df_ai_cleaned))
+    chunks = read_sql_chunks(engine, query.query, chunksize=STREAMING_CHUNKSIZE, limit=query.limit)
+    if query.sample_rows:
+        df = reservoir_sample(chunks, query.sample_rows)
+    else:
+        parts = list(chunks)
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    # Step 1: Rule-Based Cleaning
+    df_cleaned = cleaner.clean_data(df)
+
+    # Step 2: AI-Powered Cleaning
+    df_ai_cleaned = ai_agent.process_data(df_cleaned, **agent_hooks(job))
 
-        return {
-            "raw_data": df.to_dict(orient="records"),
-            "cleaned_data": df_ai_cleaned.to_dict(orient="records")
-        }
+    # Convert AI cleaned data to DataFrame
+    if isinstance(df_ai_cleaned, str):
+        from io import StringIO
+        df_ai_cleaned = pd.read_csv(StringIO(df_ai_cleaned))
+
+    result = {
+        "raw_data": df,
+        "cleaned_data": df_ai_cleaned
+    }
+    if query.write_table:
+        if job is not None:
+            job.set_stage("writing back")
+        result["written"] = write_frames(
+            engine, df_ai_cleaned, query.write_table, mode=query.write_mode, key_columns=query.key_columns
+        )
+    return result
+
+@app.post("/clean-db")
+async def clean_db(request: Request, query: DBQuery, stream: Optional[str] = None,
+                   fmt: Optional[str] = Query(None, alias="format"), frame: Optional[str] = None):
+    """Fetches data from a database, cleans it using AI, and returns raw and cleaned JSON."""
+    try:
+        fmt = response_format(request, fmt)
+        if stream:
+            return stream_cleaning(stream, clean_db_query, query)
+        return await work_pool.run(as_response, fmt, frame, clean_db_query, query)
 
+    except (HTTPException, Overloaded):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching data from database: {str(e)}")
 
 # ----------------------- API Data Cleaning Endpoint -----------------------------
 
+class APIPagination(BaseModel):
+    # page | offset | cursor (see scripts/api_ingestion.Pagination)
+    style: str
+    page_param: str = "page"
+    offset_param: str = "offset"
+    size_param: Optional[str] = None
+    page_size: Optional[int] = None
+    start: Optional[int] = None
+    cursor_param: str = "cursor"
+    cursor_path: str = "next"
+    total_path: Optional[str] = None
+    max_pages: int = API_MAX_PAGES
+    concurrency: int = API_MAX_CONCURRENCY
+
 class APIRequest(BaseModel):
     api_url: str
+    params: Optional[Dict[str, Any]] = None
+    # Dotted path to the records list (e.g. "data.items"); default: the first list found
+    records_path: Optional[str] = None
+    pagination: Optional[APIPagination] = None
+
+async def fetch_api_json(api_request):
+    """Fetches every page of records for /clean-api; stays on the event loop (async I/O)."""
+    try:
+        pagination = Pagination(**api_request.pagination.model_dump()) if api_request.pagination else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return await api_client.fetch_records(
+            api_request.api_url, api_request.params, pagination, api_request.records_path
+        )
+    except ApiError:
+        raise HTTPException(status_code=400, detail="Failed to fetch data from API.")
+
+def clean_api_payload(data, job=None):
+    """Blocking part of /clean-api: flatten the JSON records and run both cleaning stages."""
+    # Nested objects become "parent.child" columns; lists are stringified (unhashable otherwise)
+    df = flatten_records(find_records(data))
+
+    # Step 1: Rule-Based Cleaning
+    df_cleaned = cleaner.clean_data(df)
+
+    # Step 2: AI-Powered Cleaning
+    df_ai_cleaned = ai_agent.process_data(df_cleaned, **agent_hooks(job))
+
+    # Convert AI cleaned data back to DataFrame if it's a string
+    if isinstance(df_ai_cleaned, str):
+        from io import StringIO
+        try:
+            df_ai_cleaned = pd.read_csv(StringIO(df_ai_cleaned))
+        except Exception:
+            # Fallback if AI returns text instead of CSV
+            df_ai_cleaned = pd.DataFrame([{"error": "AI response was not valid CSV", "raw": df_ai_cleaned}])
+
+    # Return BOTH raw and cleaned data
+    return {
+        "raw_data": df,
+        "cleaned_data": df_ai_cleaned
+    }
 
 @app.post("/clean-api")
-async def clean_api(api_request: APIRequest):
+async def clean_api(request: Request, api_request: APIRequest, stream: Optional[str] = None,
+                    fmt: Optional[str] = Query(None, alias="format"), frame: Optional[str] = None):
     """Fetches data from an API, cleans it using AI, and returns comparison JSON."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_request.api_url) as response:
-                if response.status != 200:
-                    raise HTTPException(status_code=400, detail="Failed to fetch data from API.")
-
-                data = await response.json()
-                
-                # 1. Handle Nested JSON (e.g. {'products': [...]})
-                if isinstance(data, dict):
-                    for key, value in data.items():
-                        if isinstance(value, list):
-                            data = value
-                            break
-                
-                df = pd.DataFrame(data)
-
-                # 2. FIX: Convert Lists/Dicts to Strings to avoid "Unhashable type" error
-                for col in df.columns:
-                    if df[col].apply(lambda x: isinstance(x, (list, dict))).any():
-                        df[col] = df[col].astype(str)
-
-        # Step 1: Rule-Based Cleaning
-        df_cleaned = cleaner.clean_data(df)
-
-        # Step 2: AI-Powered Cleaning
-        df_ai_cleaned = ai_agent.process_data(df_cleaned)
-
-        # Convert AI cleaned data back to DataFrame if it's a string
-        if isinstance(df_ai_cleaned, str):
-            from io import StringIO
-            try:
-                df_ai_cleaned = pd.read_csv(StringIO(df_ai_cleaned))
-            except Exception:
-                # Fallback if AI returns text instead of CSV
-                df_ai_cleaned = pd.DataFrame([{"error": "AI response was not valid CSV", "raw": df_ai_cleaned}])
-
-        # Return BOTH raw and cleaned data
-        return {
-            "raw_data": df.fillna("").to_dict(orient="records"),
-            "cleaned_data": df_ai_cleaned.to_dict(orient="records")
-        }
+        fmt = response_format(request, fmt)
+        # The fetch is async I/O and stays on the event loop
+        data = await fetch_api_json(api_request)
+        if stream:
+            return stream_cleaning(stream, clean_api_payload, data)
+        return await work_pool.run(as_response, fmt, frame, clean_api_payload, data)
 
+    except (HTTPException, Overloaded):
+        raise
     except Exception as e:
         print(f"❌ API Error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing API data: {str(e)}")
+# ----------------------- Cleaning Jobs -----------------------------
+# Submit returns 202 with a job id at once; poll GET /jobs/{id} for batch progress (or stream
+# GET /jobs/{id}/events for progress plus each batch's rows), DELETE /jobs/{id} to cancel and
+# GET /jobs/{id}/result for the same body the sync endpoint returns.
+
+def run_upload_job(job, path, filename, excel=None, near_duplicates=None):
+    return clean_saved_upload(path, filename, job, excel, near_duplicates)
+
+def get_job_or_404(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    return job
+
+@app.post("/jobs/clean-data", status_code=202)
+async def submit_clean_data_job(file: UploadFile = File(...), sheets: Optional[str] = None,
+                                header: Optional[str] = None, near_duplicates: Optional[str] = None):
+    """Queues a /clean-data run for the uploaded file and returns its job id."""
+    excel = excel_options(sheets, header)
+    columns = near_duplicate_columns(near_duplicates)
+    path = await run_in_threadpool(save_upload, file.file, os.path.splitext(file.filename)[1])
+    try:
+        job = job_manager.submit("clean-data", run_upload_job, path, file.filename, excel, columns)
+    except Overloaded:
+        os.remove(path)
+        raise
+    return job.to_dict()
+
+@app.post("/jobs/clean-db", status_code=202)
+async def submit_clean_db_job(query: DBQuery):
+    """Queues a /clean-db run and returns its job id."""
+    job = job_manager.submit(
+        "clean-db", lambda job: clean_db_query(query, job)
+    )
+    return job.to_dict()
+
+@app.post("/jobs/clean-api", status_code=202)
+async def submit_clean_api_job(api_request: APIRequest):
+    """Fetches the API payload, then queues its cleaning and returns the job id."""
+    try:
+        data = await fetch_api_json(api_request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching API data: {str(e)}")
+    job = job_manager.submit("clean-api", lambda job: clean_api_payload(data, job))
+    return job.to_dict()
+
+@app.get("/jobs")
+async def list_jobs():
+    return {"jobs": job_manager.list()}
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status, current stage and LLM batches completed out of total."""
+    return get_job_or_404(job_id).to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, stream: str = "ndjson"):
+    """
+    Streams the job's events (stage, rows per finished batch, progress) as NDJSON or SSE,
+    from the start, and ends with a "done" event carrying the final status.
+    """
+    job = get_job_or_404(job_id)
+    if stream not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown stream format '{stream}'. Use ndjson or sse.")
+
+    async def generate():
+        sent = 0
+        while True:
+            # Read the status first so no event logged just before finishing is missed
+            finished = job.status in FINISHED
+            events = job.replay(sent)
+            for event in events:
+                yield format_event(event, stream)
+            sent += len(events)
+            if finished and sent == len(job.events):
+                yield format_event({"type": "done", **job.to_dict()}, stream)
+                return
+            await asyncio.sleep(0.2)
+
+    return StreamingResponse(generate(), media_type=STREAM_FORMATS[stream])
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    get_job_or_404(job_id)
+    return job_manager.cancel(job_id).to_dict()
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str, request: Request, fmt: Optional[str] = Query(None, alias="format"),
+                     frame: Optional[str] = None):
+    """
+    The finished job's response, in the negotiated format (see /clean-data); with arrow/parquet,
+    one frame per request (?frame=raw_data, ...). 409 while it is still queued/running or if it did not succeed.
+    """
+    job = get_job_or_404(job_id)
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=job.to_dict())
+    return await run_in_threadpool(render, job.result, response_format(request, fmt), frame)
+
 # ----------------------- Run Server -----------------------------
 
 if __name__ == "__main__":
@@ -1,39 +1,294 @@
 import os
+import io
+import json
+import math
+import random
+import time
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI, HarmBlockThreshold, HarmCategory
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel
 
+from scripts.data_cleaning import CleaningRules, DataCleaning
+from scripts.hedging import HedgedCaller
+from scripts.llm_cache import LLMCache, make_cache_key
+from scripts.rate_limiter import RateLimiter
+from scripts.run_checkpoints import CheckpointStore, make_run_id
+
 # Load environment variables
 load_dotenv()
 google_api_key = os.getenv("GOOGLE_API_KEY")
 
-if not google_api_key:
-    raise ValueError("❌ GOOGLE_API_KEY is missing. Please set it in your .env file.")
-
-# Define AI Model (Gemini)
-# Using 'gemini-flash-latest' as confirmed by your diagnostic test
-llm = ChatGoogleGenerativeAI(
-    model="gemini-flash-latest", 
-    google_api_key=google_api_key,
-    temperature=0,
-    safety_settings={
-        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-    }
-)
+# Concurrency and quota defaults for batch dispatch (override per agent or per call)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "1"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None
+
+# Estimated data tokens per cleaning request when batches are sized adaptively.
+# The model echoes the batch back, so this also bounds the response size.
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "3000"))
+
+# "rows": the LLM rewrites every batch; "rules": the LLM emits rules once and pandas applies them
+AI_CLEANING_MODE = os.getenv("AI_CLEANING_MODE", "rows")
+
+# Only send rows/columns flagged by DataCleaning.detect_problem_cells to the LLM in "rows" mode
+AI_ONLY_PROBLEM_ROWS = os.getenv("AI_ONLY_PROBLEM_ROWS", "0") == "1"
+
+# Synthetic key column used to merge partial AI output back into the full frame
+ROW_KEY = "__row_id"
+
+# Response cache settings (set LLM_CACHE_ENABLED=0 to always call the model)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or None
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Per-batch checkpoints: a rerun of the same data resumes instead of paying for finished batches again
+LLM_CHECKPOINT_ENABLED = os.getenv("LLM_CHECKPOINT_ENABLED", "1") != "0"
+LLM_CHECKPOINT_PATH = os.getenv("LLM_CHECKPOINT_PATH") or None
+LLM_CHECKPOINT_TTL_SECONDS = int(os.getenv("LLM_CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# A failed or invalid batch is retried on its own with exponential backoff (base * 2^n, jittered)
+LLM_BATCH_MAX_ATTEMPTS = int(os.getenv("LLM_BATCH_MAX_ATTEMPTS", "4"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1.0"))
+LLM_RETRY_MAX_SECONDS = 30.0
+
+# Tail latency: per-request deadline (0 = none; a timeout counts as a failed attempt) and hedging,
+# i.e. a duplicate request once a call is slower than the observed LLM_HEDGE_QUANTILE latency.
+# LLM_HEDGE_BUDGET caps duplicates as a fraction of requests (0.05 = at most 5% extra spend; 0 = off).
+LLM_REQUEST_DEADLINE_SECONDS = float(os.getenv("LLM_REQUEST_DEADLINE_SECONDS", "0")) or None
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0"))
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+
+
+def create_llm():
+    """Builds the Gemini chat model used by the agent."""
+    if not google_api_key:
+        raise ValueError("❌ GOOGLE_API_KEY is missing. Please set it in your .env file.")
+
+    # Define AI Model (Gemini)
+    # Using 'gemini-flash-latest' as confirmed by your diagnostic test
+    return ChatGoogleGenerativeAI(
+        model="gemini-flash-latest", 
+        google_api_key=google_api_key,
+        temperature=0,
+        safety_settings={
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        }
+    )
+
+
+def estimate_tokens(text):
+    """Rough token count for quota accounting (~4 characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def serialize_batch(df_batch):
+    """Compact CSV encoding of a batch: no index, no padding, and `pd.read_csv` reads it back exactly."""
+    return df_batch.to_csv(index=False)
+
+
+def plan_batches(df, token_budget):
+    """
+    Splits the frame into consecutive row ranges whose estimated CSV size fits `token_budget`.
+    Wide rows get small batches and narrow rows get large ones. Returns a list of (start, stop) positions.
+    """
+    if len(df) == 0:
+        return []
+
+    header_tokens = estimate_tokens(",".join(map(str, df.columns)) + "\n")
+    row_budget = max(token_budget - header_tokens, 1)
+
+    # Per-row CSV length: every cell's text plus one separator/newline per column
+    row_chars = np.full(len(df), len(df.columns), dtype=np.int64)
+    for col in df.columns:
+        row_chars += df[col].astype(str).str.len().to_numpy()
+    row_tokens = row_chars / 4
+
+    # A row goes into the batch in which it starts; a batch can overshoot by at most one row
+    starts = np.cumsum(row_tokens) - row_tokens
+    batch_ids = (starts // row_budget).astype(np.int64)
+    boundaries = [0] + (np.flatnonzero(np.diff(batch_ids)) + 1).tolist() + [len(df)]
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def join_csv_responses(responses):
+    """Concatenates per-batch CSV answers, keeping only the first batch's header row."""
+    if not responses:
+        return ""
+    header = responses[0].strip().split("\n", 1)[0].strip()
+    parts = [responses[0].strip()]
+    for response in responses[1:]:
+        response = response.strip()
+        first_line, _, rest = response.partition("\n")
+        parts.append(rest if first_line.strip() == header else response)
+    return "\n".join(part for part in parts if part)
+
+
+def validate_batch_response(response, columns):
+    """Raises ValueError unless `response` is CSV with exactly the batch's header columns."""
+    if not response or not response.strip():
+        raise ValueError("empty response")
+    try:
+        answer = pd.read_csv(io.StringIO(response))
+    except Exception as e:
+        raise ValueError(f"response is not valid CSV: {e}") from e
+    expected = [str(col) for col in columns]
+    if list(answer.columns) != expected:
+        raise ValueError(f"response columns {list(answer.columns)[:10]} do not match {expected[:10]}")
+
+
+def profile_columns(df, top_n=10):
+    """Per-column summary the model needs to write cleaning rules without seeing every row."""
+    profiles = []
+    for col in df.columns:
+        series = df[col]
+        profile = {
+            "column": str(col),
+            "dtype": str(series.dtype),
+            "null_count": int(series.isna().sum()),
+            "unique_count": int(series.nunique(dropna=True)),
+            "top_values": {str(k): int(v) for k, v in series.value_counts(dropna=True).head(top_n).items()},
+        }
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            profile.update(min=series.min(), max=series.max(), mean=series.mean())
+        else:
+            # Python-level types reveal mixed columns ("60k" next to 60000)
+            profile["value_types"] = series.dropna().map(lambda x: type(x).__name__).value_counts().to_dict()
+        profiles.append(profile)
+    return profiles
+
+
+def representative_sample(df, sample_size=50, random_state=0):
+    """Sample that over-represents rows with missing values, padded with a random draw of the rest."""
+    if len(df) <= sample_size:
+        return df
+    has_missing = df.isna().any(axis=1)
+    dirty = df[has_missing]
+    dirty = dirty.sample(min(len(dirty), sample_size // 2), random_state=random_state)
+    rest = df.drop(dirty.index)
+    rest = rest.sample(sample_size - len(dirty), random_state=random_state)
+    return pd.concat([dirty, rest]).sort_index()
+
+
+def parse_json_response(text):
+    """Pulls the JSON object out of a model reply, tolerating markdown fences and chatter."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("No JSON object found in model response.")
+    return json.loads(text[start:end + 1])
+
+
+def extract_text(content):
+    """Flattens a chat message's content (str or list of blocks) into plain text."""
+    # If content is a list (e.g. [{'type': 'text', ...}]), extract the text
+    if isinstance(content, list):
+        # Extract 'text' field if it exists, otherwise convert to string
+        text_parts = []
+        for block in content:
+            if isinstance(block, dict):
+                text_parts.append(block.get("text", ""))
+            else:
+                text_parts.append(str(block))
+        content = "".join(text_parts)
+
+    # Ensure it is definitively a string
+    return str(content)
+
+class BatchCancelled(Exception):
+    """Raised inside process_data when its cancel_event is set; no further batches are sent."""
+
+
+class BatchFailed(Exception):
+    """Some batches still failed after all retries; the others are checkpointed under `run_id`."""
+
+    def __init__(self, run_id, errors):
+        self.run_id = run_id
+        self.errors = errors
+        failed = ", ".join(str(index + 1) for index in sorted(errors)[:10])
+        super().__init__(
+            f"{len(errors)} batch(es) failed after retries (batch {failed}); "
+            f"rerun to resume run {run_id}. Last error: {next(iter(errors.values()))}"
+        )
+
 
 class CleaningState(BaseModel):
     input_text: str
     structured_response: str = ""
+    error: str = ""
 
 class AIAgent:
-    def __init__(self):
+    def __init__(self, llm=None, max_concurrency=None, requests_per_minute=None, tokens_per_minute=None, cache=None,
+                 checkpoints=None, deadline_seconds=None, hedge_budget=None):
+        """
+        `llm` is any object with an `invoke(prompt)` method returning a message with `.content`;
+        it defaults to Gemini. The rate limiter is shared by every call on this agent.
+        `cache` is an LLMCache, or False to disable caching (default: on-disk cache from env settings).
+        `checkpoints` is a CheckpointStore, or False to disable resumable runs (default: from env).
+        `deadline_seconds` and `hedge_budget` configure the HedgedCaller around each model request.
+        """
+        self.llm = llm if llm is not None else create_llm()
+        if cache is None and LLM_CACHE_ENABLED:
+            cache = LLMCache(
+                path=LLM_CACHE_PATH,
+                max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+                ttl_seconds=LLM_CACHE_TTL_SECONDS,
+            )
+        self.cache = cache or None
+        if checkpoints is None and LLM_CHECKPOINT_ENABLED:
+            checkpoints = CheckpointStore(path=LLM_CHECKPOINT_PATH, ttl_seconds=LLM_CHECKPOINT_TTL_SECONDS)
+        self.checkpoints = checkpoints or None
+        self.max_attempts = LLM_BATCH_MAX_ATTEMPTS
+        self.retry_base_seconds = LLM_RETRY_BASE_SECONDS
+        self.max_concurrency = max_concurrency or LLM_MAX_CONCURRENCY
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=requests_per_minute or LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=tokens_per_minute or LLM_TOKENS_PER_MINUTE,
+        )
+        self.llm_caller = HedgedCaller(
+            self._call_model,
+            deadline=deadline_seconds if deadline_seconds is not None else LLM_REQUEST_DEADLINE_SECONDS,
+            hedge_budget=hedge_budget if hedge_budget is not None else LLM_HEDGE_BUDGET,
+            hedge_quantile=LLM_HEDGE_QUANTILE,
+        )
         self.graph = self.create_graph()
 
+    def _call_model(self, prompt):
+        """One rate-limited model request; hedged duplicates go through here too."""
+        self.rate_limiter.acquire(estimate_tokens(prompt))
+        response_msg = self.llm.invoke(prompt)
+        return extract_text(response_msg.content)
+
+    def _cache_key(self, prompt):
+        return make_cache_key(
+            prompt,
+            getattr(self.llm, "model", type(self.llm).__name__),
+            getattr(self.llm, "temperature", None),
+        )
+
+    def _invoke_llm(self, prompt):
+        """Calls the model through the response cache, rate limiter and deadline/hedging; returns plain text."""
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                print("💾 Cache hit")
+                return cached
+
+        content = self.llm_caller(prompt)
+
+        # Only successful responses are cached; exceptions propagate before this point
+        if key is not None:
+            self.cache.set(key, content)
+        return content
+
     def create_graph(self):
         graph = StateGraph(CleaningState)
 
@@ -42,25 +297,7 @@ class AIAgent:
                 # DEBUG PRINT: Check if Agent is receiving input
                 print(f"\n🤖 Agent Input (Preview): {state.input_text[:50]}...")
                 
-                response_msg = llm.invoke(state.input_text)
-                
-                # --- FIX START: Handle List vs String content ---
-                content = response_msg.content
-                
-                # If content is a list (e.g. [{'type': 'text', ...}]), extract the text
-                if isinstance(content, list):
-                    # Extract 'text' field if it exists, otherwise convert to string
-                    text_parts = []
-                    for block in content:
-                        if isinstance(block, dict):
-                            text_parts.append(block.get("text", ""))
-                        else:
-                            text_parts.append(str(block))
-                    content = "".join(text_parts)
-                
-                # Ensure it is definitively a string
-                content = str(content)
-                # --- FIX END ---
+                content = self._invoke_llm(state.input_text)
 
                 # DEBUG PRINT: Check what Gemini actually replied
                 print(f"✅ Agent Output: {content[:100]}...")
@@ -73,7 +310,8 @@ class AIAgent:
                 print(f"❌ Error in Agent: {str(e)}")
                 return CleaningState(
                     input_text=state.input_text,
-                    structured_response=f"Error: {str(e)}"
+                    structured_response=f"Error: {str(e)}",
+                    error=str(e),
                 )
 
         graph.add_node("cleaning_agent", agent_logic)
@@ -81,42 +319,286 @@ class AIAgent:
         graph.set_entry_point("cleaning_agent")
         return graph.compile()
 
-    def process_data(self, df, batch_size=20):
-        # DEBUG PRINT: Check if DataFrame is valid
-        print(f"\n📊 Processing Data... Rows: {len(df)}")
-        if len(df) == 0:
-            return "Error: DataFrame is empty."
-
-        cleaned_responses = []
+    def _clean_batch(self, batch_csv, key_column=None):
+        """
+        Sends one serialized batch through the cleaning graph and returns the model's CSV text.
+        Raises if the call failed or the answer is not CSV with the batch's columns.
+        """
+        if key_column:
+            # Partial rows are merged back by key, so rows must be neither dropped nor merged
+            last_task = f"3. Keep the {key_column} values exactly as given and return every input row; do not remove rows."
+        else:
+            last_task = "3. Remove duplicates."
 
-        for i in range(0, len(df), batch_size):
-            df_batch = df.iloc[i:i + batch_size]
-            
-            prompt = f"""
+        prompt = f"""
             You are an AI Data Cleaning Agent. 
             Input Data (CSV format):
-            {df_batch.to_string()}
+            {batch_csv}
 
             Task:
             1. Identify missing values and impute them (mean/median/mode).
             2. Fix inconsistent formatting.
-            3. Remove duplicates.
+            {last_task}
 
             Output:
-            Return ONLY the cleaned dataset in CSV format. 
+            Return ONLY the cleaned dataset in CSV format, with the same header row. 
             NO explanations. NO markdown code blocks (like ```csv).
             """
             
-            state = CleaningState(input_text=prompt, structured_response="")
-            response = self.graph.invoke(state)
-            
-            # Extract content properly if response is a dict or state object
-            if isinstance(response, dict):
-                response = CleaningState(**response)
+        state = CleaningState(input_text=prompt, structured_response="")
+        response = self.graph.invoke(state)
+        
+        # Extract content properly if response is a dict or state object
+        if isinstance(response, dict):
+            response = CleaningState(**response)
+
+        if response.error:
+            raise RuntimeError(response.error)
+        try:
+            validate_batch_response(response.structured_response, pd.read_csv(io.StringIO(batch_csv), nrows=0).columns)
+        except ValueError:
+            # Don't let a retry be answered with the same bad reply from the cache
+            if self.cache is not None:
+                self.cache.delete(self._cache_key(prompt))
+            raise
+        return response.structured_response
+
+    def _clean_batch_with_retry(self, batch_csv, key_column=None, cancel_event=None):
+        """_clean_batch with exponential backoff; returns (response, attempts)."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return self._clean_batch(batch_csv, key_column), attempt
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = min(LLM_RETRY_MAX_SECONDS, self.retry_base_seconds * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                print(f"🔁 Batch attempt {attempt} failed ({str(e)[:120]}); retrying in {delay:.1f}s")
+                if cancel_event is not None and cancel_event.wait(delay):
+                    raise BatchCancelled("Cancelled while waiting to retry a batch.")
+                if cancel_event is None:
+                    time.sleep(delay)
+
+    def suggest_cleaning_rules(self, df, sample_size=50, max_attempts=3):
+        """
+        Sends column profiles plus a representative sample to the LLM once and returns validated
+        CleaningRules. Invalid replies are retried with the validation error fed back.
+        """
+        profiles = json.dumps(profile_columns(df), default=str, indent=1)
+        sample_csv = serialize_batch(representative_sample(df, sample_size))
+        schema = json.dumps(CleaningRules.model_json_schema())
+
+        prompt = f"""
+        You are an AI Data Cleaning Agent. Write cleaning RULES for the whole table below;
+        you only see column profiles and a sample, and the rules will be applied to every row.
+
+        Column Profiles (JSON):
+        {profiles}
+
+        Sample Rows (CSV format):
+        {sample_csv}
+
+        Rules per column are applied in this order: strip_whitespace, case, regex_replace,
+        value_map (keys are matched after the previous steps), cast, impute.
+        Use value_map to merge spelling variants, regex_replace to normalize formats
+        (e.g. "60k" -> "60000"), cast to fix types and impute for missing values.
+        Only include columns that need changes.
+
+        Output:
+        Return ONLY a JSON object matching this JSON schema. NO explanations. NO markdown.
+        {schema}
+        """
+
+        last_error = None
+        for attempt in range(1, max_attempts + 1):
+            attempt_prompt = prompt
+            if last_error:
+                attempt_prompt += f"\nYour previous answer was invalid: {last_error}\nReturn corrected JSON only.\n"
+            try:
+                rules = CleaningRules.model_validate(parse_json_response(self._invoke_llm(attempt_prompt)))
+                print(f"📐 Cleaning rules received for {len(rules.columns)} column(s) (attempt {attempt})")
+                return rules
+            except Exception as e:
+                last_error = str(e)[:500]
+                print(f"❌ Invalid cleaning rules (attempt {attempt}): {last_error}")
+
+        raise ValueError(f"LLM did not return valid cleaning rules: {last_error}")
+
+    def process_data(self, df, batch_size=None, max_concurrency=None, token_budget=None, mode=None, only_problem_rows=None,
+                     on_batch=None, cancel_event=None, run_id=None):
+        """
+        Cleans the DataFrame batch by batch with the LLM.
+        Batches are sized so each stays within `token_budget` estimated tokens, unless a fixed
+        `batch_size` (rows) is given. Up to `max_concurrency` batches are in flight at once
+        (rate-limited by the agent's RateLimiter); responses are joined in the original batch order.
+        The chosen batch sizes are stored in `self.last_batch_stats`.
+
+        With mode="rules" the LLM is asked for CleaningRules once and the cleaned DataFrame
+        (not CSV text) is returned, so cost no longer grows with the number of rows.
+        With only_problem_rows=True just the cells flagged by DataCleaning.detect_problem_cells
+        are sent, and the merged full DataFrame is returned.
+
+        `on_batch(index, total, response)` is called as each batch finishes (in completion order).
+        Setting `cancel_event` (a threading.Event) stops sending batches and raises BatchCancelled.
+        Failed batches are retried on their own; if any still fail, BatchFailed is raised and the
+        finished ones stay checkpointed, so calling again with the same data resumes the run.
+        """
+        # DEBUG PRINT: Check if DataFrame is valid
+        print(f"\n📊 Processing Data... Rows: {len(df)}")
+        if len(df) == 0:
+            return "Error: DataFrame is empty."
+
+        if (mode or AI_CLEANING_MODE) == "rules":
+            if cancel_event is not None and cancel_event.is_set():
+                raise BatchCancelled("Cancelled before the rules request was sent.")
+            rules = self.suggest_cleaning_rules(df)
+            cleaned = DataCleaning().apply_rules(df, rules)
+            if on_batch is not None:
+                on_batch(0, 1, None)
+            return cleaned
+
+        hooks = {"on_batch": on_batch, "cancel_event": cancel_event, "run_id": run_id}
+        if only_problem_rows is None:
+            only_problem_rows = AI_ONLY_PROBLEM_ROWS
+        if only_problem_rows:
+            return self._process_problem_rows(df, batch_size, max_concurrency, token_budget, **hooks)
+
+        return self._run_batches(df, batch_size, max_concurrency, token_budget, **hooks)
+
+    def _run_batches(self, df, batch_size=None, max_concurrency=None, token_budget=None, key_column=None,
+                     on_batch=None, cancel_event=None, run_id=None):
+        """
+        Plans, serializes and dispatches the batches of `df`; returns the joined CSV answer.
+        Each validated answer is checkpointed under (run_id, batch index), so a rerun of the same
+        batches (or an explicit `run_id`) only sends the ones that have not succeeded yet.
+        """
+        max_concurrency = max_concurrency or self.max_concurrency
+        if batch_size:
+            ranges = [(i, min(i + batch_size, len(df))) for i in range(0, len(df), batch_size)]
+        else:
+            ranges = plan_batches(df, token_budget or LLM_BATCH_TOKEN_BUDGET)
+        batches = [serialize_batch(df.iloc[start:stop]) for start, stop in ranges]
+
+        completed = {}
+        if self.checkpoints is not None:
+            run_id = run_id or make_run_id(
+                batches, getattr(self.llm, "model", type(self.llm).__name__), getattr(self.llm, "temperature", None), key_column
+            )
+            completed = self.checkpoints.start_run(run_id, len(batches))
+
+        rows_per_batch = [stop - start for start, stop in ranges]
+        tokens_per_batch = [estimate_tokens(batch_csv) for batch_csv in batches]
+        self.last_batch_stats = {
+            "batches": len(batches),
+            "rows_per_batch": round(sum(rows_per_batch) / len(batches), 1),
+            "max_rows_per_batch": max(rows_per_batch),
+            "tokens_per_batch": round(sum(tokens_per_batch) / len(batches), 1),
+            "max_tokens_per_batch": max(tokens_per_batch),
+            "total_tokens": sum(tokens_per_batch),
+            "run_id": run_id,
+            "resumed_batches": len(completed),
+        }
+        print(f"📦 Batch plan: {self.last_batch_stats}")
+
+        responses = [None] * len(batches)
+        for index, response in completed.items():
+            responses[index] = response
+            if on_batch is not None:
+                on_batch(index, len(batches), response)
+        pending = [index for index in range(len(batches)) if index not in completed]
+        errors = {}
+        retried = []
+
+        def clean_batch(index):
+            if cancel_event is not None and cancel_event.is_set():
+                raise BatchCancelled(f"Cancelled before batch {index + 1}/{len(batches)}.")
+            try:
+                response, attempts = self._clean_batch_with_retry(batches[index], key_column, cancel_event)
+            except BatchCancelled:
+                raise
+            except Exception as e:
+                # Keep going: every other batch still gets its chance and its checkpoint
+                errors[index] = str(e)[:500]
+                return
+            if attempts > 1:
+                retried.append(index)
+            if self.checkpoints is not None:
+                self.checkpoints.save_batch(run_id, index, response, attempts)
+            responses[index] = response
+            if on_batch is not None:
+                on_batch(index, len(batches), response)
+
+        if max_concurrency <= 1 or len(pending) <= 1:
+            for index in pending:
+                clean_batch(index)
+        elif pending:
+            print(f"⚡ Dispatching {len(pending)} batches with concurrency {max_concurrency}")
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(pending))) as executor:
+                list(executor.map(clean_batch, pending))
 
-            cleaned_responses.append(response.structured_response)
+        self.last_batch_stats["retried_batches"] = len(retried)
+        self.last_batch_stats["failed_batches"] = len(errors)
+        self.last_batch_stats["llm_calls"] = self.llm_caller.stats()
+        if self.cache is not None:
+            print(f"💾 LLM cache: {self.cache.stats()}")
+
+        if errors:
+            if self.checkpoints is not None:
+                self.checkpoints.finish_run(run_id, "failed")
+            raise BatchFailed(run_id, errors)
+        if self.checkpoints is not None:
+            self.checkpoints.finish_run(run_id, "completed")
+
+        # Responses are joined in batch order, whatever order they finished in
+        return join_csv_responses(responses)
+
+    def _process_problem_rows(self, df, batch_size=None, max_concurrency=None, token_budget=None,
+                              on_batch=None, cancel_event=None, run_id=None):
+        """
+        Sends only flagged rows, restricted to flagged columns plus a row key, to the LLM and
+        merges the answers back into a copy of the full frame. Returns the merged DataFrame,
+        or the raw AI text if it could not be parsed as CSV.
+        """
+        mask = DataCleaning().detect_problem_cells(df)
+        problem_rows = mask.any(axis=1).to_numpy()
+        problem_cols = [col for col in df.columns if mask[col].any()]
+        print(
+            f"🎯 Problem cells: {int(mask.to_numpy().sum())} | sending {int(problem_rows.sum())}/{len(df)} rows, "
+            f"{len(problem_cols)}/{len(df.columns)} columns"
+        )
+        if not problem_cols:
+            return df.copy()
+
+        subset = df.loc[problem_rows, problem_cols].copy()
+        subset.insert(0, ROW_KEY, np.flatnonzero(problem_rows))
+        response = self._run_batches(
+            subset, batch_size, max_concurrency, token_budget, key_column=ROW_KEY,
+            on_batch=on_batch, cancel_event=cancel_event, run_id=run_id,
+        )
+
+        try:
+            ai_rows = pd.read_csv(io.StringIO(response))
+        except Exception as e:
+            print(f"❌ Could not parse AI output for merge: {e}")
+            return response
+        if ROW_KEY not in ai_rows.columns:
+            print(f"❌ AI output lost the {ROW_KEY} column; nothing merged.")
+            return response
+
+        # Keep answers whose key refers to a row we actually sent, one answer per row
+        ai_rows[ROW_KEY] = pd.to_numeric(ai_rows[ROW_KEY], errors="coerce")
+        ai_rows = ai_rows[ai_rows[ROW_KEY].isin(subset[ROW_KEY])].drop_duplicates(ROW_KEY)
+        positions = ai_rows[ROW_KEY].astype(int).to_numpy()
+
+        merged = df.copy()
+        for col in problem_cols:
+            if str(col) not in ai_rows.columns:
+                continue
+            values = merged[col].astype(object)
+            values.iloc[positions] = ai_rows[str(col)].to_numpy()
+            merged[col] = values.infer_objects()
+        print(f"🔀 Merged {len(positions)} AI-cleaned rows back by {ROW_KEY}")
+        return merged
 
-        return "\n".join(cleaned_responses)
     def analyze_data(self, df):
         """
         Analyze the given DataFrame and return AI-generated insights.
@@ -150,24 +632,7 @@ class AIAgent:
 
         try:
             # 3. Pass the prompt to the Gemini model
-            response_msg = llm.invoke(prompt)
-            
-            # --- CRITICAL FIX: Handle List vs String content ---
-            content = response_msg.content
-            
-            # If content is a list (e.g. [{'type': 'text', ...}]), extract the text
-            if isinstance(content, list):
-                text_parts = []
-                for block in content:
-                    if isinstance(block, dict):
-                        text_parts.append(block.get("text", ""))
-                    else:
-                        text_parts.append(str(block))
-                content = "".join(text_parts)
-            
-            # Ensure it is definitively a string
-            return str(content)
-            # ---------------------------------------------------
+            return self._invoke_llm(prompt)
 
         except Exception as e:
             return f"❌ Error in AI Analysis: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,292 @@
+import asyncio
+import json
+import os
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    # Incremental parsing of large payloads; without it each page is parsed in one go
+    import ijson
+except ImportError:
+    ijson = None
+
+# Shared HTTP client: connections kept open across requests, pages fetched at once per request
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "32"))
+API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "8"))
+API_MAX_PAGES = int(os.getenv("API_MAX_PAGES", "100"))
+API_TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "60"))
+
+PAGINATION_STYLES = ("page", "offset", "cursor")
+
+
+class ApiError(Exception):
+    """The API answered with a non-200 status."""
+
+    def __init__(self, status, url):
+        super().__init__(f"API request failed with status {status}: {url}")
+        self.status = status
+
+
+# ----------------------- Records -----------------------------
+
+def get_path(payload, path):
+    """Value at a dotted path ("data.items") of a parsed JSON payload, or None."""
+    for part in path.split("."):
+        if isinstance(payload, dict):
+            payload = payload.get(part)
+        elif isinstance(payload, list) and part.isdigit() and int(part) < len(payload):
+            payload = payload[int(part)]
+        else:
+            return None
+    return payload
+
+
+def find_records(payload, records_path=None):
+    """
+    The list of records in a payload: at `records_path` if given, else the payload itself when it
+    is a list, else the first list value of a dict (e.g. {'products': [...]}).
+    """
+    if records_path:
+        records = get_path(payload, records_path)
+        return records if isinstance(records, list) else []
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for value in payload.values():
+            if isinstance(value, list):
+                return value
+    return [payload]
+
+
+_MIXED = ("mixed", "mixed-integer", "unknown-array")
+
+
+def _flatten_frame(df, sep):
+    columns = []
+    for col in df.columns:
+        values = df[col]
+        if values.dtype != object or pd.api.types.infer_dtype(values, skipna=True) not in _MIXED:
+            columns.append(values)
+            continue
+        is_dict = np.fromiter((isinstance(value, dict) for value in values), dtype=bool, count=len(values))
+        if is_dict.any() and (is_dict | values.isna().to_numpy()).all():
+            # Object column -> one column per key, built column-wise by the DataFrame constructor
+            nested = pd.DataFrame([value if ok else {} for value, ok in zip(values, is_dict)], index=df.index)
+            nested.columns = [f"{col}{sep}{key}" for key in nested.columns]
+            columns.extend(column for _, column in _flatten_frame(nested, sep).items())
+        elif is_dict.any() or values.map(lambda value: isinstance(value, list)).any():
+            # Lists (or mixed objects) stay one column, stringified so it is hashable
+            columns.append(values.astype(str))
+        else:
+            columns.append(values)
+    return pd.concat(columns, axis=1) if columns else df
+
+
+def flatten_records(records, sep="."):
+    """
+    Records -> DataFrame with nested objects flattened into "parent.child" columns. Columns that
+    still hold lists are stringified so they stay hashable for the cleaning steps. The frame is
+    built column-wise; a C-level type scan skips every plain column before any per-value check.
+    """
+    if not records:
+        return pd.DataFrame()
+    return _flatten_frame(pd.DataFrame(records), sep)
+
+
+# ----------------------- Pagination -----------------------------
+
+class Pagination:
+    """
+    How to walk a paginated API.
+      page   - `page_param` = start, start + 1, ... (start defaults to 1)
+      offset - `offset_param` = start, start + page_size, ... (start defaults to 0)
+      cursor - `cursor_param` = the value at `cursor_path` of the previous page; a value that is
+               a full URL is followed as the next page's URL
+    `size_param`/`page_size` set the page size sent to the API. If `total_path` points at the
+    total record count in the first page, the remaining pages are fetched all at once;
+    otherwise page/offset walks fetch `concurrency` pages at a time until a short page.
+    """
+
+    def __init__(self, style, page_param="page", offset_param="offset", size_param=None, page_size=None,
+                 start=None, cursor_param="cursor", cursor_path="next", total_path=None,
+                 max_pages=API_MAX_PAGES, concurrency=API_MAX_CONCURRENCY):
+        if style not in PAGINATION_STYLES:
+            raise ValueError(f"Unknown pagination style '{style}'. Use one of {', '.join(PAGINATION_STYLES)}.")
+        if style == "offset" and not page_size:
+            raise ValueError("Offset pagination needs page_size.")
+        self.style = style
+        self.page_param = page_param
+        self.offset_param = offset_param
+        self.size_param = size_param
+        self.page_size = page_size
+        self.start = (1 if style == "page" else 0) if start is None else start
+        self.cursor_param = cursor_param
+        self.cursor_path = cursor_path
+        self.total_path = total_path
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+
+    def params(self, index, page_size):
+        """Query parameters of the `index`-th page (0-based)."""
+        params = {}
+        if self.size_param and page_size:
+            params[self.size_param] = page_size
+        if self.style == "page":
+            params[self.page_param] = self.start + index
+        elif self.style == "offset":
+            params[self.offset_param] = self.start + index * page_size
+        return params
+
+
+# ----------------------- Client -----------------------------
+
+class _Prefixed:
+    """Async file-like over a response stream whose first bytes were already read."""
+
+    def __init__(self, head, stream):
+        self._head = head
+        self._stream = stream
+
+    async def read(self, n=-1):
+        # read(0) is ijson probing for bytes vs str; the head must not be spent on it
+        if self._head and n != 0:
+            head, self._head = self._head, b""
+            return head
+        return await self._stream.read(n)
+
+
+class ApiClient:
+    """
+    Pooled aiohttp session for JSON APIs: one connection pool for the process (open it with
+    start() and close it on shutdown), concurrent pagination, and incremental parsing of
+    record arrays when ijson is installed.
+    """
+
+    def __init__(self, max_connections=API_MAX_CONNECTIONS, timeout=API_TIMEOUT_SECONDS):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session = None
+        self.requests = 0
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ---- One page ----
+
+    async def _records_incremental(self, response, records_path):
+        head = await response.content.read(1024)
+        stripped = head.lstrip()
+        if records_path:
+            prefix = f"{records_path}.item"
+        elif stripped.startswith(b"["):
+            prefix = "item"
+        else:
+            # Unknown records location: parse the whole body and search it
+            payload = _loads(head + await response.read())
+            return find_records(payload)
+        return [record async for record in ijson.items(_Prefixed(head, response.content), prefix, use_float=True)]
+
+    async def fetch_page(self, url, params=None, records_path=None, need_payload=False):
+        """(records, payload) of one GET; payload is None when the records were parsed incrementally."""
+        await self.start()
+        self.requests += 1
+        async with self._session.get(url, params=params) as response:
+            if response.status != 200:
+                raise ApiError(response.status, url)
+            if ijson is not None and not need_payload:
+                return await self._records_incremental(response, records_path), None
+            payload = _loads(await response.read())
+            return find_records(payload, records_path), payload
+
+    # ---- Whole resource ----
+
+    async def fetch_records(self, url, params=None, pagination=None, records_path=None):
+        """All records of `url`, walking the pages described by `pagination` (a Pagination or None)."""
+        params = dict(params or {})
+        if pagination is None:
+            records, _ = await self.fetch_page(url, params, records_path)
+            return records
+        if pagination.style == "cursor":
+            return await self._fetch_cursor(url, params, pagination, records_path)
+        return await self._fetch_numbered(url, params, pagination, records_path)
+
+    async def _fetch_cursor(self, url, params, pagination, records_path):
+        # Each page names the next one, so this walk is sequential
+        records = []
+        for _ in range(pagination.max_pages):
+            page_params = {**params, **pagination.params(0, pagination.page_size)}
+            page, payload = await self.fetch_page(url, page_params, records_path, need_payload=True)
+            records.extend(page)
+            cursor = get_path(payload, pagination.cursor_path)
+            if not page or not cursor:
+                break
+            if isinstance(cursor, str) and cursor.startswith(("http://", "https://")):
+                url, params = cursor, {}
+            else:
+                params[pagination.cursor_param] = cursor
+        return records
+
+    async def _fetch_numbered(self, url, params, pagination, records_path):
+        # First page alone: it tells the page size (and total, if the API reports it)
+        first, payload = await self.fetch_page(
+            url, {**params, **pagination.params(0, pagination.page_size)}, records_path,
+            need_payload=pagination.total_path is not None,
+        )
+        page_size = pagination.page_size or len(first)
+        pages = [first]
+        if not first or len(first) < page_size:
+            return first
+
+        last = pagination.max_pages
+        total = None
+        if pagination.total_path and payload is not None:
+            total = get_path(payload, pagination.total_path)
+        if isinstance(total, (int, float)) and total >= 0:
+            last = min(last, -(-int(total) // page_size))
+
+        index = 1
+        while index < last:
+            # Up to `concurrency` pages in flight; stop at the first short page
+            window = range(index, min(index + pagination.concurrency, last))
+            results = await asyncio.gather(*(
+                self.fetch_page(url, {**params, **pagination.params(i, page_size)}, records_path)
+                for i in window
+            ))
+            for page, _ in results:
+                pages.append(page)
+                if len(page) < page_size:
+                    return [record for page in pages for record in page]
+            index += len(window)
+        return [record for page in pages for record in page]
+
+
+async def fetch_json_records(url, params=None, pagination=None, records_path=None, client=None):
+    """fetch_records on `client`, or on a short-lived client when none is given."""
+    if client is not None:
+        return await client.fetch_records(url, params, pagination, records_path)
+    async with ApiClient() as own:
+        return await own.fetch_records(url, params, pagination, records_path)
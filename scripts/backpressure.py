@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised when every worker slot is busy and the wait queue is full."""
+
+    def __init__(self, retry_after=1):
+        super().__init__("Server is busy, retry later.")
+        self.retry_after = retry_after
+
+
+class BlockingWorkPool:
+    """
+    Runs blocking work (pandas parsing/cleaning, synchronous LLM calls) off the event loop.
+
+    At most `max_in_flight` jobs run at once on a dedicated thread pool; up to `max_queued`
+    more wait for a slot, and anything beyond that is rejected with Overloaded so the server
+    can answer 429 instead of piling up work. The event loop itself never blocks.
+    """
+
+    def __init__(self, max_in_flight=4, max_queued=16, retry_after=1):
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="blocking-work")
+        self._slots = None
+        self.running = 0
+        self.queued = 0
+        self.rejected = 0
+        self.completed = 0
+
+    def ensure_capacity(self):
+        """Raises Overloaded if a job submitted now would be rejected (e.g. before starting a stream)."""
+        if self._slots is None:
+            # Created lazily so it binds to the server's running event loop
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        if self._slots.locked() and self.queued >= self.max_queued:
+            self.rejected += 1
+            raise Overloaded(self.retry_after)
+
+    async def run(self, fn, *args, **kwargs):
+        """Awaits `fn(*args, **kwargs)` on the worker pool, or raises Overloaded."""
+        self.ensure_capacity()
+
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed when the work ends, not when this coroutine does: a cancelled request
+        # (client gone) must not let another job start while its thread is still busy
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self.running -= 1
+        self.completed += 1
+        self._slots.release()
+
+    def _release_threadsafe(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # the event loop is already closed (server shutting down)
+
+    def stats(self):
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "completed": self.completed,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,156 @@
+import asyncio
+import io
+import json
+import threading
+import time
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from scripts.ai_agent import ROW_KEY
+
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def format_event(event, fmt="ndjson"):
+    """One event as an NDJSON line or a server-sent event."""
+    data = json.dumps(event)
+    if fmt == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def records(df):
+    """JSON-safe records: NaN/NaT/<NA> become None."""
+    return jsonable_encoder(df.astype(object).where(df.notna(), None).to_dict(orient="records"))
+
+
+class BatchStream:
+    """
+    Carries cleaning events from a worker thread to an HTTP streaming response.
+
+    It can stand in for a Job in the backend pipeline helpers (`set_stage`, `agent_hooks`), so
+    each LLM batch is parsed and emitted as a "rows" event as soon as it finishes instead of
+    after the whole job. It is also a StreamingCleaner sink, so chunked cleaning of large files
+    emits each cleaned chunk. Events are written as NDJSON lines or server-sent events.
+
+    Event types: stage, rows, progress, result, done, error.
+    Pass `publish` instead of `loop` to collect events some other way (e.g. a job's event log);
+    its "rows" events carry the batch DataFrame, which the publisher stores as it sees fit.
+    """
+
+    def __init__(self, loop=None, fmt="ndjson", publish=None):
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Unknown stream format '{fmt}'. Use one of {', '.join(STREAM_FORMATS)}.")
+        self.fmt = fmt
+        self.media_type = STREAM_FORMATS[fmt]
+        self.cancel_event = threading.Event()
+        self.temp_files = []
+        self.rows_streamed = 0
+        self._loop = loop
+        self._queue = asyncio.Queue() if publish is None else None
+        self._publish = publish
+        self._lock = threading.Lock()
+        self._batches_done = 0
+        self._start = time.perf_counter()
+        self._first_row_at = None
+        self._chunk_index = 0
+
+    # ---- Producer side (worker thread) ----
+
+    def emit(self, event_type, **payload):
+        payload = {"type": event_type, **payload}
+        if self._publish is not None:
+            self._publish(payload)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, payload)
+
+    def _emit_rows(self, frame, **payload):
+        with self._lock:
+            self.rows_streamed += len(frame)
+            if self._first_row_at is None and len(frame):
+                self._first_row_at = time.perf_counter() - self._start
+        self.emit("rows", rows=frame if self._publish is not None else records(frame), **payload)
+
+    def set_stage(self, stage):
+        self.emit("stage", stage=stage)
+
+    def agent_hooks(self):
+        return {"on_batch": self.on_batch, "cancel_event": self.cancel_event}
+
+    def on_batch(self, index, total, response):
+        """AIAgent.process_data hook: parse this batch's CSV answer and emit its rows right away."""
+        with self._lock:
+            self._batches_done += 1
+            done = self._batches_done
+        progress = {"batch": index, "batches_done": done, "batches_total": total}
+
+        if response is None:
+            self.emit("progress", **progress)
+            return
+        try:
+            batch = pd.read_csv(io.StringIO(response))
+        except Exception:
+            self.emit("error", detail="AI batch response was not valid CSV", raw=response, **progress)
+            return
+        if ROW_KEY in batch.columns:
+            # Problem-row mode: partial rows, merged into the full table at the end
+            self.emit("progress", **progress)
+            return
+        self._emit_rows(batch, **progress)
+
+    def write(self, chunk):
+        """StreamingCleaner sink: each cleaned chunk of a large file becomes a rows event."""
+        self._emit_rows(chunk, chunk=self._chunk_index)
+        self._chunk_index += 1
+
+    def close(self):
+        pass
+
+    def finish(self, result):
+        """Events for what the per-batch events could not carry (raw data, merged tables), then done."""
+        events = []
+        if isinstance(result, dict):
+            extra = {
+                key: records(value) if isinstance(value, pd.DataFrame) else value
+                for key, value in result.items()
+                if key != "cleaned_data" or not self.rows_streamed
+            }
+            if extra:
+                events.append({"type": "result", **jsonable_encoder(extra)})
+        events.append({
+            "type": "done",
+            "rows_streamed": self.rows_streamed,
+            "seconds": round(time.perf_counter() - self._start, 3),
+            "time_to_first_row": None if self._first_row_at is None else round(self._first_row_at, 3),
+        })
+        return events
+
+    # ---- Consumer side (event loop) ----
+
+    def _format(self, event):
+        return format_event(event, self.fmt)
+
+    async def events(self, task):
+        """Yields formatted events until `task` (the pipeline future) finishes."""
+        try:
+            while True:
+                getter = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield self._format(getter.result())
+                    continue
+                getter.cancel()
+
+                # Pipeline finished; its events were queued before its result, so drain them first
+                while not self._queue.empty():
+                    yield self._format(self._queue.get_nowait())
+                if task.exception() is not None:
+                    yield self._format({"type": "error", "detail": str(task.exception())})
+                    return
+                for event in self.finish(task.result()):
+                    yield self._format(event)
+                return
+        finally:
+            # Client went away (or we are done): stop sending further LLM batches
+            self.cancel_event.set()
@@ -0,0 +1,36 @@
+import time
+import numpy as np
+import pandas as pd
+
+from scripts.ai_agent import AIAgent
+from scripts.fake_llm import FakeLLM
+
+
+def make_dirty_frame(rows=400, seed=0):
+    """Builds a small synthetic frame with the kind of noise the agent is asked to fix."""
+    rng = np.random.default_rng(seed)
+    cities = np.array(["New York", "new york ", "Chicago", "CHICAGO", "Houston", None], dtype=object)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "age": rng.integers(18, 80, rows).astype(float),
+        "city": cities[rng.integers(0, len(cities), rows)],
+        "salary": rng.normal(60000, 15000, rows).round(2),
+    })
+
+
+def benchmark_concurrency(rows=400, latency=0.05, levels=(1, 2, 4, 8, 16)):
+    """Times process_data against a fake LLM with fixed latency at each concurrency level."""
+    df = make_dirty_frame(rows)
+    baseline = None
+    print(f"\n⏱️  Concurrency benchmark: {rows} rows, {latency * 1000:.0f} ms per call")
+    for level in levels:
+        agent = AIAgent(llm=FakeLLM(latency=latency), max_concurrency=level, cache=False, checkpoints=False)
+        start = time.perf_counter()
+        agent.process_data(df, batch_size=20)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"   concurrency={level:<3} {elapsed:6.2f}s  speedup x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    benchmark_concurrency()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+import tracemalloc
+
+import pandas as pd
+
+import scripts.api_ingestion as api_ingestion
+from scripts.api_ingestion import ApiClient, Pagination, flatten_records
+from scripts.mock_api_server import MockApi
+
+
+def _old_frame(records):
+    """The previous /clean-api conversion: DataFrame, then a Python isinstance check per cell."""
+    df = pd.DataFrame(records)
+    for col in df.columns:
+        if df[col].apply(lambda x: isinstance(x, (list, dict))).any():
+            df[col] = df[col].astype(str)
+    return df
+
+
+async def _fetch(url, pagination=None, records_path=None):
+    async with ApiClient() as client:
+        start = time.perf_counter()
+        records = await client.fetch_records(url, None, pagination, records_path)
+        return records, time.perf_counter() - start
+
+
+def benchmark_api_ingestion(rows=20_000, page_size=500, latency=0.05, large_rows=200_000):
+    """Paginated fetch sequential vs concurrent, whole-body vs incremental parsing, and flattening."""
+    api = MockApi(rows=rows, latency=latency)
+    url = api.start()
+    print(f"\n📊 API ingestion: {rows:,} records in pages of {page_size} ({latency * 1000:.0f} ms per request)")
+    try:
+        for label, pagination in (
+            ("sequential pages ", Pagination("page", size_param="per_page", page_size=page_size, concurrency=1)),
+            ("8 pages at a time", Pagination("page", size_param="per_page", page_size=page_size, concurrency=8)),
+            ("total known      ", Pagination("page", size_param="per_page", page_size=page_size, total_path="total", concurrency=8)),
+            ("cursor           ", Pagination("cursor", size_param="limit", page_size=page_size)),
+        ):
+            api.requests = 0
+            records, seconds = asyncio.run(_fetch(url + ("/cursor" if pagination.style == "cursor" else "/page"),
+                                                  pagination, "items" if pagination.style == "cursor" else "data"))
+            assert len(records) == rows
+            print(f"   {label}: {seconds:6.2f}s  ({api.requests} requests)")
+    finally:
+        api.stop()
+
+    api = MockApi(rows=large_rows)
+    url = api.start()
+    print(f"\n📊 One {large_rows:,}-record payload")
+    try:
+        incremental = api_ingestion.ijson
+        for label, parser in (("whole body ", None), ("incremental", incremental)):
+            if label == "incremental" and parser is None:
+                print("   ⚠️ incremental parsing needs `pip install ijson`")
+                continue
+            api_ingestion.ijson = parser
+            tracemalloc.start()
+            records, seconds = asyncio.run(_fetch(url + "/all"))
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            print(f"   parse {label}: {seconds:6.2f}s  peak {peak:7.1f} MB")
+        api_ingestion.ijson = incremental
+    finally:
+        api.stop()
+
+    for label, fn in (("old apply   ", _old_frame), ("flatten     ", flatten_records)):
+        start = time.perf_counter()
+        df = fn(records)
+        print(f"   frame {label}: {time.perf_counter() - start:6.2f}s  {df.shape[1]} columns")
+
+
+if __name__ == "__main__":
+    benchmark_api_ingestion()
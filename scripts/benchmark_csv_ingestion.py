@@ -0,0 +1,87 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from scripts.csv_ingestion import read_csv_fast
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _old_upload(path):
+    """The original /clean-data path: whole body in memory, decoded to a str, parsed from StringIO."""
+    with open(path, "rb") as f:
+        contents = f.read()
+    return pd.read_csv(io.StringIO(contents.decode("utf-8")))
+
+
+def _spooled(path):
+    with open(path, "rb") as f:
+        return pd.read_csv(f)
+
+
+READERS = {
+    "read + decode + StringIO": _old_upload,
+    "pd.read_csv(spooled file)": _spooled,
+    "pyarrow mmap, 1 thread": lambda path: read_csv_fast(path, use_threads=False),
+    "pyarrow mmap, all cores": lambda path: read_csv_fast(path, use_threads=True),
+}
+
+
+def _memory_kb(field):
+    # VmHWM is this process's own peak; ru_maxrss also counts the parent's peak at fork time
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ":"))
+
+
+def _measure(reader, path):
+    """Runs in a fresh process: seconds, peak RSS growth and size of the resulting frame."""
+    before = _memory_kb("VmRSS")
+    start = time.perf_counter()
+    df = READERS[reader](path)
+    seconds = time.perf_counter() - start
+    peak = _memory_kb("VmHWM") - before
+    frame = df.memory_usage(deep=True).sum()
+    print(json.dumps({"seconds": seconds, "peak_mb": peak / 1024, "frame_mb": frame / 1024 / 1024}))
+
+
+def _numeric_frame(rows, columns=10, seed=0):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(50, 15, (rows, columns)).round(3), columns=[f"x{i}" for i in range(columns)])
+
+
+def benchmark_csv_ingestion(rows=2_000_000):
+    """Parse time and peak memory of one CSV upload per reader, each in its own process."""
+    from scripts.benchmark_ai_agent import make_dirty_frame
+
+    for label, frame in (("mixed text/numeric", make_dirty_frame(rows)), ("numeric, 10 columns", _numeric_frame(rows))):
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as f:
+            path = f.name
+        try:
+            frame.to_csv(path, index=False)
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"\n📊 CSV upload parsing, {label}: {rows:,} rows, {size:.0f} MB on disk, {os.cpu_count()} cores")
+            print(f"   {'reader':>26} | {'time':>7} | {'peak RSS':>9} | {'frame':>8}")
+            for reader in READERS:
+                output = subprocess.run(
+                    [sys.executable, "-m", "scripts.benchmark_csv_ingestion", reader, path],
+                    cwd=ROOT, capture_output=True, text=True, check=True,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(f"   {reader:>26} | {result['seconds']:5.2f} s | {result['peak_mb']:6.0f} MB"
+                      f" | {result['frame_mb']:5.0f} MB")
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        _measure(sys.argv[1], sys.argv[2])
+    else:
+        benchmark_csv_ingestion()
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from scripts.data_cleaning import DataCleaning
+from scripts.data_ingestions import read_sql_chunks, reservoir_sample
+from scripts.streaming_pipeline import CsvSink, StreamingCleaner
+
+
+def make_table(path, rows, seed=0):
+    """SQLite table `orders` with a few dirty numeric/text columns."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": np.where(rng.random(rows) < 0.05, np.nan, rng.normal(100, 25, rows).round(2)),
+        "quantity": rng.integers(1, 20, rows).astype(float),
+        "region": rng.choice(["north", "south", "east", "west", None], rows),
+        "note": rng.choice(["ok", "late", "refund", "gift wrap"], rows),
+    })
+    with sqlite3.connect(path) as conn:
+        df.to_sql("orders", conn, index=False, if_exists="replace", chunksize=50_000)
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def _count_streamed(engine, query, chunksize):
+    return sum(len(chunk) for chunk in read_sql_chunks(engine, query, chunksize=chunksize))
+
+
+def benchmark_db_streaming(sizes=(50_000, 200_000, 800_000), chunksize=20_000):
+    """Peak Python memory of a full read vs streamed reads as the result grows."""
+    query = "SELECT * FROM orders"
+    print(f"\n📊 Database streaming (SQLite, chunksize={chunksize})")
+    print(f"   {'rows':>9} | {'read_sql':>16} | {'streamed':>16} | {'streamed clean':>16} | {'sample 1k':>16}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"orders_{rows}.sqlite")
+            make_table(path, rows)
+            engine = create_engine(f"sqlite:///{path}")
+
+            full, t_full, m_full = _measure(lambda: len(pd.read_sql(query, engine)))
+            streamed, t_stream, m_stream = _measure(lambda: _count_streamed(engine, query, chunksize))
+            cleaner = StreamingCleaner(cleaner=DataCleaning(), chunksize=chunksize, dedupe=False)
+            chunks = lambda: read_sql_chunks(engine, query, chunksize=chunksize)
+            _, t_clean, m_clean = _measure(lambda: cleaner.run(chunks, CsvSink(os.devnull)))
+            sample, t_sample, m_sample = _measure(lambda: reservoir_sample(read_sql_chunks(engine, query, chunksize=chunksize), 1000))
+            engine.dispose()
+
+            assert full == streamed == rows and len(sample) == 1000
+            cells = [f"{m:6.1f} MB {t:6.2f}s" for m, t in ((m_full, t_full), (m_stream, t_stream), (m_clean, t_clean), (m_sample, t_sample))]
+            print(f"   {rows:>9,} | " + " | ".join(cells))
+
+    print("✅ Streamed reads stay flat as the result grows; read_sql grows with it")
+
+
+if __name__ == "__main__":
+    benchmark_db_streaming()
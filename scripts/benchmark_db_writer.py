@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from scripts.create_demo_db import make_dirty_rows
+from scripts.db_writer import copy_frame, write_frames
+
+
+def _rows_per_sec(rows, seconds):
+    return f"{rows / seconds:>12,.0f} rows/sec  ({seconds:6.2f}s)"
+
+
+def _row_by_row(engine, df, table):
+    """The old write path: one INSERT round trip per row."""
+    write_frames(engine, df.head(0), table, mode="replace")
+    columns = ", ".join(df.columns)
+    marker = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        for row in rows:
+            cursor.execute(f"INSERT INTO {table} ({columns}) VALUES ({', '.join([marker] * len(df.columns))})", row)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _native_copy(engine, df, table):
+    """Reference: the whole frame in a single COPY, no batching or staging."""
+    write_frames(engine, df.head(0), table, mode="replace")
+    quote = engine.dialect.identifier_preparer.quote
+    conn = engine.raw_connection()
+    try:
+        copy_frame(conn.cursor(), quote(table), [quote(col) for col in df.columns], df)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def benchmark_db_writer(db_url=None, rows=500_000, batch_rows=100_000):
+    """
+    Write-back throughput: row-by-row inserts vs BulkLoad append/replace/upsert (COPY batches on
+    Postgres), plus a single native COPY for reference. Pass a Postgres URL (argv[1] or
+    BENCHMARK_DB_URL) for COPY numbers; without one a temporary SQLite database is used.
+    """
+    tmp = None
+    if db_url is None:
+        tmp = tempfile.TemporaryDirectory()
+        db_url = f"sqlite:///{os.path.join(tmp.name, 'writer.sqlite')}"
+    engine = create_engine(db_url)
+    df = make_dirty_rows(rows)
+    print(f"\n📊 Bulk write-back: {rows:,} rows, batch_rows={batch_rows:,}, {engine.dialect.name}")
+
+    try:
+        slow_rows = min(rows, 50_000)
+        start = time.perf_counter()
+        _row_by_row(engine, df.head(slow_rows), "bench_row_by_row")
+        print(f"   row-by-row INSERT    {_rows_per_sec(slow_rows, time.perf_counter() - start)}  [{slow_rows:,} rows]")
+
+        if engine.dialect.name == "postgresql":
+            start = time.perf_counter()
+            _native_copy(engine, df, "bench_native_copy")
+            print(f"   native COPY (1 call) {_rows_per_sec(rows, time.perf_counter() - start)}")
+
+        for mode in ("append", "replace", "upsert"):
+            stats = write_frames(engine, df, f"bench_{mode}", mode=mode, key_columns=["id"], batch_rows=batch_rows)
+            print(f"   BulkLoad {mode:<11} {_rows_per_sec(stats['rows'], stats['seconds'])}")
+
+        # upsert*: into the populated table, so every key conflicts and is updated
+        df["salary"] = df["salary"] * 1.1
+        stats = write_frames(engine, df, "bench_upsert", mode="upsert", key_columns=["id"], batch_rows=batch_rows)
+        print(f"   BulkLoad {'upsert*':<11} {_rows_per_sec(stats['rows'], stats['seconds'])}")
+    finally:
+        with engine.begin() as conn:
+            for table in ("bench_row_by_row", "bench_native_copy", "bench_append", "bench_replace", "bench_upsert"):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        engine.dispose()
+        if tmp is not None:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    benchmark_db_writer(sys.argv[1] if len(sys.argv) > 1 else os.getenv("BENCHMARK_DB_URL"))
@@ -0,0 +1,142 @@
+import itertools
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from scripts.deduplication import FingerprintSet, MinHashLSH, normalize_text, row_fingerprints
+
+
+def make_chunks(chunks=20, rows=50_000, duplicate_share=0.3, seed=0):
+    """Chunks of a stream where about `duplicate_share` of the rows repeat earlier ones."""
+    rng = np.random.default_rng(seed)
+    total = chunks * rows
+    ids = np.arange(total)
+    repeats = rng.random(total) < duplicate_share
+    ids[repeats] = rng.integers(0, np.maximum(ids[repeats], 1))
+    df = pd.DataFrame({"id": ids, "amount": ids * 0.5, "city": pd.Series(ids % 997).astype(str)})
+    return [df.iloc[start:start + rows] for start in range(0, total, rows)]
+
+
+def _python_set_dedup(chunks):
+    seen, kept = set(), 0
+    for chunk in chunks:
+        hashes = row_fingerprints(chunk, ["id", "amount"])
+        first = ~pd.Series(hashes).duplicated().to_numpy()
+        keep = first & ~np.fromiter((h in seen for h in hashes.tolist()), bool, len(hashes))
+        seen.update(hashes[keep].tolist())
+        kept += int(keep.sum())
+    return kept, seen
+
+
+def _fingerprint_set_dedup(chunks):
+    seen, kept = FingerprintSet(), 0
+    for chunk in chunks:
+        kept += int(seen.add_new(row_fingerprints(chunk, ["id", "amount"])).sum())
+    return kept, seen
+
+
+def benchmark_stream_dedup(chunks=20, rows=50_000):
+    """Cross-chunk exact dedup: Python set of hashes vs FingerprintSet."""
+    data = make_chunks(chunks, rows)
+    print(f"\n📊 Streaming exact dedup: {chunks} chunks x {rows:,} rows")
+    results = {}
+    for label, dedup in [("python set     ", _python_set_dedup), ("FingerprintSet ", _fingerprint_set_dedup)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        kept, seen = dedup(data)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        results[label] = kept
+        print(f"   {label}: {seconds:6.2f}s  peak {peak:7.1f} MB  kept {kept:,} rows")
+    assert len(set(results.values())) == 1
+
+
+# ----------------------- Near duplicates -----------------------------
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "te", "vo", "zi", "ba", "do", "fe", "gu", "hi", "ja", "po"]
+
+
+def _word(rng):
+    return "".join(rng.choice(SYLLABLES, size=int(rng.integers(2, 5))))
+
+
+def _typo(text, rng):
+    """One random edit: drop, swap or double a character, or change case/punctuation."""
+    position = int(rng.integers(0, len(text)))
+    edit = rng.integers(0, 4)
+    if edit == 0:
+        return text[:position] + text[position + 1:]
+    if edit == 1 and position < len(text) - 1:
+        return text[:position] + text[position + 1] + text[position] + text[position + 2:]
+    if edit == 2:
+        return text[:position] + text[position] + text[position:]
+    return text.upper() + "."
+
+
+def make_near_duplicates(entities=2_000, copies=3, blanks=0.05, seed=0):
+    """
+    Company names with `copies` typo'd variants each; `entity` is the ground-truth cluster.
+    A `blanks` share of extra rows has no name (None, NaN, "" or punctuation), each its own entity.
+    """
+    rng = np.random.default_rng(seed)
+    names, truth = [], []
+    for entity in range(entities):
+        base = f"{_word(rng)} {_word(rng)} {_word(rng)}"
+        names.append(base)
+        truth.append(entity)
+        for _ in range(copies):
+            names.append(_typo(base, rng))
+            truth.append(entity)
+    missing = [None, np.nan, "", " - "]
+    for blank in range(int(len(names) * blanks)):
+        names.append(missing[blank % len(missing)])
+        truth.append(entities + blank)
+    return pd.DataFrame({"name": names, "entity": truth})
+
+
+def _pairs(labels):
+    """Set of same-cluster row pairs."""
+    pairs = set()
+    for members in pd.Series(np.arange(len(labels))).groupby(labels):
+        pairs.update(itertools.combinations(members[1].tolist(), 2))
+    return pairs
+
+
+def _brute_force(signatures, threshold):
+    """All-pairs MinHash comparison, the quadratic baseline LSH banding avoids."""
+    found = 0
+    for row in range(len(signatures)):
+        found += int(((signatures[row + 1:] == signatures[row]).mean(axis=1) >= threshold).sum())
+    return found
+
+
+def benchmark_near_duplicates(sizes=(1_000, 2_000, 4_000, 8_000), threshold=0.6):
+    """MinHash/LSH clustering vs all-pairs comparison as rows grow, plus precision/recall."""
+    print(f"\n📊 Near-duplicate clustering (threshold {threshold})")
+    lsh = MinHashLSH(threshold=threshold)
+    for size in sizes:
+        df = make_near_duplicates(entities=size // 4)
+        texts = normalize_text(df, ["name"])
+
+        start = time.perf_counter()
+        labels, signatures = lsh.cluster(texts)
+        lsh_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        _brute_force(signatures, threshold)
+        brute_seconds = time.perf_counter() - start
+
+        found, truth = _pairs(labels), _pairs(df["entity"].to_numpy())
+        blank = np.flatnonzero(texts == "")
+        assert len(np.unique(labels[blank])) == len(blank), "rows without a name were clustered together"
+        precision = len(found & truth) / len(found) if found else 1.0
+        recall = len(found & truth) / len(truth)
+        print(f"   {len(df):6,} rows: LSH {lsh_seconds:6.2f}s  all-pairs {brute_seconds:6.2f}s  "
+              f"precision {precision:.3f}  recall {recall:.3f}")
+
+
+if __name__ == "__main__":
+    benchmark_stream_dedup()
+    benchmark_near_duplicates()
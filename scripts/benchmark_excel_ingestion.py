@@ -0,0 +1,53 @@
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from scripts.benchmark_ai_agent import make_dirty_frame
+from scripts.excel_ingestion import CalamineWorkbook, read_excel_fast
+
+
+def make_workbook(path, sheets=4, rows=25_000):
+    """A multi-sheet workbook of dirty frames, one seed per sheet."""
+    with pd.ExcelWriter(path) as writer:
+        for sheet in range(sheets):
+            make_dirty_frame(rows, seed=sheet).to_excel(writer, index=False, sheet_name=f"sheet{sheet}")
+
+
+def benchmark_excel_ingestion(sheets=4, rows=25_000):
+    """Every sheet of one workbook: pd.read_excel vs read-only openpyxl vs calamine, serial and parallel."""
+    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as f:
+        path = f.name
+    try:
+        make_workbook(path, sheets, rows)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"\n📊 Excel ingestion: {sheets} sheets x {rows:,} rows, {size:.1f} MB, {os.cpu_count()} cores")
+
+        readers = [
+            ("pd.read_excel (openpyxl)", lambda: pd.read_excel(path, sheet_name=None)),
+            ("openpyxl read-only      ", lambda: read_excel_fast(path, sheet_name=None, engine="openpyxl", max_workers=1)),
+        ]
+        if CalamineWorkbook is not None:
+            readers += [
+                ("calamine, serial        ", lambda: read_excel_fast(path, sheet_name=None, engine="calamine", max_workers=1)),
+                ("calamine, all cores     ", lambda: read_excel_fast(path, sheet_name=None, engine="calamine",
+                                                                     max_workers=os.cpu_count() or 1)),
+            ]
+        else:
+            print("   ⚠️ calamine needs `pip install python-calamine`")
+
+        baseline = None
+        for label, read in readers:
+            start = time.perf_counter()
+            frames = read()
+            seconds = time.perf_counter() - start
+            assert sum(len(df) for df in frames.values()) == sheets * rows
+            baseline = baseline or seconds
+            print(f"   {label}: {seconds:6.2f}s  ({baseline / seconds:.1f}x)")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    benchmark_excel_ingestion()
@@ -0,0 +1,37 @@
+import time
+
+from scripts.ai_agent import AIAgent
+from scripts.benchmark_ai_agent import make_dirty_frame
+from scripts.fake_llm import FakeLLM, heavy_tailed_latency
+
+
+def run_once(df, hedge_budget, deadline, concurrency, seed):
+    llm = FakeLLM(latency=heavy_tailed_latency(median=0.05, tail_probability=0.05, tail_multiplier=20.0, seed=seed))
+    agent = AIAgent(
+        llm=llm, max_concurrency=concurrency, cache=False, checkpoints=False,
+        hedge_budget=hedge_budget, deadline_seconds=deadline,
+    )
+    agent.retry_base_seconds = 0.05
+    start = time.perf_counter()
+    agent.process_data(df, batch_size=2)
+    elapsed = time.perf_counter() - start
+    return agent, llm, elapsed
+
+
+def benchmark_hedging(rows=600, concurrency=8, hedge_budget=0.1, deadline=None, seed=0):
+    """
+    Cleans `rows` rows in 2-row batches against a heavy-tailed fake LLM (5% of calls ~20x slower),
+    with and without hedging, and prints per-request latency histograms and quantiles.
+    """
+    df = make_dirty_frame(rows)
+    print(f"\n⏱️  Hedging benchmark: {rows // 2} requests, concurrency {concurrency}, hedge budget {hedge_budget:.0%}")
+
+    for label, budget in (("no hedging", 0.0), (f"hedging {hedge_budget:.0%}", hedge_budget)):
+        agent, llm, elapsed = run_once(df, budget, deadline, concurrency, seed)
+        stats = agent.llm_caller.stats()
+        print(f"\n📊 {label}: wall {elapsed:.2f}s, model calls {llm.calls}, {stats}")
+        print(agent.llm_caller.effective.format_histogram())
+
+
+if __name__ == "__main__":
+    benchmark_hedging()
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from scripts.data_cleaning import DataCleaning
+from scripts.parallel_cleaning import ParallelCleaner
+
+
+def make_wide_frame(rows=10_000_000, seed=0):
+    """Synthetic table with missing values, exact duplicates, large ids and text columns that need type fixing."""
+    rng = np.random.default_rng(seed)
+    unique_rows = max(rows * 9 // 10, 1)
+    cities = np.array(["New York", "Chicago", "Houston", "Phoenix", None], dtype=object)
+    frame = pd.DataFrame({
+        # Above 2**53, so ids that differ only beyond float64 precision must stay distinct
+        "id": 2**53 + rng.integers(0, unique_rows, rows),
+        "amount": rng.normal(100, 25, rows).round(1),
+        "quantity": rng.integers(1, 50, rows).astype(float),
+        "city": cities[rng.integers(0, len(cities), rows)],
+        "score": rng.integers(0, 100, rows).astype(str).astype(object),
+    })
+    frame.loc[rng.random(rows) < 0.05, "amount"] = np.nan
+    frame.loc[rng.random(rows) < 0.05, "quantity"] = np.nan
+    # Copies of the previous row with the id one higher: not duplicates, though the ids are equal as float64
+    copies = np.flatnonzero(rng.random(rows) < 0.01)
+    copies = copies[copies > 0]
+    frame.iloc[copies] = frame.iloc[copies - 1].to_numpy()
+    frame.iloc[copies, frame.columns.get_loc("id")] = frame["id"].to_numpy()[copies - 1] + 1
+    return frame
+
+
+def benchmark_parallel(rows=10_000_000, strategy="mean", levels=None):
+    """
+    Times ParallelCleaner at each worker count against the serial pandas path and checks equality.
+    Only measured on a single core so far, where every worker count was slower than serial
+    (see ParallelCleaner); run it on the multi-core target before raising CLEANING_WORKERS.
+    """
+    cores = os.cpu_count() or 1
+    levels = levels or sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    df = make_wide_frame(rows)
+    print(f"\n⏱️  Parallel cleaning benchmark: {rows:,} rows, strategy='{strategy}', {cores} core(s)")
+
+    start = time.perf_counter()
+    expected = DataCleaning(engine="pandas", workers=1).clean_data(df, strategy)
+    serial = time.perf_counter() - start
+    print(f"   serial      {serial:7.2f}s")
+
+    for workers in levels:
+        cleaner = ParallelCleaner(workers=workers, min_rows=0)
+        start = time.perf_counter()
+        result = cleaner.clean_data(df, strategy)
+        elapsed = time.perf_counter() - start
+        same = result.equals(expected) and (result.dtypes == expected.dtypes).all()
+        print(f"   workers={workers:<3} {elapsed:7.2f}s  speedup x{serial / elapsed:.1f}  {'✅ identical' if same else '❌ differs'}")
+
+
+if __name__ == "__main__":
+    benchmark_parallel(rows=int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
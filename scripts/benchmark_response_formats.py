@@ -0,0 +1,62 @@
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from scripts.benchmark_ai_agent import make_dirty_frame
+from scripts.response_formats import MEDIA_TYPES, decode_result, encode_result
+
+
+def _encode(result, fmt):
+    """
+    Server side: helper result -> response body bytes, as backend.render does it.
+    arrow/parquet send one frame per response, so both frames cost two bodies.
+    """
+    if fmt == "json":
+        return [JSONResponse(jsonable_encoder(encode_result(result, "json"))).body]
+    if fmt == "columns":
+        return [encode_result(result, fmt)]
+    return [encode_result(result, fmt, frame) for frame in ("raw_data", "cleaned_data")]
+
+
+def _decode(bodies, fmt):
+    """Client side: every body -> one dict of frames."""
+    decoded = {}
+    for body in bodies:
+        decoded.update(decode_result(body, MEDIA_TYPES[fmt]))
+    return decoded
+
+
+def _timed(fn, repeat):
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return value, best
+
+
+def benchmark_response_formats(sizes=(10_000, 100_000), repeat=3):
+    """Payload size, server encode time and client decode time of a raw + cleaned result per format."""
+    for rows in sizes:
+        df = make_dirty_frame(rows)
+        result = {"raw_data": df, "cleaned_data": df.dropna()}
+        print(f"\n📊 Response formats: raw + cleaned frames of {rows:,} rows x {df.shape[1]} columns")
+        print(f"   {'format':>8} | {'size':>10} | {'encode':>8} | {'decode':>8} | {'total':>8}")
+
+        baseline = None
+        for fmt in MEDIA_TYPES:
+            bodies, encode = _timed(lambda: _encode(result, fmt), repeat)
+            decoded, decode = _timed(lambda: _decode(bodies, fmt), repeat)
+            assert decoded["cleaned_data"].shape == result["cleaned_data"].shape
+            assert decoded["raw_data"].shape == result["raw_data"].shape
+            size = sum(len(body) for body in bodies)
+            baseline = baseline or (encode + decode)
+            print(
+                f"   {fmt:>8} | {size / 1024 / 1024:7.2f} MB | {encode * 1000:6.0f} ms | {decode * 1000:6.0f} ms"
+                f" | {(encode + decode) * 1000:6.0f} ms ({baseline / (encode + decode):.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    benchmark_response_formats()
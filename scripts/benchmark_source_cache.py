@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from scripts.benchmark_ai_agent import make_dirty_frame
+from scripts.csv_ingestion import read_csv_fast
+from scripts.source_cache import SourceCache
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def benchmark_source_cache(csv_rows=2_000_000, excel_rows=100_000):
+    """Cold parse vs warm cache load of a CSV and an Excel file, plus a reload after `touch`."""
+    directory = tempfile.mkdtemp()
+    try:
+        cache = SourceCache(directory=os.path.join(directory, "cache"))
+        sources = []
+        csv_path = os.path.join(directory, "data.csv")
+        make_dirty_frame(csv_rows).to_csv(csv_path, index=False)
+        sources.append(("csv", csv_path, lambda: read_csv_fast(csv_path)))
+        excel_path = os.path.join(directory, "data.xlsx")
+        make_dirty_frame(excel_rows).to_excel(excel_path, index=False)
+        sources.append(("excel", excel_path, lambda: pd.read_excel(excel_path)))
+
+        for reader, path, loader in sources:
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"\n📊 Source cache, {reader}: {size:.1f} MB file")
+            parsed, cold = _timed(lambda: cache.load(path, loader, reader))
+            print(f"   parse + store : {cold * 1000:8.1f} ms  ({len(parsed):,} rows)")
+            _, warm = _timed(lambda: cache.load(path, loader, reader))
+            print(f"   warm load     : {warm * 1000:8.1f} ms  ({cold / warm:.0f}x)")
+            os.utime(path, None)
+            _, touched = _timed(lambda: cache.load(path, loader, reader))
+            print(f"   after touch   : {touched * 1000:8.1f} ms  (content re-hashed, still a hit)")
+        print(f"   🗂️ {cache.stats()}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    benchmark_source_cache()
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from scripts.cleaning_engines import ENGINES
+from scripts.data_cleaning import DataCleaning
+
+STRATEGIES = ("mean", "median", "mode", "drop")
+
+
+def make_parity_frame(rows=5000, seed=0):
+    """Dirty frame covering the cases engines disagree on most easily: NaN vs None, ties, duplicates."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": rng.integers(0, rows // 4, rows),
+        "age": rng.integers(18, 80, rows).astype(float),
+        "score": rng.normal(50, 10, rows).round(1),
+        "city": rng.choice(np.array(["New York", "Chicago", "Houston", None], dtype=object), rows),
+        "zip": rng.integers(10000, 10010, rows).astype(str).astype(object),
+        "active": rng.choice([True, False], rows),
+    }, index=rng.permutation(rows) + 1000)
+    df.loc[df.sample(frac=0.05, random_state=seed).index, "age"] = np.nan
+    df.loc[df.sample(frac=0.05, random_state=seed + 1).index, "score"] = np.nan
+    return pd.concat([df, df.sample(frac=0.1, random_state=seed)])
+
+
+def make_edge_frames():
+    """Small frames for dtypes engines round-trip differently; each must match pandas exactly."""
+    return {
+        "mixed object": pd.DataFrame({"m": pd.Series([1, "x", None, 1], dtype=object), "v": [1.0, 2.0, np.nan, 1.0]}),
+        "int column names": pd.DataFrame({0: [1.0, np.nan, 3.0, 1.0], 1: [1, 2, 3, 1]}),
+        "datetime": pd.DataFrame({
+            "d": pd.to_datetime(["2024-01-01", None, "2024-01-01", "2024-02-01"]), "v": [1, 2, 1, 4],
+        }),
+        "bool with None": pd.DataFrame({"b": pd.Series([True, None, False, True], dtype=object), "v": [1, 2, 3, 1]}),
+        "nullable boolean": pd.DataFrame({"b": pd.Series([True, None, False, True], dtype="boolean"), "v": [1, 2, 3, 1]}),
+    }
+
+
+def check_engine_parity(engines=ENGINES, strategies=STRATEGIES):
+    """Runs clean_data, handle_missing_values and remove_duplicates on every engine and compares to pandas."""
+    frames = {"parity frame": make_parity_frame(), **make_edge_frames()}
+    failures = 0
+    for engine in engines:
+        if engine == "pandas":
+            continue
+        try:
+            other = DataCleaning(engine=engine)
+        except ImportError as e:
+            print(f"⚠️  Skipping {engine}: {e}")
+            continue
+        reference = DataCleaning(engine="pandas")
+
+        for frame, df in frames.items():
+            for strategy in strategies:
+                checks = {
+                    "clean_data": lambda cleaner: cleaner.clean_data(df, strategy),
+                    "handle_missing_values": lambda cleaner: cleaner.handle_missing_values(df, strategy),
+                    "remove_duplicates": lambda cleaner: cleaner.remove_duplicates(df),
+                }
+                for name, run in checks.items():
+                    try:
+                        expected = run(reference)
+                    except Exception:
+                        # pandas itself rejects this input (e.g. a mean fill of a boolean column)
+                        continue
+                    try:
+                        pd.testing.assert_frame_equal(run(other), expected, check_dtype=True)
+                        print(f"✅ {engine:<7} {strategy:<7} {name} ({frame})")
+                    except AssertionError as e:
+                        failures += 1
+                        print(f"❌ {engine:<7} {strategy:<7} {name} ({frame}): {e}")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if check_engine_parity() else 0)
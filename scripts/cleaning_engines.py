@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+# Carries each row's position through engines that don't keep a pandas index
+ROW_NR = "__row_nr"
+
+ENGINES = ("pandas", "polars", "duckdb")
+
+
+# Object columns of these kinds have a columnar equivalent; anything else (e.g. [1, "x"]) is left to pandas
+COLUMNAR_OBJECT_KINDS = {"string", "boolean", "integer", "floating", "empty"}
+
+
+def _columnar(df):
+    """True when every object column holds a single kind of value, so an engine can't change the data."""
+    return all(
+        pd.api.types.infer_dtype(df[col], skipna=True) in COLUMNAR_OBJECT_KINDS
+        for col in df.columns if df[col].dtype == object
+    )
+
+
+def _restore_frame(result, df, filled):
+    """
+    Maps the engine's output back onto the input's index labels (in input order) and columns
+    Index, with pandas' dtypes: the input's dtype for every column, except that filled object
+    columns are downcast the way DataFrame.fillna downcasts them (e.g. [True, None] -> bool).
+    """
+    positions = result.pop(ROW_NR).to_numpy()
+    result.index = df.index[positions]
+    result.columns = df.columns
+    for position, col in enumerate(df.columns):
+        dtype = df.dtypes.iloc[position]
+        values = result.iloc[:, position]
+        if dtype == object:
+            # Cells still missing keep the input's own marker (None or NaN), not the engine's
+            cells = values.astype(object).to_numpy()
+            missing = pd.isna(cells)
+            cells[missing] = df.iloc[positions, position].to_numpy()[missing]
+            restored = pd.Series(cells, index=result.index, name=values.name, dtype=object)
+            if col in filled:
+                restored = restored.infer_objects()
+        elif values.dtype != dtype:
+            restored = values.astype(dtype)
+        else:
+            continue
+        result.isetitem(position, restored)
+    return result
+
+
+def _mode_value(values, counts):
+    """pandas' mode tie-break: highest count, then the smallest value."""
+    frame = pd.DataFrame({"value": values, "count": counts})
+    top = frame[frame["count"] == frame["count"].max()]["value"]
+    if not len(top):
+        return np.nan
+    value = top.sort_values().iloc[0]
+    # Plain Python scalar: DuckDB can't bind numpy ones such as np.bool_
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _numeric_columns(df):
+    return [
+        col for col in df.columns
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+    ]
+
+
+# ----------------------- Polars Engine -----------------------------
+
+class PolarsEngine:
+    """Multi-threaded fill/dedup with polars; pandas in, pandas out."""
+
+    name = "polars"
+
+    def __init__(self):
+        try:
+            import polars as pl
+        except ImportError as e:
+            raise ImportError("❌ The polars engine needs `pip install polars`.") from e
+        self.pl = pl
+
+    def run(self, df, strategy="mean", dedupe=True):
+        """Returns None (pandas fallback) for frames with mixed-type object columns."""
+        if not _columnar(df):
+            return None
+        pl = self.pl
+        frame = pl.from_pandas(df.reset_index(drop=True), nan_to_null=True).with_row_index(ROW_NR)
+        value_columns = [str(col) for col in df.columns]
+        null_counts = frame.select(value_columns).null_count().row(0, named=True)
+        with_nulls = [col for col in value_columns if null_counts[col] > 0]
+        filled = set()
+
+        if strategy == "drop":
+            frame = frame.drop_nulls(value_columns)
+        elif strategy in ("mean", "median"):
+            numeric = set(str(col) for col in _numeric_columns(df))
+            fills = [
+                pl.col(col).fill_null(getattr(pl.col(col), strategy)())
+                for col in with_nulls if col in numeric
+            ]
+            if fills:
+                frame = frame.with_columns(fills)
+        elif strategy == "mode":
+            fills = []
+            for col in with_nulls:
+                counts = frame.get_column(col).drop_nulls().value_counts()
+                if counts.height:
+                    value = _mode_value(counts.get_column(col).to_list(), counts.get_column("count").to_list())
+                    fills.append(pl.col(col).fill_null(value))
+                    filled.add(col)
+            if fills:
+                frame = frame.with_columns(fills)
+
+        if dedupe:
+            frame = frame.unique(subset=value_columns, keep="first", maintain_order=True)
+
+        result = frame.to_pandas()
+        return _restore_frame(result, df, {df.columns[value_columns.index(col)] for col in filled})
+
+
+# ----------------------- DuckDB Engine -----------------------------
+
+class DuckDBEngine:
+    """Fill/dedup as one DuckDB SQL query over the registered DataFrame; pandas in, pandas out."""
+
+    name = "duckdb"
+
+    def __init__(self):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("❌ The duckdb engine needs `pip install duckdb`.") from e
+        self.duckdb = duckdb
+
+    @staticmethod
+    def _quote(name):
+        return '"' + str(name).replace('"', '""') + '"'
+
+    def run(self, df, strategy="mean", dedupe=True):
+        """Returns None (pandas fallback) for frames with mixed-type object columns."""
+        if not _columnar(df):
+            return None
+        con = self.duckdb.connect()
+        try:
+            source = df.reset_index(drop=True)
+            source.columns = [str(col) for col in df.columns]
+            source.insert(0, ROW_NR, np.arange(len(source)))
+            con.register("source", source)
+
+            q = self._quote
+            value_columns = [str(col) for col in df.columns]
+            null_counts = con.execute(
+                "SELECT " + ", ".join(f"COUNT(*) - COUNT({q(col)})" for col in value_columns) + " FROM source"
+            ).fetchone()
+            with_nulls = [col for col, nulls in zip(value_columns, null_counts) if nulls]
+
+            select = {col: q(col) for col in value_columns}
+            filled = set()
+            where = ""
+            params = []
+            if strategy == "drop" and value_columns:
+                where = "WHERE " + " AND ".join(f"{q(col)} IS NOT NULL" for col in value_columns)
+            elif strategy in ("mean", "median"):
+                numeric = set(str(col) for col in _numeric_columns(df))
+                aggregate = "avg" if strategy == "mean" else "median"
+                for col in with_nulls:
+                    if col in numeric:
+                        value = con.execute(f"SELECT {aggregate}({q(col)}) FROM source").fetchone()[0]
+                        if value is not None:
+                            select[col] = f"COALESCE({q(col)}, ?) AS {q(col)}"
+                            params.append(value)
+            elif strategy == "mode":
+                for col in with_nulls:
+                    rows = con.execute(
+                        f"SELECT {q(col)}, COUNT(*) FROM source WHERE {q(col)} IS NOT NULL GROUP BY 1"
+                    ).fetchall()
+                    if rows:
+                        values, counts = zip(*rows)
+                        select[col] = f"COALESCE({q(col)}, ?) AS {q(col)}"
+                        params.append(_mode_value(list(values), list(counts)))
+                        filled.add(col)
+
+            query = f"SELECT {q(ROW_NR)}, {', '.join(select.values())} FROM source {where}"
+            if dedupe and value_columns:
+                partition = ", ".join(q(col) for col in value_columns)
+                query = (
+                    f"SELECT * FROM ({query}) "
+                    f"QUALIFY row_number() OVER (PARTITION BY {partition} ORDER BY {q(ROW_NR)}) = 1"
+                )
+            query += f" ORDER BY {q(ROW_NR)}"
+
+            result = con.execute(query, params).df()
+        finally:
+            con.close()
+
+        return _restore_frame(result, df, {df.columns[value_columns.index(col)] for col in filled})
+
+
+def get_engine(name):
+    """Returns an engine instance for `name`, or None for plain pandas."""
+    if name in (None, "pandas"):
+        return None
+    if name == "polars":
+        return PolarsEngine()
+    if name == "duckdb":
+        return DuckDBEngine()
+    raise ValueError(f"Unknown cleaning engine '{name}'. Choose one of {', '.join(ENGINES)}.")
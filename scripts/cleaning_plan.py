@@ -0,0 +1,212 @@
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+
+# ----------------------- Plan Steps -----------------------------
+# Column steps rewrite only the columns they change. Row filters only produce a boolean mask;
+# pending masks are AND-ed together and applied in a single take right before the next step
+# that reads column statistics (or at the end of the plan).
+
+class FillMissing:
+    def __init__(self, strategy="mean"):
+        self.strategy = strategy
+        self.kind = "row_filter" if strategy == "drop" else "column"
+        self.reads_statistics = strategy != "drop"
+
+    def describe(self):
+        if self.strategy == "drop":
+            return "fill_missing(strategy='drop')  [row filter: rows with any missing value]"
+        return f"fill_missing(strategy='{self.strategy}')  [column op: only columns with missing values]"
+
+    def mask(self, df, cleaner):
+        return df.notna().all(axis=1).to_numpy()
+
+    def apply(self, df, cleaner):
+        na_counts = df.isna().sum()
+        columns = na_counts[na_counts > 0].index
+        if len(columns) == 0:
+            return df
+
+        if self.strategy == "mean":
+            fill_values = df[columns].mean(numeric_only=True)
+        elif self.strategy == "median":
+            fill_values = df[columns].median(numeric_only=True)
+        elif self.strategy == "mode":
+            modes = df[columns].mode()
+            # All-NaN columns have no mode; an empty mode frame means there is nothing to fill
+            if modes.empty:
+                return df
+            fill_values = modes.iloc[0]
+        else:
+            return df
+
+        for col, value in fill_values.items():
+            if pd.notna(value):
+                df[col] = df[col].fillna(value)
+        return df
+
+
+class DropDuplicates:
+    kind = "row_filter"
+    reads_statistics = False
+
+    def __init__(self, subset=None):
+        self.subset = subset
+
+    def describe(self):
+        subset = f"subset={self.subset!r}" if self.subset else ""
+        return f"drop_duplicates({subset})  [row filter: keep first occurrence]"
+
+    def mask(self, df, cleaner):
+        # Safe to compute on the unfiltered frame: the only other row filter drops rows with
+        # missing values, and every duplicate of such a row has the same missing values.
+        return ~df.duplicated(subset=self.subset).to_numpy()
+
+
+class FixTypes:
+    kind = "column"
+    reads_statistics = True
+
+    def __init__(self, **options):
+        self.options = options
+
+    def describe(self):
+        options = ", ".join(f"{k}={v!r}" for k, v in self.options.items())
+        return f"fix_types({options})  [column op: only columns whose type changes]"
+
+    def apply(self, df, cleaner):
+        return cleaner.fix_data_types(df, **self.options)
+
+
+class ApplyRules:
+    kind = "column"
+    reads_statistics = True
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def describe(self):
+        columns = self.rules.get("columns", []) if isinstance(self.rules, dict) else self.rules.columns
+        count = len(columns)
+        return f"apply_rules({count} column rule(s))  [column op]"
+
+    def apply(self, df, cleaner):
+        return cleaner.apply_rules(df, self.rules)
+
+
+# ----------------------- Cleaning Plan -----------------------------
+
+class CleaningPlan:
+    """
+    Lazily built, explainable sequence of cleaning steps.
+
+        plan = DataCleaning().plan().fill_missing("median").drop_duplicates().fix_types()
+        print(plan.explain())
+        cleaned = plan.execute(df)
+
+    `execute` never mutates its input: it runs under pandas copy-on-write, so untouched columns
+    share memory with the input and only rewritten columns are allocated. Per-step timing,
+    row counts and memory are stored in `last_profile`.
+    """
+
+    def __init__(self, cleaner, trace_memory=False):
+        self.cleaner = cleaner
+        self.trace_memory = trace_memory
+        self.steps = []
+        self.last_profile = []
+
+    def fill_missing(self, strategy="mean"):
+        self.steps.append(FillMissing(strategy))
+        return self
+
+    def drop_duplicates(self, subset=None):
+        self.steps.append(DropDuplicates(subset))
+        return self
+
+    def fix_types(self, **options):
+        self.steps.append(FixTypes(**options))
+        return self
+
+    def apply_rules(self, rules):
+        self.steps.append(ApplyRules(rules))
+        return self
+
+    def _stages(self):
+        """Groups steps into (step, materialize_before) pairs following the fusion rules."""
+        stages = []
+        pending_filter = False
+        for step in self.steps:
+            materialize = pending_filter and step.kind == "column" and step.reads_statistics
+            if materialize:
+                pending_filter = False
+            if step.kind == "row_filter":
+                pending_filter = True
+            stages.append((step, materialize))
+        return stages, pending_filter
+
+    def explain(self):
+        """Human-readable execution plan, showing where row filters are fused and applied."""
+        stages, trailing_filter = self._stages()
+        takes = sum(1 for _, materialize in stages if materialize) + int(trailing_filter)
+        lines = [f"CleaningPlan: {len(self.steps)} step(s), {takes} row take(s), input is never mutated"]
+        for number, (step, materialize) in enumerate(stages, start=1):
+            if materialize:
+                lines.append("   -- apply pending row filters (single take)")
+            lines.append(f"  {number}. {step.describe()}")
+        if trailing_filter:
+            lines.append("   -- apply pending row filters (single take)")
+        return "\n".join(lines)
+
+    def execute(self, df):
+        """Runs the plan on `df` and returns a new DataFrame."""
+        stages, trailing_filter = self._stages()
+        self.last_profile = []
+
+        with pd.option_context("mode.copy_on_write", True):
+            out = df.copy(deep=False)
+            keep = None
+
+            for step, materialize in stages:
+                if self.trace_memory:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                rows_before = len(out) if keep is None else int(keep.sum())
+
+                if materialize and keep is not None:
+                    out = out[keep]
+                    keep = None
+
+                if step.kind == "row_filter":
+                    mask = step.mask(out, self.cleaner)
+                    keep = mask if keep is None else keep & mask
+                    rows_after = int(keep.sum())
+                else:
+                    out = step.apply(out, self.cleaner)
+                    rows_after = len(out) if keep is None else int(keep.sum())
+
+                entry = {
+                    "step": step.describe().split("  [")[0],
+                    "seconds": round(time.perf_counter() - start, 6),
+                    "rows_before": rows_before,
+                    "rows_after": rows_after,
+                    "frame_bytes": int(out.memory_usage(index=False).sum()),
+                }
+                if self.trace_memory:
+                    entry["peak_alloc_bytes"] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                self.last_profile.append(entry)
+
+            if keep is not None:
+                out = out[keep]
+
+            # Once copy-on-write is switched off again, a column still shared with the input could
+            # be mutated through the result; copy only in that case (after a row take nothing is shared)
+            if any(
+                col in df.columns and np.shares_memory(out[col].to_numpy(), df[col].to_numpy())
+                for col in out.columns
+            ):
+                out = out.copy()
+
+        return out
@@ -2,8 +2,14 @@ import psycopg2
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import os
+import argparse
+import time
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 
+from scripts.db_writer import DB_WRITE_BATCH_ROWS, copy_frame
+
 # Load your password from .env
 load_dotenv()
 
@@ -88,6 +94,76 @@ def create_table_and_data():
     except Exception as e:
         print(f"❌ Error managing table/data: {e}")
 
+# ----------------------- Synthetic Dirty Data (benchmarks) -----------------------------
+
+NAMES = np.array(["Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace", "Heidi"])
+CITIES = np.array(["New York", "new york ", "Los Angeles", "LA", "Chicago", "chicago", "Houston", "San Francisco"])
+
+def make_dirty_rows(n, seed=0, start_id=1):
+    """`n` synthetic rows for my_table_dirty: missing values, bad ages, messy cities, salary outliers, duplicates."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(start_id, start_id + n),
+        "name": NAMES[rng.integers(0, len(NAMES), n)],
+        "age": pd.array(rng.integers(18, 70, n), dtype="Int64"),
+        "city": CITIES[rng.integers(0, len(CITIES), n)],
+        "salary": rng.normal(65000, 15000, n).round(2),
+    })
+    df.loc[rng.random(n) < 0.05, "name"] = None
+    df.loc[rng.random(n) < 0.05, "age"] = pd.NA
+    df.loc[rng.random(n) < 0.01, "age"] = -1
+    df.loc[rng.random(n) < 0.05, "salary"] = np.nan
+    df.loc[rng.random(n) < 0.005, "salary"] *= 100
+    # ~2% exact duplicates of an earlier row's values (new id)
+    duplicates = np.flatnonzero(rng.random(n) < 0.02)
+    duplicates = duplicates[duplicates > 0]
+    sources = rng.integers(0, duplicates, len(duplicates)) if len(duplicates) else duplicates
+    df.loc[duplicates, ["name", "age", "city", "salary"]] = df.loc[sources, ["name", "age", "city", "salary"]].to_numpy()
+    return df
+
+def seed_dirty_rows(total, table="my_table_dirty", batch_rows=DB_WRITE_BATCH_ROWS):
+    """Creates `table` and bulk-loads `total` synthetic dirty rows with COPY, batch by batch."""
+    try:
+        con = psycopg2.connect(
+            dbname=NEW_DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST
+        )
+        cursor = con.cursor()
+        target = sql.Identifier(table).as_string(con)
+        cursor.execute(f"DROP TABLE IF EXISTS {target}")
+        cursor.execute(f"""
+        CREATE TABLE {target} (
+            id BIGINT PRIMARY KEY,
+            name VARCHAR(50),
+            age INTEGER,
+            city VARCHAR(50),
+            salary DOUBLE PRECISION
+        );
+        """)
+
+        start = time.perf_counter()
+        columns = [sql.Identifier(col).as_string(con) for col in ("id", "name", "age", "city", "salary")]
+        for offset in range(0, total, batch_rows):
+            n = min(batch_rows, total - offset)
+            copy_frame(cursor, target, columns, make_dirty_rows(n, seed=offset, start_id=offset + 1))
+        con.commit()
+        seconds = time.perf_counter() - start
+        print(f"✅ {total:,} dirty rows loaded into '{table}' in {seconds:.1f}s ({total / seconds:,.0f} rows/sec)")
+
+        cursor.close()
+        con.close()
+
+    except Exception as e:
+        print(f"❌ Error seeding dirty rows: {e}")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the demo database.")
+    parser.add_argument("--dirty-rows", type=int, default=0, help="also seed my_table_dirty with this many synthetic rows")
+    args = parser.parse_args()
+
     create_database()
     create_table_and_data()
+    if args.dirty_rows:
+        seed_dirty_rows(args.dirty_rows)
@@ -0,0 +1,198 @@
+import codecs
+import csv
+import io
+import mmap
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Bytes looked at to guess the encoding and delimiter of a CSV
+CSV_SNIFF_BYTES = int(os.getenv("CSV_SNIFF_BYTES", "65536"))
+
+DELIMITERS = ",;\t|"
+
+# pandas' default NA strings, so both readers agree on what is missing
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+# ----------------------- Sniffing -----------------------------
+
+def sniff_encoding(prefix):
+    """Encoding of a CSV from its first bytes: a BOM, else UTF-8 if the prefix decodes, else cp1252/latin-1."""
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    try:
+        # Incremental decode: a multi-byte character cut off at the end of the prefix is fine
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        prefix.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def sniff_csv(prefix):
+    """
+    {"encoding", "delimiter", "quotechar"} of a CSV from its first bytes. The delimiter is one of
+    `DELIMITERS` as found by csv.Sniffer on whole lines of the prefix; "," when it can't tell.
+    """
+    encoding = sniff_encoding(prefix)
+    text = prefix.decode(encoding, errors="ignore")
+    if len(prefix) >= CSV_SNIFF_BYTES and "\n" in text:
+        # Drop the partial last line
+        text = text[:text.rindex("\n")]
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=DELIMITERS)
+        delimiter, quotechar = dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        delimiter, quotechar = ",", '"'
+    return {"encoding": encoding, "delimiter": delimiter, "quotechar": quotechar}
+
+
+def pandas_read_kwargs(dialect):
+    """sniff_csv result -> pd.read_csv keyword arguments."""
+    return {"encoding": dialect["encoding"], "sep": dialect["delimiter"], "quotechar": dialect["quotechar"]}
+
+
+# ----------------------- Reading -----------------------------
+
+def table_to_frame(table):
+    """Arrow table -> DataFrame as pandas' own readers build it; the table is consumed."""
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    for col in df.columns[df.dtypes == object]:
+        # Missing text is None coming from Arrow, NaN from pd.read_csv
+        if df[col].hasnans:
+            df[col] = df[col].fillna(np.nan)
+    return df
+
+
+def _buffer(source):
+    """
+    A pyarrow readable over the CSV bytes without copying them: a memory map of a path or of
+    a file on disk, or the in-memory buffer of a small spooled upload.
+    """
+    import pyarrow as pa
+
+    if isinstance(source, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(source), "r")
+    # SpooledTemporaryFile keeps small uploads in a BytesIO and rolls larger ones to disk
+    raw = getattr(source, "_file", source)
+    if isinstance(raw, io.BytesIO):
+        return pa.BufferReader(pa.py_buffer(raw.getbuffer()))
+    if os.fstat(raw.fileno()).st_size == 0:
+        return pa.BufferReader(b"")
+    return pa.BufferReader(pa.py_buffer(mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)))
+
+
+def _read_prefix(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read(CSV_SNIFF_BYTES)
+    source.seek(0)
+    prefix = source.read(CSV_SNIFF_BYTES)
+    source.seek(0)
+    return prefix
+
+
+def _read_with_pandas(source, dialect):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return pd.read_csv(source, encoding_errors="replace", **pandas_read_kwargs(dialect))
+
+
+def read_csv_fast(source, dialect=None, use_threads=True):
+    """
+    Reads a CSV path or binary file object into a DataFrame with pyarrow's multithreaded parser,
+    straight from a memory map of the file. Encoding and delimiter come from sniff_csv unless
+    `dialect` is given. The result matches pd.read_csv: dates stay text, a column whose later
+    rows don't fit the type inferred from the first block is read as text, pandas' NA strings
+    are missing and empty header cells are "Unnamed: N". Falls back to pd.read_csv when pyarrow
+    is missing or rejects the file, and for numbers beyond int64/float range, which pyarrow
+    would round to float or inf.
+    """
+    dialect = dialect or sniff_csv(_read_prefix(source))
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return _read_with_pandas(source, dialect)
+
+    encoding = dialect["encoding"]
+    read_options = pa_csv.ReadOptions(
+        use_threads=use_threads,
+        # pyarrow skips a UTF-8 BOM itself; anything else is transcoded while reading
+        encoding="utf8" if encoding in ("utf-8", "utf-8-sig") else encoding,
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=dialect["delimiter"], quote_char=dialect["quotechar"])
+
+    def convert_options(column_types):
+        return pa_csv.ConvertOptions(
+            column_types=column_types, null_values=NA_VALUES, strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+        )
+
+    try:
+        # Types pyarrow would infer from the first block; pd.read_csv leaves dates as text
+        with pa_csv.open_csv(_buffer(source), read_options=read_options, parse_options=parse_options,
+                             convert_options=convert_options({})) as reader:
+            schema = reader.schema
+        if len(set(schema.names)) != len(schema.names):
+            # pandas renames duplicate headers ("a", "a.1"); leave those files to it
+            return _read_with_pandas(source, dialect)
+        column_types = {
+            field.name: pa.string()
+            for field in schema
+            if pa.types.is_temporal(field.type)
+        }
+        for _ in range(len(schema) + 1):
+            try:
+                table = pa_csv.read_csv(_buffer(source), read_options=read_options,
+                                        parse_options=parse_options, convert_options=convert_options(column_types))
+                break
+            except pa.ArrowInvalid as error:
+                # "In CSV column #3: ... CSV conversion error to int64": re-read that column as text
+                match = re.search(r"In CSV column #(\d+)", str(error))
+                name = schema.names[int(match.group(1))] if match else None
+                if name is None or name in column_types:
+                    raise
+                column_types[name] = pa.string()
+        else:
+            return _read_with_pandas(source, dialect)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, LookupError):
+        # Ragged rows, bad bytes for the sniffed encoding, a codec pyarrow can't use...
+        return _read_with_pandas(source, dialect)
+    if _lost_precision(table):
+        return _read_with_pandas(source, dialect)
+    # pandas names a column with an empty header cell after its position
+    table = table.rename_columns([name or f"Unnamed: {position}" for position, name in enumerate(table.column_names)])
+    return table_to_frame(table)
+
+
+def _lost_precision(table):
+    """
+    True when a float column holds magnitudes of 2**63 or more: integers too big for int64
+    (pandas keeps them exact as uint64 or text) or values that overflowed to inf (text in pandas).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for column in table.columns:
+        if pa.types.is_floating(column.type) and column.null_count < len(column):
+            if pc.max(pc.abs(column)).as_py() >= 2**63:
+                return True
+    return False
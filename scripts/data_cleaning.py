@@ -1,35 +1,425 @@
+import os
+import re
+import warnings
 import pandas as pd
 import numpy as np
+from typing import Any, Dict, List, Literal, Optional
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+from pydantic import BaseModel, field_validator
+
+from scripts.cleaning_engines import get_engine
+from scripts.cleaning_plan import CleaningPlan
+from scripts.deduplication import NEAR_DUPLICATE_THRESHOLD, drop_near_duplicates
+
+# Execution engine for fill/dedup: pandas (default), polars or duckdb
+CLEANING_ENGINE = os.getenv("CLEANING_ENGINE", "pandas")
+# Processes for clean_data on the pandas engine (1 = serial, 0 = one per core); see scripts/parallel_cleaning.py
+CLEANING_WORKERS = int(os.getenv("CLEANING_WORKERS", "1")) or os.cpu_count() or 1
+
+
+# ----------------------- Declarative Cleaning Rules -----------------------------
+# Emitted once by the AI agent from a sample, then applied vectorized to the full frame.
+
+class RegexReplacement(BaseModel):
+    pattern: str
+    replacement: str = ""
+
+    @field_validator("pattern")
+    @classmethod
+    def pattern_must_compile(cls, value):
+        try:
+            re.compile(value)
+        except re.error as e:
+            raise ValueError(f"invalid regex {value!r}: {e}")
+        return value
+
+
+class ColumnRule(BaseModel):
+    """Transformations for one column, applied in field order:
+    strip_whitespace -> case -> regex_replace -> value_map -> cast -> impute."""
+    column: str
+    strip_whitespace: bool = False
+    case: Optional[Literal["lower", "upper", "title"]] = None
+    regex_replace: List[RegexReplacement] = []
+    value_map: Dict[str, Any] = {}
+    cast: Optional[Literal["int", "float", "string", "datetime", "bool", "category"]] = None
+    impute: Optional[Literal["mean", "median", "mode", "constant", "drop"]] = None
+    fill_value: Optional[Any] = None
+
+
+class CleaningRules(BaseModel):
+    columns: List[ColumnRule] = []
+    drop_duplicates: bool = False
+
+
+_TRUE_STRINGS = {"true", "t", "yes", "y", "1"}
+_FALSE_STRINGS = {"false", "f", "no", "n", "0"}
+
+# Stricter vocabulary used when *inferring* booleans, so 0/1 columns stay numeric
+_BOOL_WORDS = {"true", "false", "yes", "no"}
+
+# Type inference settings for fix_data_types
+TYPE_SAMPLE_SIZE = 1000
+CATEGORY_MAX_RATIO = 0.5  # unique/non-null at or below this ratio -> category
+CATEGORY_MIN_ROWS = 100
+
+
+def _to_boolean(col):
+    """Maps true/false-like text to a nullable boolean column; anything else becomes <NA>."""
+    # Normalize the distinct values only, then broadcast back through the factorized codes
+    codes, uniques = pd.factorize(col)
+    lowered = pd.Index(uniques).astype(str).str.strip().str.lower()
+    lookup = np.where(lowered.isin(_TRUE_STRINGS), 1, np.where(lowered.isin(_FALSE_STRINGS), 0, -1))
+    values = np.where(codes >= 0, lookup[codes] if len(lookup) else -1, -1)
+    return pd.Series(
+        pd.arrays.BooleanArray(values == 1, values == -1),
+        index=col.index,
+    )
+
+
+def _downcast_numeric(col, narrow=False):
+    """
+    Narrowest width that holds every value exactly, but no integer below int32 so arithmetic on
+    the result doesn't wrap (uint8 200 * 200 == 64). `narrow` allows int8/uint8 etc. for storage.
+    """
+    if pd.api.types.is_bool_dtype(col) or not pd.api.types.is_numeric_dtype(col):
+        return col
+    if pd.api.types.is_integer_dtype(col):
+        values = col.dropna()
+        if narrow:
+            unsigned = not values.empty and values.min() >= 0
+            return pd.to_numeric(col, downcast="unsigned" if unsigned else "integer")
+        info = np.iinfo(np.int32)
+        if col.dtype.itemsize <= 4 or values.empty or values.min() < info.min or values.max() > info.max:
+            return col
+        return col.astype(np.int32 if isinstance(col.dtype, np.dtype) else "Int32")
+    if pd.api.types.is_float_dtype(col) and col.dtype != np.float32:
+        values = col.to_numpy()
+        as_float32 = values.astype(np.float32)
+        if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+            return col.astype(np.float32)
+    return col
+
+
+def _to_datetime_mixed(col):
+    """
+    Parses every value with its own format (the first value's format would turn differently
+    formatted dates into NaT); values with different UTC offsets are converted to UTC.
+    """
+    with warnings.catch_warnings():
+        # pandas 2.x warns and returns objects for mixed offsets; pandas 3 raises
+        warnings.simplefilter("ignore", FutureWarning)
+        try:
+            parsed = pd.to_datetime(col, errors="coerce", format="mixed")
+        except ValueError:
+            parsed = None
+    if parsed is None or not pd.api.types.is_datetime64_any_dtype(parsed):
+        parsed = pd.to_datetime(col, errors="coerce", format="mixed", utc=True)
+    return parsed
+
 
 class DataCleaning:
-    def handle_missing_values(self, df, strategy="mean"):
-        """Handles missing values by filling with mean, median, mode, or dropping."""
-        if strategy == "mean":
-            df.fillna(df.mean(numeric_only=True), inplace=True)
+    def __init__(self, engine=None, workers=None):
+        """
+        `engine` picks where missing-value handling and deduplication run: "pandas", "polars"
+        or "duckdb" (default: CLEANING_ENGINE). Results are identical; type fixing is shared pandas code.
+        With the pandas engine, clean_data on frames of PARALLEL_MIN_ROWS or more runs across
+        `workers` processes (default: CLEANING_WORKERS), again with identical results.
+        """
+        self.engine_name = engine or CLEANING_ENGINE
+        self.engine = get_engine(self.engine_name)
+        self.workers = workers or CLEANING_WORKERS
+
+    def handle_missing_values(self, df, strategy="mean", fill_values=None):
+        """
+        Handles missing values by filling with mean, median, mode, or dropping.
+        Precomputed `fill_values` (column -> value, e.g. global stats of a chunked file) override the strategy.
+        """
+        if self.engine is not None and fill_values is None:
+            result = self._run_engine(df, strategy, dedupe=False)
+            if result is not None:
+                return result
+
+        if fill_values is not None and strategy != "drop":
+            df = df.fillna(fill_values)
+        elif strategy == "mean":
+            df = df.fillna(df.mean(numeric_only=True))
         elif strategy == "median":
-            df.fillna(df.median(numeric_only=True), inplace=True)
+            df = df.fillna(df.median(numeric_only=True))
         elif strategy == "mode":
-            df.fillna(df.mode().iloc[0], inplace=True)
+            df = df.fillna(df.mode().iloc[0])
         elif strategy == "drop":
-            df.dropna(inplace=True)
+            df = df.dropna()
         return df
 
     def remove_duplicates(self, df):
         """Removes duplicate rows."""
+        if self.engine is not None:
+            result = self._run_engine(df, strategy=None, dedupe=True)
+            if result is not None:
+                return result
         return df.drop_duplicates()
 
-    def fix_data_types(self, df):
-        """Attempts to convert columns to appropriate data types."""
+    def remove_near_duplicates(self, df, columns, threshold=NEAR_DUPLICATE_THRESHOLD):
+        """
+        Keeps the first row of every cluster of near-duplicate rows on `columns` (case, spacing,
+        punctuation and small typos ignored; see scripts/deduplication.py).
+        """
+        return drop_near_duplicates(df, columns, threshold)
+
+    def _run_engine(self, df, strategy, dedupe):
+        """Runs fill/dedup on the configured engine; returns None if the frame can't be converted."""
+        try:
+            return self.engine.run(df, strategy, dedupe=dedupe)
+        except Exception as e:
+            # e.g. object columns mixing ints and strings have no columnar equivalent
+            print(f"⚠️ {self.engine_name} engine failed ({e}); falling back to pandas")
+            return None
+
+    def _infer_type(self, sample):
+        """Decides a target type for an object column from a sample of its non-null values."""
+        if len(sample) == 0 or not sample.map(type).eq(str).all():
+            # Only pure text columns are re-typed; mixed Python objects are left alone
+            return None
+        if pd.to_numeric(sample, errors="coerce").notna().all():
+            return "numeric"
+        if sample.str.strip().str.lower().isin(_BOOL_WORDS).all():
+            return "bool"
+        # A single guessed format lets the full column parse vectorized instead of value by value
+        datetime_format = guess_datetime_format(sample.iloc[0].strip()) or "mixed"
+        parsed = pd.to_datetime(sample, errors="coerce", format=datetime_format)
+        if parsed.notna().all():
+            return f"datetime:{datetime_format}"
+        return None
+
+    def fix_data_types(self, df, columns=None, sample_size=TYPE_SAMPLE_SIZE, downcast=True, categorize=True):
+        """
+        Converts columns (default: all) to appropriate data types.
+        Types are inferred from a sample of each text column (numeric, boolean, datetime) and the
+        whole column is then converted in one vectorized pass; a conversion that would turn any
+        existing value into NaN is rejected. Numeric columns are downcast to the smallest exact
+        width, integers no lower than int32 unless `downcast="narrow"` (internal storage only),
+        and repetitive text becomes `category`. The memory report is kept in `last_type_report`.
+        """
+        column_memory = df.memory_usage(deep=True, index=False)
+        memory_before = int(column_memory.sum())
+        memory_after = memory_before
+        changes = {}
+
+        for col in (df.columns if columns is None else columns):
+            series = df[col]
+            before = str(series.dtype)
+
+            if series.dtype == object:
+                non_null_count = int(series.count())
+                sample = series
+                if len(series) > sample_size:
+                    # Seeded per column, so a column samples the same rows whichever subset it is fixed in
+                    rng = np.random.default_rng(0)
+                    picks = np.concatenate([np.arange(sample_size // 2), rng.integers(0, len(series), sample_size // 2)])
+                    sample = series.iloc[picks]
+                sample = sample.dropna()
+                if len(sample) < min(non_null_count, sample_size // 10):
+                    # Sparse column: the positional sample hit mostly NaN, sample the non-null values instead
+                    sample = series.dropna().head(sample_size)
+
+                target = self._infer_type(sample)
+                converted = None
+                if target == "numeric":
+                    converted = pd.to_numeric(series, errors="coerce")
+                elif target == "bool":
+                    converted = _to_boolean(series)
+                elif target and target.startswith("datetime:"):
+                    converted = pd.to_datetime(series, errors="coerce", format=target.split(":", 1)[1])
+
+                # The sample can miss bad values: reject conversions that lose data
+                if converted is not None and converted.isna().sum() == series.isna().sum():
+                    series = converted
+                elif (
+                    categorize
+                    and non_null_count >= CATEGORY_MIN_ROWS
+                    and sample.map(type).eq(str).all()
+                    and sample.nunique() <= CATEGORY_MAX_RATIO * len(sample)
+                    and series.nunique() <= CATEGORY_MAX_RATIO * non_null_count
+                ):
+                    series = series.astype("category")
+
+            if downcast:
+                series = _downcast_numeric(series, narrow=downcast == "narrow")
+
+            if str(series.dtype) != before:
+                df[col] = series
+                changes[col] = f"{before} -> {series.dtype}"
+                memory_after += int(series.memory_usage(deep=True, index=False)) - int(column_memory[col])
+        self.last_type_report = {
+            "memory_before_bytes": memory_before,
+            "memory_after_bytes": memory_after,
+            "reduction": round(memory_before / memory_after, 2) if memory_after else None,
+            "columns": changes,
+        }
+        if changes:
+            print(f"🧬 Types fixed: {self.last_type_report}")
+        return df
+
+    def detect_problem_cells(self, df):
+        """
+        Flags cells that still need AI attention: missing values, values whose type differs
+        from the rest of the column, unparseable entries in mostly-numeric text columns,
+        stray whitespace, and case/spacing variants of a more common spelling.
+        Returns a boolean DataFrame shaped like `df`.
+        """
+        mask = df.isna()
+
         for col in df.columns:
-            try:
-                df[col] = pd.to_numeric(df[col])
-            except ValueError:
-                pass
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(object)
+            if series.dtype != object:
+                continue
+            # Positional flags so duplicate index labels can't smear across rows
+            flags = mask[col].to_numpy().copy()
+
+            # Mixed types: cells whose Python type is not the column's majority type
+            types = series.map(type)
+            non_null = series.notna().to_numpy()
+            if types[non_null].nunique() > 1:
+                flags |= non_null & types.ne(types[non_null].value_counts().idxmax()).to_numpy()
+
+            is_str = types.eq(str).to_numpy()
+            positions = np.flatnonzero(is_str)
+            text = series[is_str]
+            if text.empty:
+                mask[col] = flags
+                continue
+
+            # Mostly-numeric text column: the non-numeric leftovers ("60k", "n/a") are problems
+            parsed = pd.to_numeric(text, errors="coerce")
+            if parsed.notna().mean() >= 0.5:
+                flags[positions[parsed.isna().to_numpy()]] = True
+                mask[col] = flags
+                continue
+
+            # Formatting: leading/trailing or repeated whitespace
+            stripped = text.str.strip()
+            bad_spacing = text.ne(stripped) | text.str.contains(r"\s{2,}", regex=True)
+
+            # Variants: same value up to case/spacing, but not the most common spelling
+            counts = text.value_counts()
+            forms = pd.DataFrame({"raw": counts.index})
+            forms["canon"] = forms["raw"].str.strip().str.casefold().str.replace(r"\s+", " ", regex=True)
+            preferred = forms.drop_duplicates("canon").set_index("canon")["raw"]
+            canon = stripped.str.casefold().str.replace(r"\s+", " ", regex=True)
+            variant = text.ne(canon.map(preferred))
+
+            flags[positions[(bad_spacing | variant).to_numpy()]] = True
+            mask[col] = flags
+
+        return mask
+
+    def apply_rules(self, df, rules):
+        """Applies CleaningRules (or an equivalent dict) to the whole frame with vectorized pandas ops."""
+        if not isinstance(rules, CleaningRules):
+            rules = CleaningRules.model_validate(rules)
+
+        df = df.copy()
+        drop_mask = pd.Series(False, index=df.index)
+
+        for rule in rules.columns:
+            if rule.column not in df.columns:
+                print(f"⚠️ Rule skipped, unknown column: {rule.column}")
+                continue
+            col = df[rule.column]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                col = col.astype(object)
+
+            # String-level normalizations only touch string cells
+            if rule.strip_whitespace or rule.case or rule.regex_replace:
+                is_str = col.map(type).eq(str)
+                text = col[is_str].astype(str)
+                if rule.strip_whitespace:
+                    text = text.str.strip()
+                if rule.case:
+                    text = getattr(text.str, rule.case)()
+                for step in rule.regex_replace:
+                    text = text.str.replace(step.pattern, step.replacement, regex=True)
+                col = col.astype(object)
+                col[is_str] = text
+
+            if rule.value_map:
+                col = col.replace(rule.value_map)
+
+            if rule.cast in ("int", "float"):
+                col = pd.to_numeric(col, errors="coerce")
+                if rule.cast == "int":
+                    col = col.round().astype("Int64")
+            elif rule.cast == "datetime":
+                try:
+                    parsed = _to_datetime_mixed(col)
+                except (TypeError, ValueError) as e:
+                    parsed = None
+                    print(f"⚠️ Datetime cast skipped for {rule.column} ({e})")
+                if parsed is not None and parsed.isna().sum() > col.isna().sum():
+                    print(f"⚠️ Datetime cast skipped for {rule.column}: "
+                          f"{parsed.isna().sum() - col.isna().sum()} value(s) don't parse")
+                elif parsed is not None:
+                    col = parsed
+            elif rule.cast == "bool":
+                col = _to_boolean(col)
+            elif rule.cast == "string":
+                col = col.astype("string")
+            elif rule.cast == "category":
+                col = col.astype("category")
+
+            if rule.impute == "drop":
+                drop_mask |= col.isna()
+            elif rule.impute == "constant":
+                try:
+                    col = col.fillna(rule.fill_value)
+                except (TypeError, ValueError):
+                    print(f"⚠️ Fill value {rule.fill_value!r} doesn't fit {rule.column} ({col.dtype}), left missing")
+            elif rule.impute in ("mean", "median") and pd.api.types.is_numeric_dtype(col):
+                value = getattr(col, rule.impute)()
+                if pd.api.types.is_integer_dtype(col) and pd.notna(value):
+                    # An Int64 column (cast="int") only takes whole numbers
+                    value = round(value)
+                col = col.fillna(value)
+            elif rule.impute == "mode" and not col.mode().empty:
+                col = col.fillna(col.mode().iloc[0])
+
+            df[rule.column] = col
+
+        if drop_mask.any():
+            df = df[~drop_mask]
+        if rules.drop_duplicates:
+            df = df.drop_duplicates()
         return df
 
-    def clean_data(self, df):
-        """Applies all cleaning steps."""
-        df = self.handle_missing_values(df)
-        df = self.remove_duplicates(df)
-        df = self.fix_data_types(df)
-        return df
\ No newline at end of file
+    def plan(self, trace_memory=False):
+        """Starts an empty CleaningPlan bound to this cleaner."""
+        return CleaningPlan(self, trace_memory=trace_memory)
+
+    def clean_data(self, df, strategy="mean"):
+        """Applies all cleaning steps as one fused plan; the input DataFrame is left untouched."""
+        # More workers than cores only adds process and Arrow round-trip overhead
+        workers = min(self.workers, os.cpu_count() or 1)
+        if self.engine is None and workers > 1:
+            # Imported here: parallel_cleaning's workers build DataCleaning objects themselves
+            from scripts.parallel_cleaning import PARALLEL_MIN_ROWS, ParallelCleaner
+
+            if len(df) >= PARALLEL_MIN_ROWS:
+                self.last_plan_profile = None
+                return ParallelCleaner(workers=workers).clean_data(df, strategy)
+
+        engine_result = self._run_engine(df, strategy, dedupe=True) if self.engine is not None else None
+        if engine_result is not None:
+            # Fill and dedup in one engine round trip, then the shared type fixing
+            df = engine_result
+            plan = self.plan().fix_types()
+        else:
+            plan = self.plan().fill_missing(strategy).drop_duplicates().fix_types()
+        cleaned = plan.execute(df)
+        self.last_plan_profile = plan.last_profile
+        return cleaned
\ No newline at end of file
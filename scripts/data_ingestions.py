@@ -1,32 +1,116 @@
+import asyncio
 import os
+import numpy as np
 import pandas as pd
-import requests
-from sqlalchemy import create_engine
+from sqlalchemy import text
+
+from scripts.api_ingestion import ApiError, Pagination, fetch_json_records, flatten_records
+from scripts.csv_ingestion import read_csv_fast
+from scripts.db_engines import get_db_engine
+from scripts.db_writer import write_frames
+from scripts.excel_ingestion import read_excel_fast
+from scripts.source_cache import SourceCache
 
 # Defines the path to your data folder relative to this script
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../data")
 
+# Parsed CSV/Excel files are cached on disk (set SOURCE_CACHE_ENABLED=0 to always reparse)
+SOURCE_CACHE_ENABLED = os.getenv("SOURCE_CACHE_ENABLED", "1") != "0"
+SOURCE_CACHE_DIR = os.getenv("SOURCE_CACHE_DIR") or None
+SOURCE_CACHE_MAX_MB = int(os.getenv("SOURCE_CACHE_MAX_MB", "1024"))
+
+def read_sql_chunks(engine, query, chunksize=50_000, limit=None, sample_fraction=None, seed=0, params=None):
+    """
+    Yields a query's result as DataFrame chunks over a server-side cursor (stream_results), so
+    only about one chunk is in client memory at a time. `limit` stops reading after that many
+    rows; `sample_fraction` keeps a random share of every chunk. `params` are bound to
+    `:name` placeholders in the query.
+    """
+    rng = np.random.default_rng(seed)
+    remaining = limit
+    if params is not None:
+        query = text(query)
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunksize) as connection:
+        for chunk in pd.read_sql(query, connection, chunksize=chunksize, params=params):
+            if sample_fraction is not None:
+                chunk = chunk[rng.random(len(chunk)) < sample_fraction]
+            if remaining is not None:
+                chunk = chunk.iloc[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining is not None and remaining <= 0:
+                # Closing the connection discards the rest of the cursor
+                break
+
+
+def reservoir_sample(chunks, n, seed=0):
+    """Uniform sample of `n` rows from a stream of chunks in O(n) memory, in original row order."""
+    rng = np.random.default_rng(seed)
+    kept, keys, offset = None, np.empty(0), 0
+    for chunk in chunks:
+        chunk = chunk.reset_index(drop=True)
+        chunk.index = chunk.index + offset
+        offset += len(chunk)
+        kept = chunk if kept is None else pd.concat([kept, chunk])
+        keys = np.concatenate([keys, rng.random(len(chunk))])
+        if len(kept) > n:
+            # Bottom-n random keys = uniform sample without replacement
+            best = np.argpartition(keys, n)[:n]
+            kept, keys = kept.iloc[best], keys[best]
+    if kept is None:
+        return pd.DataFrame()
+    return kept.sort_index().reset_index(drop=True)
+
+
 class DataIngestion:
-    def __init__(self, db_url=None):
-        """Initialize data ingestion with an optional database connection."""
-        self.engine = create_engine(db_url) if db_url else None
+    def __init__(self, db_url=None, cache=None):
+        """
+        Initialize data ingestion with an optional database connection.
+        `cache` is a SourceCache, or False to disable caching (default: on-disk cache from env settings).
+        """
+        self.engine = get_db_engine(db_url) if db_url else None
+        if cache is None and SOURCE_CACHE_ENABLED:
+            cache = SourceCache(directory=SOURCE_CACHE_DIR, max_bytes=SOURCE_CACHE_MAX_MB * 1024 * 1024)
+        self.cache = cache or None
+
+    def _load(self, file_path, loader, reader, **options):
+        if self.cache is None:
+            return loader()
+        return self.cache.load(file_path, loader, reader, **options)
 
     def load_csv(self, file_name):
         """Loads a CSV file into a DataFrame."""
         file_path = os.path.join(DATA_DIR, file_name)
         try:
-            df = pd.read_csv(file_path)
+            df = self._load(file_path, lambda: read_csv_fast(file_path), "csv")
             print(f"✅ CSV Loaded Successfully: {file_path}")
             return df
         except Exception as e:
             print(f"❌ Error loading CSV: {e}")
             return None
 
-    def load_excel(self, file_name, sheet_name=0):
-        """Loads an Excel file into a DataFrame."""
+    def iter_csv(self, file_name, chunksize=100_000, **read_kwargs):
+        """Yields a CSV file as DataFrame chunks so files larger than RAM can be processed."""
         file_path = os.path.join(DATA_DIR, file_name)
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            reader = pd.read_csv(file_path, chunksize=chunksize, **read_kwargs)
+            print(f"✅ Streaming CSV in chunks of {chunksize} rows: {file_path}")
+        except Exception as e:
+            print(f"❌ Error opening CSV: {e}")
+            return
+        with reader:
+            yield from reader
+
+    def load_excel(self, file_name, sheet_name=0, header=0, dtype=None, combine=False):
+        """
+        Loads an Excel file into a DataFrame. `sheet_name=None` (or a list) loads several sheets in
+        parallel: a dict of frames, or one frame with a "sheet" column when `combine` is set.
+        `header` may be "auto" to find the header row below title rows; `dtype` maps columns to types.
+        """
+        file_path = os.path.join(DATA_DIR, file_name)
+        options = {"sheet_name": sheet_name, "header": header, "dtype": dtype, "combine": combine}
+        try:
+            df = self._load(file_path, lambda: read_excel_fast(file_path, **options), "excel", **options)
             print(f"✅ Excel Loaded Successfully: {file_path}")
             return df
         except Exception as e:
@@ -36,38 +120,73 @@ class DataIngestion:
     def connect_database(self, db_url):
         """Establishes a database connection."""
         try:
-            self.engine = create_engine(db_url)
+            # Shared, pooled engine per URL; reconnecting to the same database reuses it
+            self.engine = get_db_engine(db_url)
             print("✅ Database Connection Successful")
         except Exception as e:
             print(f"❌ Error connecting to database: {e}")
 
-    def load_from_database(self, query):
-        """Fetches data from a database using SQL."""
+    def load_from_database(self, query, limit=None, sample_rows=None, chunksize=50_000):
+        """
+        Fetches data from a database using SQL.
+        The result is streamed in chunks; `limit` keeps the first rows only and `sample_rows`
+        keeps a uniform random sample, both without loading the full result first.
+        """
         if not self.engine:
             print("❌ No database connection. Call connect_database() first.")
             return None
 
         try:
-            df = pd.read_sql(query, self.engine)
+            chunks = read_sql_chunks(self.engine, query, chunksize=chunksize, limit=limit)
+            if sample_rows:
+                df = reservoir_sample(chunks, sample_rows)
+            else:
+                parts = list(chunks)
+                df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
             print("✅ Data Loaded from Database Successfully")
             return df
         except Exception as e:
             print(f"❌ Error loading data from database: {e}")
             return None
 
-    def fetch_from_api(self, api_url, params=None):
-        """Fetches data from an API and returns it as a DataFrame."""
+    def iter_from_database(self, query, chunksize=50_000, limit=None, sample_fraction=None):
+        """Yields a query result as DataFrame chunks, for results larger than RAM."""
+        if not self.engine:
+            print("❌ No database connection. Call connect_database() first.")
+            return
+        yield from read_sql_chunks(self.engine, query, chunksize=chunksize, limit=limit, sample_fraction=sample_fraction)
+
+    def write_to_database(self, data, table, mode="append", key_columns=None):
+        """
+        Bulk-writes a cleaned DataFrame (or an iterable of chunks) to `table` with COPY.
+        mode: append, replace (staging table swapped in atomically) or upsert on `key_columns`.
+        """
+        if not self.engine:
+            print("❌ No database connection. Call connect_database() first.")
+            return None
+
         try:
-            response = requests.get(api_url, params=params)
+            return write_frames(self.engine, data, table, mode=mode, key_columns=key_columns)
+        except Exception as e:
+            print(f"❌ Error writing data to database: {e}")
+            return None
 
-            if response.status_code == 200:
-                data = response.json()
-                df = pd.DataFrame(data)
-                print("✅ Data Fetched from API Successfully")
-                return df
-            else:
-                print(f"❌ API Request Failed: {response.status_code}")
-                return None
+    def fetch_from_api(self, api_url, params=None, pagination=None, records_path=None):
+        """
+        Fetches data from an API and returns it as a DataFrame.
+        `pagination` (a Pagination or its keyword dict) walks every page, several at a time;
+        nested records are flattened into "parent.child" columns.
+        """
+        try:
+            if isinstance(pagination, dict):
+                pagination = Pagination(**pagination)
+            records = asyncio.run(fetch_json_records(api_url, params, pagination, records_path))
+            df = flatten_records(records)
+            print(f"✅ Data Fetched from API Successfully ({len(df)} records)")
+            return df
+        except ApiError as e:
+            print(f"❌ API Request Failed: {e.status}")
+            return None
         except Exception as e:
             print(f"❌ Error fetching data from API: {e}")
-            return None
\ No newline at end of file
+            return None
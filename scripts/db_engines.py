@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+# Pool tuning for every engine in the registry
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Registry limits: distinct URLs kept, and how long an unused engine is kept before disposal
+DB_ENGINE_MAX_URLS = int(os.getenv("DB_ENGINE_MAX_URLS", "8"))
+DB_ENGINE_IDLE_SECONDS = int(os.getenv("DB_ENGINE_IDLE_SECONDS", "600"))
+
+
+def _masked(url):
+    try:
+        return make_url(url).render_as_string(hide_password=True)
+    except Exception:
+        return "<invalid url>"
+
+
+class EngineRegistry:
+    """
+    One pooled SQLAlchemy engine per database URL, shared by the backend and DataIngestion.
+
+    Engines are created with pre-ping (stale connections are replaced transparently) and the
+    pool sizes above, so repeated queries reuse open connections instead of reconnecting.
+    At most `max_urls` engines are kept (least recently used is disposed first), and engines
+    idle for `idle_seconds` are disposed on the next registry access.
+    """
+
+    def __init__(self, max_urls=DB_ENGINE_MAX_URLS, idle_seconds=DB_ENGINE_IDLE_SECONDS, clock=time.monotonic):
+        self.max_urls = max_urls
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._engines = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.created = 0
+        self.disposed = 0
+
+    @staticmethod
+    def _create(url):
+        try:
+            return create_engine(
+                url,
+                pool_pre_ping=True,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_recycle=DB_POOL_RECYCLE_SECONDS,
+                pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+            )
+        except TypeError:
+            # Pools without overflow/timeout settings (e.g. in-memory SQLite)
+            return create_engine(url, pool_pre_ping=True)
+
+    def get(self, url):
+        """Returns the shared engine for `url`, creating it on first use."""
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._engines.get(url)
+            if entry is not None:
+                self._engines.move_to_end(url)
+                entry["last_used"] = now
+                entry["uses"] += 1
+                self.hits += 1
+                return entry["engine"]
+
+            engine = self._create(url)
+            self._engines[url] = {"engine": engine, "created": now, "last_used": now, "uses": 1}
+            self.created += 1
+            while len(self._engines) > self.max_urls:
+                _, old = self._engines.popitem(last=False)
+                old["engine"].dispose()
+                self.disposed += 1
+            return engine
+
+    def _evict_idle(self, now):
+        if not self.idle_seconds:
+            return
+        for url in [url for url, entry in self._engines.items() if now - entry["last_used"] > self.idle_seconds]:
+            self._engines.pop(url)["engine"].dispose()
+            self.disposed += 1
+
+    def dispose_all(self):
+        with self._lock:
+            for entry in self._engines.values():
+                entry["engine"].dispose()
+                self.disposed += 1
+            self._engines.clear()
+
+    def stats(self):
+        """Registry counters plus per-URL pool status (passwords masked)."""
+        now = self._clock()
+        with self._lock:
+            engines = []
+            for url, entry in self._engines.items():
+                pool = entry["engine"].pool
+                engines.append({
+                    "url": _masked(url),
+                    "uses": entry["uses"],
+                    "idle_seconds": round(now - entry["last_used"], 1),
+                    "pool": pool.status(),
+                    "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                })
+        return {"engines": engines, "hits": self.hits, "created": self.created, "disposed": self.disposed}
+
+
+# Process-wide registry
+engine_registry = EngineRegistry()
+
+
+def get_db_engine(url):
+    """Shared, pooled engine for `url` from the process-wide registry."""
+    return engine_registry.get(url)
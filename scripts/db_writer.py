@@ -0,0 +1,319 @@
+import io
+import os
+import time
+
+import pandas as pd
+from sqlalchemy import inspect
+
+# Rows sent per COPY (or executemany) round trip
+DB_WRITE_BATCH_ROWS = int(os.getenv("DB_WRITE_BATCH_ROWS", "100000"))
+
+# NULL marker in the COPY stream; pandas writes missing values as this
+NULL_MARKER = r"\N"
+
+WRITE_MODES = ("append", "replace", "upsert")
+
+
+def _integral_floats_as_int(df):
+    """
+    Float columns holding only whole numbers -> Int64, so COPY sends "30" rather than "30.0"
+    (which INTEGER/BIGINT columns reject). Integer columns with missing values come back as
+    float from read_csv, e.g. after the AI round trip in /clean-db.
+    """
+    converted = {}
+    for col in df.columns:
+        values = df[col]
+        if not pd.api.types.is_float_dtype(values):
+            continue
+        present = values.dropna()
+        if len(present) and (present % 1 == 0).all() and present.abs().max() < 2**63:
+            converted[col] = values.astype("Int64")
+    return df.assign(**converted) if converted else df
+
+
+def copy_frame(cursor, table, columns, df):
+    """
+    COPYs one frame into `table` (already quoted) through a psycopg2 cursor as CSV over STDIN.
+    `columns` are the quoted target columns, in the frame's column order.
+    """
+    buffer = io.StringIO()
+    _integral_floats_as_int(df).to_csv(buffer, index=False, header=False, na_rep=NULL_MARKER)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')", buffer
+    )
+
+
+def _column_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+class BulkLoad:
+    """
+    One bulk write of cleaned frames into `table`; also a StreamingCleaner sink (write/close).
+
+    Frames are sent in batches of `batch_rows` with COPY FROM STDIN on Postgres (batched
+    executemany on other databases, e.g. SQLite for local runs):
+      append  - straight into the table (created from the first frame if missing)
+      replace - into a staging table that is swapped in atomically on close(), so readers see
+                either the old rows or all of the new ones. A Postgres target that views or
+                foreign keys depend on keeps its identity: its rows are replaced in place
+                (DELETE + INSERT from staging) in the same transaction instead.
+      upsert  - into a staging table, then INSERT ... ON CONFLICT (key_columns) DO UPDATE
+    Nothing is visible until close(); abort() drops the partial load.
+    """
+
+    def __init__(self, engine, table, mode="append", key_columns=None, batch_rows=DB_WRITE_BATCH_ROWS):
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unknown write mode '{mode}'. Use one of {', '.join(WRITE_MODES)}.")
+        if mode == "upsert" and not key_columns:
+            raise ValueError("Upsert needs key_columns (the target's primary key or a unique index).")
+
+        self.engine = engine
+        self.table = table
+        self.mode = mode
+        self.key_columns = list(key_columns or [])
+        self.batch_rows = batch_rows
+        self.is_postgres = engine.dialect.name == "postgresql"
+        self._quote = engine.dialect.identifier_preparer.quote
+        self._exists = inspect(engine).has_table(table)
+        self._conn = None
+        self._cursor = None
+        self._columns = None
+        self._target = None
+        self._start = None
+        self.stats = {}
+        self.rows = 0
+        self.batches = 0
+
+    # ---- Setup ----
+
+    def _create_table(self, name, df, temporary=False):
+        columns = ", ".join(f"{self._quote(str(col))} {_column_type(dtype)}" for col, dtype in df.dtypes.items())
+        self._cursor.execute(f"CREATE {'TEMPORARY ' if temporary else ''}TABLE {self._quote(name)} ({columns})")
+
+    def _open(self, first):
+        self._start = time.perf_counter()
+        self._columns = [str(col) for col in first.columns]
+        self._conn = self.engine.raw_connection()
+        self._cursor = self._conn.cursor()
+        target = self._quote(self.table)
+
+        if self.mode == "append":
+            if not self._exists:
+                self._create_table(self.table, first)
+            self._target = self.table
+
+        elif self.mode == "replace":
+            self._target = f"{self.table}__staging"
+            self._cursor.execute(f"DROP TABLE IF EXISTS {self._quote(self._target)}")
+            if self._exists and self.is_postgres:
+                # Keeps the target's types, defaults, constraints and indexes
+                self._cursor.execute(f"CREATE TABLE {self._quote(self._target)} (LIKE {target} INCLUDING ALL)")
+            else:
+                self._create_table(self._target, first)
+
+        else:
+            if not self._exists:
+                self._create_table(self.table, first)
+                keys = ", ".join(self._quote(col) for col in self.key_columns)
+                self._cursor.execute(f"CREATE UNIQUE INDEX {self._quote(self.table + '__upsert_key')} ON {target} ({keys})")
+            self._target = f"{self.table}__upsert"
+            columns = ", ".join(self._quote(col) for col in self._columns)
+            self._cursor.execute(f"DROP TABLE IF EXISTS {self._quote(self._target)}")
+            self._cursor.execute(
+                f"CREATE TEMPORARY TABLE {self._quote(self._target)} AS SELECT {columns} FROM {target} WHERE 1 = 0"
+            )
+
+    # ---- Loading ----
+
+    def _load(self, batch):
+        table = self._quote(self._target)
+        columns = [self._quote(col) for col in self._columns]
+        if self.is_postgres:
+            copy_frame(self._cursor, table, columns, batch)
+        else:
+            marker = "?" if self.engine.dialect.paramstyle == "qmark" else "%s"
+            rows = batch.astype(object).where(batch.notna(), None).itertuples(index=False, name=None)
+            self._cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})", rows
+            )
+        self.rows += len(batch)
+        self.batches += 1
+
+    def write(self, chunk):
+        if not len(chunk.columns):
+            return
+        if self._conn is None:
+            self._open(chunk)
+        elif [str(col) for col in chunk.columns] != self._columns:
+            raise ValueError(f"Chunk columns {list(chunk.columns)} do not match {self._columns}.")
+        for offset in range(0, len(chunk), self.batch_rows):
+            self._load(chunk.iloc[offset:offset + self.batch_rows])
+
+    # ---- Finish ----
+
+    def _begin(self):
+        # Postgres opens a transaction before any statement; sqlite3 does not for DDL
+        if not self.is_postgres:
+            self._cursor.execute("BEGIN")
+
+    def _has_dependents(self):
+        """True when views or foreign keys (either direction) are bound to the Postgres target."""
+        self._cursor.execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_depend d JOIN pg_rewrite r ON r.oid = d.objid
+                WHERE d.refobjid = %(table)s::regclass AND r.ev_class <> %(table)s::regclass
+            ) OR EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE contype = 'f' AND (confrelid = %(table)s::regclass OR conrelid = %(table)s::regclass)
+            )
+            """,
+            {"table": self._quote(self.table)},
+        )
+        return self._cursor.fetchone()[0]
+
+    def _adopt_sequences(self, old, target):
+        """
+        Hands the SERIAL sequences owned by `old` to the same columns of `target`: the staging
+        table's copied defaults still call them, and DROP TABLE would drop them with `old`.
+        """
+        self._cursor.execute(
+            """
+            SELECT s.oid::regclass::text, a.attname
+            FROM pg_depend d
+            JOIN pg_class s ON s.oid = d.objid AND s.relkind = 'S'
+            JOIN pg_attribute a ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+            WHERE d.refobjid = %s::regclass AND d.deptype = 'a'
+            """,
+            (old,),
+        )
+        for sequence, column in self._cursor.fetchall():
+            self._cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {target}.{self._quote(column)}")
+
+    def _replace_in_place(self, target, staging):
+        """
+        Makes `target`'s rows those of `staging`. With a primary key in the frame, only keys
+        missing from staging are deleted and the rest are upserted, so rows that other tables
+        reference and that are still present never disappear mid-transaction.
+        """
+        keys = inspect(self.engine).get_pk_constraint(self.table)["constrained_columns"]
+        if keys and set(keys) <= set(self._columns):
+            matches = " AND ".join(f"s.{self._quote(key)} = t.{self._quote(key)}" for key in keys)
+            self._cursor.execute(f"DELETE FROM {target} t WHERE NOT EXISTS (SELECT 1 FROM {staging} s WHERE {matches})")
+            self._cursor.execute(self._merge_statement(target, staging, keys))
+        else:
+            columns = ", ".join(self._quote(col) for col in self._columns)
+            self._cursor.execute(f"DELETE FROM {target}")
+            self._cursor.execute(f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {staging}")
+        self._cursor.execute(f"DROP TABLE {staging}")
+
+    def _rename_staging_indexes(self, target):
+        """LIKE named the swapped-in table's indexes after the staging table; give them the target's names back."""
+        staging = f"{self.table}__staging"
+        self._cursor.execute(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = %s::regclass",
+            (target,),
+        )
+        for (name,) in self._cursor.fetchall():
+            if name.startswith(staging):
+                renamed = self.table + name[len(staging):]
+                self._cursor.execute(f"ALTER INDEX {self._quote(name)} RENAME TO {self._quote(renamed)}")
+
+    def _swap(self):
+        target, staging, old = (self._quote(name) for name in (self.table, self._target, f"{self.table}__old"))
+        self._conn.commit()
+        self._begin()
+        if self._exists and self.is_postgres and self._has_dependents():
+            # Renaming would leave views/foreign keys on the old table; replace its rows instead
+            self._replace_in_place(target, staging)
+            return
+        self._cursor.execute(f"DROP TABLE IF EXISTS {old}")
+        if self._exists:
+            self._cursor.execute(f"ALTER TABLE {target} RENAME TO {old}")
+        self._cursor.execute(f"ALTER TABLE {staging} RENAME TO {target}")
+        if self._exists:
+            if self.is_postgres:
+                self._adopt_sequences(old, target)
+            self._cursor.execute(f"DROP TABLE {old}")
+            if self.is_postgres:
+                self._rename_staging_indexes(target)
+
+    def _merge_statement(self, target, staging, key_columns):
+        """INSERT ... SELECT from `staging` that updates rows of `target` whose keys already exist."""
+        columns = [self._quote(col) for col in self._columns]
+        keys = [self._quote(col) for col in key_columns]
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns if col not in keys)
+        # WHERE true: SQLite needs it to parse ON CONFLICT after INSERT ... SELECT
+        return (
+            f"INSERT INTO {target} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM {staging} WHERE true "
+            f"ON CONFLICT ({', '.join(keys)}) DO {'UPDATE SET ' + updates if updates else 'NOTHING'}"
+        )
+
+    def _upsert(self):
+        target, staging = self._quote(self.table), self._quote(self._target)
+        self._cursor.execute(self._merge_statement(target, staging, self.key_columns))
+        self._cursor.execute(f"DROP TABLE {staging}")
+
+    def close(self):
+        """Publishes the load (swap / upsert) and commits; returns the write statistics."""
+        if self._conn is None:
+            self.stats = {"table": self.table, "mode": self.mode, "rows": 0, "batches": 0, "seconds": 0.0}
+            return self.stats
+        try:
+            if self.mode == "replace":
+                self._swap()
+            elif self.mode == "upsert":
+                self._upsert()
+            self._conn.commit()
+        except Exception:
+            self.abort()
+            raise
+        self._conn.close()
+        self._conn = None
+
+        seconds = time.perf_counter() - self._start
+        self.stats = {
+            "table": self.table,
+            "mode": self.mode,
+            "rows": self.rows,
+            "batches": self.batches,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(self.rows / seconds) if seconds else None,
+        }
+        print(f"✅ Bulk write finished: {self.stats}")
+        return self.stats
+
+    def abort(self):
+        """Rolls back and drops the staging table; the target is left as it was."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.rollback()
+            if self.mode == "replace":
+                self._cursor.execute(f"DROP TABLE IF EXISTS {self._quote(self._target)}")
+                self._conn.commit()
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+def write_frames(engine, data, table, mode="append", key_columns=None, batch_rows=DB_WRITE_BATCH_ROWS):
+    """Bulk-writes a DataFrame or an iterable of DataFrame chunks; returns the write statistics."""
+    load = BulkLoad(engine, table, mode=mode, key_columns=key_columns, batch_rows=batch_rows)
+    try:
+        for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+            load.write(chunk)
+    except Exception:
+        load.abort()
+        raise
+    return load.close()
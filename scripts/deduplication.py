@@ -0,0 +1,284 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Near-duplicate detection: estimated Jaccard similarity of character n-grams at or above
+# NEAR_DUPLICATE_THRESHOLD puts two rows in one cluster
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "64"))
+MINHASH_BANDS = int(os.getenv("MINHASH_BANDS", "16"))
+
+
+# ----------------------- Exact duplicates -----------------------------
+
+_INT64_MAX = np.iinfo(np.int64).max
+_NAN_HASH = pd.util.hash_array(np.array([np.nan]))[0]
+
+
+def _numeric_hashes(values):
+    """
+    64-bit hash per value of a numeric column. Whole numbers hash as exact integers whatever the
+    column's dtype, so 5 in an int64 chunk and 5.0 in a float chunk (one with NaNs) agree while
+    distinct int64 values above 2**53 stay distinct. -0.0 is 0, as for drop_duplicates.
+    """
+    if pd.api.types.is_integer_dtype(values):
+        missing = values.isna().to_numpy()
+        ints = values.fillna(0).to_numpy() if missing.any() else values.to_numpy()
+        if ints.dtype == np.uint64:
+            big = ints > _INT64_MAX
+            hashes = pd.util.hash_array(np.where(big, 0, ints).astype(np.int64))
+            hashes[big] = pd.util.hash_array(ints[big])
+        else:
+            hashes = pd.util.hash_array(ints.astype(np.int64))
+        hashes[missing] = _NAN_HASH
+        return hashes
+    floats = values.to_numpy(dtype=np.float64, na_value=np.nan) + 0.0
+    hashes = pd.util.hash_array(floats)
+    with np.errstate(invalid="ignore"):
+        whole = np.isfinite(floats) & (floats % 1 == 0) & (np.abs(floats) <= _INT64_MAX)
+    hashes[whole] = pd.util.hash_array(floats[whole].astype(np.int64))
+    return hashes
+
+
+def row_fingerprints(chunk, numeric_cols):
+    """64-bit hash per row; identical rows in different chunks/partitions get the same value."""
+    normalized = chunk.copy(deep=False)
+    for col in numeric_cols:
+        if col in normalized.columns and pd.api.types.is_numeric_dtype(normalized[col]):
+            normalized[col] = _numeric_hashes(normalized[col])
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def frame_fingerprints(df, subset=None):
+    """row_fingerprints of `df` (or its `subset` columns) with its own numeric columns normalized."""
+    if subset is not None:
+        df = df[list(subset)]
+    return row_fingerprints(df, df.select_dtypes("number").columns)
+
+
+def first_occurrences(fingerprints):
+    """Mask keeping the first row of every fingerprint, like ~df.duplicated()."""
+    return ~pd.Series(fingerprints).duplicated().to_numpy()
+
+
+class FingerprintSet:
+    """
+    Set of 64-bit row fingerprints kept as a few sorted numpy runs: 8 bytes per distinct row,
+    against roughly 70 for Python ints in a set. Runs are merged like a binary counter, so
+    there are O(log n) of them and each lookup is a binary search per run.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self._runs)
+
+    def contains(self, fingerprints):
+        """Boolean mask: which of `fingerprints` are already in the set."""
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, fingerprints), len(run) - 1)
+            found |= run[positions] == fingerprints
+        return found
+
+    def add(self, fingerprints):
+        run = np.unique(np.asarray(fingerprints, dtype=np.uint64))
+        run = run[~self.contains(run)]
+        if not len(run):
+            return
+        self._runs.append(run)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newer]))
+
+    def add_new(self, fingerprints):
+        """
+        Keep-mask for one chunk of a stream: rows whose fingerprint is neither earlier in the chunk
+        nor in the set. The kept fingerprints are added.
+        """
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        keep = first_occurrences(fingerprints) & ~self.contains(fingerprints)
+        self.add(fingerprints[keep])
+        return keep
+
+
+# ----------------------- Near duplicates -----------------------------
+
+def _mix(values):
+    """splitmix64 finalizer over a uint64 array: a fast, well-spread hash."""
+    with np.errstate(over="ignore"):
+        values = values ^ (values >> np.uint64(30))
+        values = values * np.uint64(0xBF58476D1CE4E5B9)
+        values = values ^ (values >> np.uint64(27))
+        values = values * np.uint64(0x94D049BB133111EB)
+        return values ^ (values >> np.uint64(31))
+
+
+def normalize_text(df, columns):
+    """
+    One comparable string per row from `columns`: lower case, punctuation dropped, runs of
+    whitespace collapsed and trimmed ("New York " and "new york" become equal). A row
+    with nothing in any of `columns` is "", which is never a near duplicate (see MinHashLSH.cluster).
+    """
+    parts = []
+    for col in columns:
+        text = df[col].astype("string").fillna("").str.lower()
+        text = text.str.replace(r"[^\w\s]", " ", regex=True).str.replace(r"\s+", " ", regex=True).str.strip()
+        parts.append(text)
+    combined, blank = parts[0], parts[0] == ""
+    for part in parts[1:]:
+        combined = combined + "|" + part
+        blank &= part == ""
+    return combined.mask(blank, "").astype(object).to_numpy()
+
+
+def _components(size, left, right):
+    """Connected-component labels (smallest member index) of an undirected graph given as edge arrays."""
+    labels = np.arange(size)
+    while len(left):
+        low = np.minimum(labels[left], labels[right])
+        np.minimum.at(labels, labels[left], low)
+        np.minimum.at(labels, labels[right], low)
+        # Pointer jumping: every node points straight at its current root
+        while True:
+            jumped = labels[labels]
+            if (jumped == labels).all():
+                break
+            labels = jumped
+        if (labels[left] == labels[right]).all():
+            break
+    return labels
+
+
+class MinHashLSH:
+    """
+    Near-duplicate clusters of short texts in sub-quadratic time.
+
+    Each distinct text becomes a set of character `ngram`s, summarized by a MinHash signature of
+    `num_perm` values; the share of equal signature values estimates the Jaccard similarity.
+    Signatures are split into `bands`; texts with an identical band land in one bucket, and only
+    each text and the first text of its bucket are compared (a few comparisons per text and band
+    instead of all pairs). Pairs at or above `threshold` are joined into connected clusters.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=MINHASH_PERMUTATIONS,
+                 bands=MINHASH_BANDS, ngram=3, seed=0):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.ngram = ngram
+        self._seeds = np.random.default_rng(seed).integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, texts):
+        """(len(texts), num_perm) uint32 MinHash signatures."""
+        n = self.ngram
+        grams, counts = [], np.empty(len(texts), dtype=np.int64)
+        for position, text in enumerate(texts):
+            shingles = {text[start:start + n] for start in range(max(1, len(text) - n + 1))}
+            grams.extend(shingles)
+            counts[position] = len(shingles)
+        hashed = pd.util.hash_array(np.array(grams, dtype=object))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for column, seed in enumerate(self._seeds):
+            minimum = np.minimum.reduceat(_mix(hashed ^ seed), starts)
+            signatures[:, column] = minimum.astype(np.uint32)
+        return signatures
+
+    def candidate_pairs(self, signatures):
+        """(left, right) index arrays of texts sharing at least one band bucket."""
+        rows = self.num_perm // self.bands
+        positions = np.arange(len(signatures))
+        left, right = [], []
+        for band in range(self.bands):
+            block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            key = block[:, 0]
+            for column in range(1, rows):
+                key = _mix(key ^ block[:, column])
+            _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+            representative = first[inverse]
+            linked = representative != positions
+            left.append(positions[linked])
+            right.append(representative[linked])
+        if not left:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        pairs = np.unique(np.stack([np.concatenate(left), np.concatenate(right)], axis=1), axis=0)
+        return pairs[:, 0], pairs[:, 1]
+
+    def cluster(self, texts):
+        """
+        (labels, signatures) for an array of texts; duplicates of one text share a label. Empty
+        texts (all selected columns missing or blank) carry no evidence and each get their own label.
+        """
+        codes, uniques = pd.factorize(texts)
+        signatures = self.signatures(uniques)
+        left, right = self.candidate_pairs(signatures)
+        similar = (signatures[left] == signatures[right]).mean(axis=1) >= self.threshold
+        labels = _components(len(uniques), left[similar], right[similar])[codes]
+        empty = np.asarray(texts, dtype=object) == ""
+        labels[empty] = len(uniques) + np.arange(empty.sum())
+        return labels, signatures[codes]
+
+
+def _cluster_report(df, labels, similarity, columns):
+    """Rows in clusters of two or more: cluster id, row label, representative (first) row, similarity."""
+    positions = np.arange(len(df))
+    groups = pd.Series(positions).groupby(labels)
+    first = groups.transform("min").to_numpy()
+    size = groups.transform("size").to_numpy()
+    clustered = size > 1
+    report = pd.DataFrame({
+        "cluster": pd.factorize(first[clustered])[0],
+        "row": df.index[clustered],
+        "representative": df.index[first[clustered]],
+        "similarity": np.round(similarity[clustered], 3),
+        "size": size[clustered],
+    })
+    for col in columns:
+        report[col] = df[col].to_numpy()[clustered]
+    return report
+
+
+def exact_duplicate_clusters(df, subset=None):
+    """Clusters of identical rows (on `subset` columns): one report row per member, as for near duplicates."""
+    labels = pd.factorize(frame_fingerprints(df, subset))[0]
+    return _cluster_report(df, labels, np.ones(len(df)), list(subset or []))
+
+
+def _near_duplicate_labels(df, columns, lsh):
+    """(cluster label, position of the cluster's first row, similarity to it) per row."""
+    labels, signatures = lsh.cluster(normalize_text(df, columns))
+    first = pd.Series(np.arange(len(df))).groupby(labels).transform("min").to_numpy()
+    return labels, first, (signatures == signatures[first]).mean(axis=1)
+
+
+def near_duplicate_clusters(df, columns, threshold=NEAR_DUPLICATE_THRESHOLD, lsh=None):
+    """
+    Clusters of rows whose normalized `columns` text is at least `threshold` similar. The report
+    has one row per cluster member with its estimated similarity to the cluster's first row.
+    """
+    if not len(df):
+        return _cluster_report(df, np.empty(0, dtype=np.int64), np.empty(0), columns)
+    labels, _, similarity = _near_duplicate_labels(df, columns, lsh or MinHashLSH(threshold=threshold))
+    return _cluster_report(df, labels, similarity, columns)
+
+
+def drop_near_duplicates(df, columns, threshold=NEAR_DUPLICATE_THRESHOLD, return_clusters=False, lsh=None):
+    """Keeps the first row of every near-duplicate cluster; optionally also returns the cluster report."""
+    if not len(df):
+        return (df, near_duplicate_clusters(df, columns)) if return_clusters else df
+    labels, first, similarity = _near_duplicate_labels(df, columns, lsh or MinHashLSH(threshold=threshold))
+    deduped = df[first == np.arange(len(df))]
+    if return_clusters:
+        return deduped, _cluster_report(df, labels, similarity, columns)
+    return deduped
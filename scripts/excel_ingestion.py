@@ -0,0 +1,189 @@
+import datetime
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+try:
+    # Rust (calamine) workbook reader: several times faster than openpyxl
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# "calamine", "openpyxl" or "auto" (calamine when installed)
+EXCEL_ENGINE = os.getenv("EXCEL_ENGINE", "auto")
+# Processes reading sheets of one workbook at once (0 = one per core)
+EXCEL_MAX_WORKERS = int(os.getenv("EXCEL_MAX_WORKERS", "0")) or os.cpu_count() or 1
+
+# Rows looked at by header="auto"
+HEADER_SCAN_ROWS = 20
+
+
+def excel_engine(engine=None):
+    """The engine to use: `engine`, else EXCEL_ENGINE, with "auto" meaning calamine when it is installed."""
+    engine = engine or EXCEL_ENGINE
+    if engine == "auto":
+        return "calamine" if CalamineWorkbook is not None else "openpyxl"
+    if engine not in ("calamine", "openpyxl"):
+        raise ValueError(f"Unknown Excel engine '{engine}'. Use calamine, openpyxl or auto.")
+    if engine == "calamine" and CalamineWorkbook is None:
+        raise ImportError("The calamine engine needs `pip install python-calamine`.")
+    return engine
+
+
+# ----------------------- Workbooks -----------------------------
+
+class _Workbook:
+    """Sheet names and raw cell rows of a workbook (path or binary file object) through one engine."""
+
+    def __init__(self, source, engine=None):
+        self.engine = excel_engine(engine)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        if self.engine == "calamine":
+            self._book = (CalamineWorkbook.from_path(os.fspath(source)) if isinstance(source, (str, os.PathLike))
+                          else CalamineWorkbook.from_filelike(source))
+        else:
+            import openpyxl
+
+            # Read-only mode streams rows from the sheet XML instead of building every cell object
+            self._book = openpyxl.load_workbook(source, read_only=True, data_only=True)
+
+    @property
+    def sheet_names(self):
+        return list(self._book.sheet_names if self.engine == "calamine" else self._book.sheetnames)
+
+    def sheet_name(self, sheet):
+        """A sheet given by name or 0-based position -> its name."""
+        names = self.sheet_names
+        if isinstance(sheet, int):
+            if not 0 <= sheet < len(names):
+                raise ValueError(f"Worksheet index {sheet} is invalid, {len(names)} worksheets found")
+            return names[sheet]
+        if sheet not in names:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        return sheet
+
+    def rows(self, sheet):
+        """Cell values of a sheet, row by row; empty cells are None (openpyxl) or "" (calamine)."""
+        name = self.sheet_name(sheet)
+        if self.engine == "calamine":
+            return self._book.get_sheet_by_name(name).to_python(skip_empty_area=False)
+        return [list(row) for row in self._book[name].iter_rows(values_only=True)]
+
+    def close(self):
+        self._book.close()
+
+
+# ----------------------- Rows -> DataFrame -----------------------------
+# Cells are prepared the way pandas' own Excel readers prepare them and then parsed by pandas'
+# TextParser, as pd.read_excel does, so both give the same frame: numeric-looking text such as
+# "00123" becomes a number, "TRUE" a bool, "n/a" missing, empty headers "Unnamed: N".
+
+def _filled(row):
+    return [value for value in row if value is not None and value != ""]
+
+
+def detect_header(rows, scan=HEADER_SCAN_ROWS):
+    """
+    Index of the header row in a sheet's first `scan` rows: the first row of text cells at least
+    80% as wide as the widest row, so title/notes rows above a table are skipped. None when no
+    row looks like a header (the sheet is data only).
+    """
+    head = rows[:scan]
+    widest = max((len(_filled(row)) for row in head), default=0)
+    for index, row in enumerate(head):
+        cells = _filled(row)
+        if cells and len(cells) >= 0.8 * widest and all(isinstance(value, str) for value in cells):
+            return index
+    return None
+
+
+def _cell(value):
+    """One cell as pd.read_excel's openpyxl reader hands it to TextParser."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        # Excel stores every number as a float; whole numbers are ints
+        return int(value) if value.is_integer() else value
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        # calamine returns datetime.date for date cells without a time; openpyxl a datetime
+        return datetime.datetime(value.year, value.month, value.day)
+    return value
+
+
+def _sheet_data(rows):
+    """Cells prepared with _cell, trailing empty cells and rows trimmed, rows padded to one width."""
+    data = []
+    for row in rows:
+        row = [_cell(value) for value in row]
+        while row and row[-1] == "":
+            row.pop()
+        data.append(row)
+    while data and not data[-1]:
+        data.pop()
+    width = max((len(row) for row in data), default=0)
+    return [row + [""] * (width - len(row)) for row in data]
+
+
+def frame_from_rows(rows, header=0, dtype=None):
+    """
+    Sheet rows -> DataFrame, typed as pd.read_excel types it. `header` is the header row's
+    index, None for no header, or "auto" (detect_header). `dtype` maps columns to types and is
+    applied while parsing, as in pd.read_excel (e.g. {"zip": str} keeps "00123" as text).
+    """
+    data = _sheet_data(rows)
+    if header == "auto":
+        header = detect_header(data)
+    if not data or (header is not None and header >= len(data)):
+        return pd.DataFrame()
+    return TextParser(data, header=header, dtype=dtype, skip_blank_lines=False).read()
+
+
+# ----------------------- Reading -----------------------------
+
+def _read_sheet(source, sheet, header, dtype, engine):
+    book = _Workbook(source, engine)
+    try:
+        return frame_from_rows(book.rows(sheet), header, dtype)
+    finally:
+        book.close()
+
+
+def read_excel_fast(source, sheet_name=0, header=0, dtype=None, engine=None, combine=False,
+                    sheet_column="sheet", max_workers=EXCEL_MAX_WORKERS):
+    """
+    Reads an Excel workbook (path or binary file object) with calamine, or openpyxl in
+    read-only mode. `sheet_name` is a name or position, a list of them, or None for every sheet.
+    One sheet gives a DataFrame; several give {sheet name: DataFrame}, or one frame with a
+    `sheet_column` column when `combine` is set. Sheets of a workbook on disk are read by up to
+    `max_workers` processes at once. `header` and `dtype` are as in frame_from_rows.
+    """
+    book = _Workbook(source, engine)
+    try:
+        if sheet_name is None:
+            sheets = book.sheet_names
+        else:
+            sheets = [book.sheet_name(sheet) for sheet in (sheet_name if isinstance(sheet_name, list) else [sheet_name])]
+        parallel = isinstance(source, (str, os.PathLike)) and len(sheets) > 1 and max_workers > 1
+        if not parallel:
+            frames = {sheet: frame_from_rows(book.rows(sheet), header, dtype) for sheet in sheets}
+    finally:
+        book.close()
+
+    if parallel:
+        # Each process opens the workbook itself; only the finished frames come back
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(sheets)), mp_context=context) as pool:
+            futures = {sheet: pool.submit(_read_sheet, source, sheet, header, dtype, book.engine) for sheet in sheets}
+            frames = {sheet: future.result() for sheet, future in futures.items()}
+
+    if combine:
+        return pd.concat(
+            [df.assign(**{sheet_column: sheet}) for sheet, df in frames.items()], ignore_index=True
+        ) if frames else pd.DataFrame()
+    if sheet_name is None or isinstance(sheet_name, list):
+        return frames
+    return frames[sheets[0]]
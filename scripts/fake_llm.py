@@ -0,0 +1,67 @@
+import math
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+# Matches the data block of the cleaning prompt built in AIAgent.process_data
+_DATA_BLOCK = re.compile(r"Input Data \(CSV format\):\s*\n(.*?)\n\s*Task:", re.S)
+
+
+def heavy_tailed_latency(median=0.05, sigma=0.3, tail_probability=0.05, tail_multiplier=20.0, seed=None):
+    """
+    Latency sampler for FakeLLM(latency=...): lognormal around `median`, plus stragglers with
+    probability `tail_probability` that are `tail_multiplier` x slower with a Pareto tail,
+    the shape seen in real LLM API latencies.
+    """
+    rng = np.random.default_rng(seed)
+    lock = threading.Lock()
+
+    def sample():
+        with lock:
+            seconds = median * math.exp(sigma * rng.standard_normal())
+            if rng.random() < tail_probability:
+                seconds *= tail_multiplier * (1.0 + rng.pareto(2.0))
+        return min(seconds, 120.0)
+
+    return sample
+
+
+class FakeLLM:
+    """Local stand-in for the Gemini chat model, used for benchmarks and offline runs.
+
+    `latency` is either a number of seconds or a zero-argument callable returning one,
+    so heavy-tailed distributions can be injected. By default the fake echoes the
+    data block of a cleaning prompt back, which is a valid "cleaned" answer.
+    """
+
+    def __init__(self, latency=0.0, response_fn=None, model="fake-llm", temperature=0):
+        self.latency = latency
+        self.response_fn = response_fn
+        self.model = model
+        self.temperature = temperature
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _sleep_time(self):
+        return self.latency() if callable(self.latency) else self.latency
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+
+        delay = self._sleep_time()
+        if delay:
+            time.sleep(delay)
+
+        if self.response_fn is not None:
+            return SimpleNamespace(content=self.response_fn(prompt))
+
+        match = _DATA_BLOCK.search(prompt)
+        if match:
+            lines = [line.strip() for line in match.group(1).splitlines() if line.strip()]
+            return SimpleNamespace(content="\n".join(lines))
+        return SimpleNamespace(content="OK")
+
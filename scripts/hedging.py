@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+# Histogram bucket upper bounds in seconds (last bucket is open-ended)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyTracker:
+    """Rolling window of latencies with quantiles and a bucketed histogram (thread-safe)."""
+
+    def __init__(self, window=1000, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._samples = deque(maxlen=window)
+        self._counts = [0] * (len(buckets) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self._counts[int(np.searchsorted(self.buckets, seconds))] += 1
+
+    def __len__(self):
+        return len(self._samples)
+
+    def quantile(self, q):
+        with self._lock:
+            samples = list(self._samples)
+        return float(np.quantile(samples, q)) if samples else None
+
+    def summary(self):
+        with self._lock:
+            samples = np.array(self._samples)
+        if not len(samples):
+            return {"count": 0}
+        p50, p95, p99 = np.quantile(samples, [0.5, 0.95, 0.99])
+        return {
+            "count": len(samples),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(samples.max()), 3),
+        }
+
+    def histogram(self):
+        """[(bucket label, count)] over every latency recorded so far."""
+        labels = [f"<= {bound:g}s" for bound in self.buckets] + [f"> {self.buckets[-1]:g}s"]
+        with self._lock:
+            return list(zip(labels, self._counts))
+
+    def format_histogram(self, width=40):
+        rows = self.histogram()
+        peak = max(count for _, count in rows) or 1
+        return "\n".join(f"   {label:>9} | {'█' * round(width * count / peak):<{width}} {count}" for label, count in rows)
+
+
+class HedgedCaller:
+    """
+    Wraps a blocking call (e.g. one LLM request) with a deadline and optional hedging.
+
+    If the call has not returned after the observed `hedge_quantile` latency, one duplicate is
+    sent and whichever finishes first wins (the other is left to finish and is ignored). Hedges
+    are capped at `hedge_budget` x the primary calls, which bounds the extra spend. Past
+    `deadline` seconds a TimeoutError is raised so the caller's retry logic can take over.
+    """
+
+    def __init__(self, fn, deadline=None, hedge_budget=0.0, hedge_quantile=0.95, min_samples=20, max_workers=64):
+        self.fn = fn
+        self.deadline = deadline or None
+        self.hedge_budget = hedge_budget
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.calls = LatencyTracker()       # every finished request, hedges and losers included
+        self.effective = LatencyTracker()   # what the caller actually waited
+        self.primaries = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._max_workers = max_workers
+
+    def _timed(self, *args):
+        start = time.perf_counter()
+        try:
+            return self.fn(*args)
+        finally:
+            self.calls.record(time.perf_counter() - start)
+
+    def _reserve_hedge(self):
+        with self._lock:
+            if self.hedges_sent + 1 <= self.hedge_budget * self.primaries:
+                self.hedges_sent += 1
+                return True
+            return False
+
+    def hedge_after(self):
+        """Seconds to wait before hedging, or None while hedging is off or still warming up."""
+        if not self.hedge_budget or len(self.calls) < self.min_samples:
+            return None
+        return self.calls.quantile(self.hedge_quantile)
+
+    def __call__(self, *args):
+        with self._lock:
+            self.primaries += 1
+        start = time.perf_counter()
+
+        if not self.deadline and not self.hedge_budget:
+            # Nothing to race against: call inline, no thread hop
+            result = self._timed(*args)
+            self.effective.record(time.perf_counter() - start)
+            return result
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="llm-call")
+
+        primary = self._executor.submit(self._timed, *args)
+        pending = {primary}
+        deadline_at = start + self.deadline if self.deadline else None
+
+        hedge_after = self.hedge_after()
+        if hedge_after is not None:
+            wait_for = hedge_after if deadline_at is None else min(hedge_after, self.deadline)
+            done, _ = wait(pending, timeout=wait_for)
+            if not done and self._reserve_hedge():
+                pending.add(self._executor.submit(self._timed, *args))
+
+        first_error = None
+        while pending:
+            remaining = None if deadline_at is None else max(0.0, deadline_at - time.perf_counter())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError(f"LLM call exceeded its {self.deadline:g}s deadline")
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        with self._lock:
+                            self.hedges_won += 1
+                    self.effective.record(time.perf_counter() - start)
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+
+    def stats(self):
+        return {
+            "requests": self.primaries,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "extra_spend": round(self.hedges_sent / self.primaries, 3) if self.primaries else 0.0,
+            "timeouts": self.timeouts,
+            "latency": self.effective.summary(),
+        }
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from io import StringIO
+
+import pandas as pd
+from sqlalchemy import text
+
+from scripts.data_ingestions import read_sql_chunks
+from scripts.db_writer import BulkLoad
+from scripts.llm_cache import CACHE_DIR
+from scripts.streaming_pipeline import DEFAULT_CHUNKSIZE, StreamingCleaner
+
+
+def make_state_key(db_url, query, target_table):
+    """Identity of one incremental pipeline: same source query and target -> same watermark."""
+    payload = f"{db_url}\x1f{query}\x1f{target_table}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+def _to_python(value):
+    """Numpy/pandas scalars -> plain Python values that DB drivers can bind."""
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if hasattr(value, "item") else value
+
+
+class WatermarkStore:
+    """
+    SQLite store of incremental cleaning state per pipeline: the highest watermark already
+    cleaned, the merged ColumnSummary objects (global imputation statistics) and row counts.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "watermarks.sqlite")
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS watermarks (
+                key TEXT PRIMARY KEY,
+                watermark BLOB,
+                summaries BLOB NOT NULL,
+                rows_cleaned INTEGER NOT NULL,
+                runs INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """{watermark, summaries, rows_cleaned, runs} of the last successful run, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, summaries, rows_cleaned, runs FROM watermarks WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "watermark": pickle.loads(row[0]),
+            "summaries": pickle.loads(row[1]),
+            "rows_cleaned": row[2],
+            "runs": row[3],
+        }
+
+    def save(self, key, watermark, summaries, rows_cleaned, runs):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (key, watermark, summaries, rows_cleaned, runs, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, pickle.dumps(watermark), pickle.dumps(summaries), rows_cleaned, runs, time.time()),
+            )
+            self._conn.commit()
+
+    def reset(self, key):
+        """Forgets a pipeline; its next run re-cleans everything."""
+        with self._lock:
+            self._conn.execute("DELETE FROM watermarks WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+class _AgentSink:
+    """Runs the AI stage on every cleaned chunk before passing it on to `sink`."""
+
+    def __init__(self, agent, sink, **agent_kwargs):
+        self.agent = agent
+        self.sink = sink
+        self.agent_kwargs = agent_kwargs
+
+    def write(self, chunk):
+        if not len(chunk):
+            return
+        cleaned = self.agent.process_data(chunk, **self.agent_kwargs)
+        if isinstance(cleaned, str):
+            cleaned = pd.read_csv(StringIO(cleaned))
+        self.sink.write(cleaned)
+
+    def close(self):
+        return self.sink.close()
+
+
+class IncrementalCleaner:
+    """
+    Re-cleans only what changed since the last run of a query.
+
+    Rows are selected by a monotonically increasing `watermark_column` (an id or `updated_at`):
+    each run reads `watermark >= last watermark` up to the current maximum, cleans those rows with
+    fill values from the stored global statistics merged with the new rows', optionally runs the
+    AI stage on them, and upserts them into `target_table` on `key_columns`. The watermark and
+    statistics are saved only after the upsert commits, so a failed run is simply repeated.
+    Rows at exactly the last watermark are read again and upserted idempotently, so a row
+    committed late with the same timestamp as the previous run's maximum is not skipped.
+
+    Cost is proportional to the changed rows plus the rows sharing the last watermark value, so
+    use a fine-grained column: with a coarse one (a batch id, a date) every run re-cleans the
+    whole last batch. Known limits: deleted source rows are not removed from the target,
+    statistics keep every row version seen (an update or a re-read boundary row adds its values
+    again), and rows cleaned earlier keep the fill values of their run until a full refresh. On
+    SQLite, a source and target in the same file need WAL mode (an open streamed read blocks writers).
+    """
+
+    def __init__(self, cleaner=None, store=None, strategy="mean", chunksize=DEFAULT_CHUNKSIZE):
+        self.cleaner = cleaner
+        self.store = store or WatermarkStore()
+        self.strategy = strategy
+        self.chunksize = chunksize
+        self.stats = {}
+
+    def run(self, engine, query, watermark_column, target_table, key_columns,
+            db_url=None, ai_agent=None, full_refresh=False, **agent_kwargs):
+        """Cleans the rows of `query` changed since the last run into `target_table`; returns run statistics."""
+        start = time.perf_counter()
+        key = make_state_key(db_url or engine.url.render_as_string(hide_password=False), query, target_table)
+        if full_refresh:
+            self.store.reset(key)
+        state = self.store.get(key) or {"watermark": None, "summaries": {}, "rows_cleaned": 0, "runs": 0}
+
+        quote = engine.dialect.identifier_preparer.quote
+        column = f"src.{quote(watermark_column)}"
+        low = state["watermark"]
+        where, params = ("", {}) if low is None else (f"WHERE {column} >= :low", {"low": low})
+
+        # Upper bound fixed up front: rows arriving mid-run wait for the next run
+        bound = pd.read_sql(text(f"SELECT MAX({column}) AS high FROM ({query}) AS src {where}"), engine, params=params)
+        high = _to_python(bound["high"].iloc[0]) if len(bound) else None
+        if high is None or (isinstance(high, float) and pd.isna(high)):
+            self.stats = {"rows": 0, "watermark": low, "runs": state["runs"], "rows_cleaned": state["rows_cleaned"],
+                          "seconds": round(time.perf_counter() - start, 3)}
+            print(f"✅ Incremental clean: nothing new since {low!r}")
+            return self.stats
+
+        params["high"] = high
+        where = f"{where} AND {column} <= :high" if where else f"WHERE {column} <= :high"
+        delta_sql = f"SELECT * FROM ({query}) AS src {where} ORDER BY {column}"
+        chunks = lambda: read_sql_chunks(engine, delta_sql, chunksize=self.chunksize, params=params)
+
+        load = BulkLoad(engine, target_table, mode="upsert", key_columns=key_columns)
+        sink = load if ai_agent is None else _AgentSink(ai_agent, load, **agent_kwargs)
+        streaming = StreamingCleaner(cleaner=self.cleaner, strategy=self.strategy, chunksize=self.chunksize, dedupe=False)
+        try:
+            run_stats = streaming.run(chunks, sink, summaries=state["summaries"])
+        except Exception:
+            load.abort()
+            raise
+
+        rows_cleaned = state["rows_cleaned"] + run_stats["rows_in"]
+        self.store.save(key, high, streaming.summaries, rows_cleaned, state["runs"] + 1)
+        self.stats = {
+            "rows": run_stats["rows_in"],
+            "watermark_from": low,
+            "watermark": high,
+            "runs": state["runs"] + 1,
+            "rows_cleaned": rows_cleaned,
+            "written": load.stats,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        print(f"✅ Incremental clean: {self.stats['rows']} changed rows ({low!r} -> {high!r})")
+        return self.stats
@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from scripts.ai_agent import BatchCancelled
+from scripts.backpressure import Overloaded
+from scripts.batch_stream import BatchStream, records
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job:
+    """One background cleaning run: status, batch progress, result and a cancel flag."""
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.stage = "queued"
+        self.batches_done = 0
+        self.batches_total = None
+        self.error = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        # Files owned by the result (e.g. a cleaned CSV); removed when the job is evicted
+        self.temp_files = []
+        # Append-only log of stage/rows/progress events, replayed by GET /jobs/{id}/events.
+        # "rows" events only keep an offset and a row count; see replay
+        self.events = []
+        self._rows_logged = 0
+        # Streamed batch frames by offset while running; None once finished
+        self._pending_rows = {}
+        self._stream = BatchStream(publish=self._log)
+        self._lock = threading.Lock()
+
+    def _log(self, event):
+        if event["type"] == "rows":
+            frame = event.pop("rows")
+            with self._lock:
+                event["offset"], event["count"] = self._rows_logged, len(frame)
+                self._rows_logged += len(frame)
+                if self._pending_rows is not None:
+                    self._pending_rows[event["offset"]] = frame
+        self.events.append(event)
+
+    def replay(self, start=0):
+        """
+        Logged events from `start` on, with the rows of each "rows" event filled in: the streamed
+        batch while the job runs, afterwards the same slice of the result's cleaned_data
+        (empty if the job left no such frame).
+        """
+        with self._lock:
+            events, pending = self.events[start:], self._pending_rows
+        cleaned = self.result.get("cleaned_data") if isinstance(self.result, dict) else None
+        replayed = []
+        for event in events:
+            if event["type"] == "rows":
+                if pending is not None and event["offset"] in pending:
+                    frame = pending[event["offset"]]
+                elif isinstance(cleaned, pd.DataFrame):
+                    frame = cleaned.iloc[event["offset"]:event["offset"] + event["count"]]
+                else:
+                    frame = pd.DataFrame()
+                event = {**event, "rows": records(frame)}
+            replayed.append(event)
+        return replayed
+
+    def finish(self):
+        """Drops the streamed batches; from now on rows are replayed from the stored result."""
+        with self._lock:
+            self._pending_rows = None
+
+    def set_stage(self, stage):
+        self.stage = stage
+        self._stream.set_stage(stage)
+
+    def on_batch(self, index, total, response):
+        """Progress hook for AIAgent.process_data; also logs the batch's parsed rows."""
+        with self._lock:
+            self.batches_total = total
+            self.batches_done += 1
+        self._stream.on_batch(index, total, response)
+
+    def agent_hooks(self):
+        """Keyword arguments that wire AIAgent.process_data to this job's progress and cancel flag."""
+        return {"on_batch": self.on_batch, "cancel_event": self.cancel_event}
+
+    def to_dict(self):
+        with self._lock:
+            done, total = self.batches_done, self.batches_total
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "batches_done": done,
+            "batches_total": total,
+            "progress": round(done / total, 3) if total else (1.0 if self.status == SUCCEEDED else 0.0),
+            "error": self.error,
+            "created_at": self.created_at,
+            "elapsed_seconds": round(end - (self.started_at or end), 3),
+        }
+
+
+class JobManager:
+    """
+    In-process job queue: submitted jobs wait in a FIFO and run on `max_workers` threads.
+    At most `max_queued` jobs may wait; the oldest finished jobs beyond `max_retained`, and any
+    finished more than `retention_seconds` ago, are forgotten (and their temp files deleted).
+    """
+
+    def __init__(self, max_workers=2, max_queued=32, max_retained=50, retention_seconds=3600):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_retained = max_retained
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cleaning-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """Queues `fn(job, *args, **kwargs)`; its return value becomes the job result."""
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if queued >= self.max_queued:
+                raise Overloaded()
+            job = Job(kind)
+            self._jobs[job.id] = job
+            self._evict()
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        print(f"🗂️ Job {job.id} ({kind}) queued")
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_event.is_set():
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.set_stage("done")
+            job.status = SUCCEEDED
+        except BatchCancelled:
+            job.set_stage("cancelled")
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            print(f"❌ Job {job.id} failed: {e}")
+        finally:
+            job.finish()
+            job.finished_at = time.time()
+        print(f"🗂️ Job {job.id} {job.status} in {job.finished_at - job.started_at:.2f}s")
+        with self._lock:
+            self._evict()
+
+    def get(self, job_id):
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            self._evict()
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def cancel(self, job_id):
+        """
+        Requests cancellation. Queued jobs never start; running jobs stop before their next
+        LLM batch (a rule-based stage already running finishes first).
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.status == QUEUED:
+            job.status = CANCELLED
+            job.stage = "cancelled"
+            job.finished_at = time.time()
+        return job
+
+    def _evict(self):
+        """Forgets the oldest finished jobs beyond max_retained and those past retention_seconds."""
+        finished = [job for job in self._jobs.values() if job.status in FINISHED and job.finished_at]
+        expired = time.time() - self.retention_seconds
+        for index, job in enumerate(finished):
+            if index >= len(finished) - self.max_retained and job.finished_at > expired:
+                continue
+            del self._jobs[job.id]
+            for path in job.temp_files:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def shutdown(self):
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Default location of the on-disk cache (project root /.cache)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.cache")
+
+
+def make_cache_key(prompt, model, temperature):
+    """Content address of an LLM call: same prompt, model and temperature -> same key."""
+    payload = f"{model}\x1f{temperature}\x1f{prompt}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMCache:
+    """Disk-backed (SQLite) cache of LLM responses with LRU eviction, TTL and hit/miss counters."""
+
+    def __init__(self, path=None, max_bytes=256 * 1024 * 1024, ttl_seconds=7 * 24 * 3600, clock=time.time):
+        self.path = path or os.path.join(CACHE_DIR, "llm_cache.sqlite")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def get(self, key):
+        """Returns the cached response for `key`, or None on a miss or expired entry."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, size, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl_seconds and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= row[1]
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, response):
+        """Stores a response and evicts least-recently-used entries beyond `max_bytes`."""
+        size = len(response.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        now = self._clock()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._total_bytes += size
+
+            while self.max_bytes and self._total_bytes > self.max_bytes:
+                victims = self._conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_access LIMIT 64"
+                ).fetchall()
+                if not victims:
+                    break
+                for victim_key, victim_size in victims:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (victim_key,))
+                    self._total_bytes -= victim_size
+                    self.evictions += 1
+
+            self._conn.commit()
+
+    def delete(self, key):
+        """Drops one entry (e.g. a response that later failed validation)."""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= row[0]
+
+    def clear(self):
+        """Drops every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current size of the cache."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
@@ -0,0 +1,103 @@
+import io
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+import backend
+from scripts.ai_agent import AIAgent
+from scripts.backpressure import BlockingWorkPool
+from scripts.benchmark_ai_agent import make_dirty_frame
+from scripts.fake_llm import FakeLLM
+
+
+class InlinePool(BlockingWorkPool):
+    """The old behaviour: blocking work runs directly on the event loop."""
+
+    async def run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    """Runs the FastAPI app with uvicorn in a background thread."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(backend.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def _csv_bytes(rows, seed=0):
+    buffer = io.StringIO()
+    make_dirty_frame(rows, seed).to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _small_requests(url, payload, count, interval):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = requests.post(f"{url}/clean-data", files={"file": ("small.csv", payload)})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+    return np.array(latencies)
+
+
+def _summary(latencies):
+    return f"p50={np.percentile(latencies, 50) * 1000:7.1f} ms  p99={np.percentile(latencies, 99) * 1000:7.1f} ms"
+
+
+def run_load_test(small_rows=20, large_rows=20000, small_count=40, latency=0.02, interval=0.02):
+    """
+    Measures small-request latency alone and while one large upload is being cleaned, first with
+    the bounded work pool and then with blocking work running inline on the event loop.
+    """
+    backend.ai_agent = AIAgent(llm=FakeLLM(latency=latency), cache=False, checkpoints=False)
+    small, large = _csv_bytes(small_rows), _csv_bytes(large_rows, seed=1)
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    server, thread = start_server(port)
+    print(f"\n⏱️  Load test: {small_count} small uploads ({small_rows} rows) vs one large upload ({large_rows} rows)")
+
+    try:
+        for label, pool in (("work pool", BlockingWorkPool(max_in_flight=4, max_queued=16)), ("inline   ", InlinePool())):
+            backend.work_pool = pool
+            idle = _small_requests(url, small, small_count, interval)
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                big = executor.submit(requests.post, f"{url}/clean-data", files={"file": ("large.csv", large)})
+                time.sleep(0.2)
+                loaded = _small_requests(url, small, small_count, interval)
+                big.result().raise_for_status()
+
+            print(f"   {label} idle:       {_summary(idle)}")
+            print(f"   {label} large job:  {_summary(loaded)}")
+
+        # Backpressure: more concurrent uploads than running + queued slots get 429 immediately
+        backend.work_pool = BlockingWorkPool(max_in_flight=1, max_queued=2)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(
+                lambda _: requests.post(f"{url}/clean-data", files={"file": ("small.csv", small)}), range(8)
+            ))
+        codes = [response.status_code for response in responses]
+        print(f"   backpressure: {codes.count(200)} x 200, {codes.count(429)} x 429 (max_in_flight=1, max_queued=2)")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    run_load_test()
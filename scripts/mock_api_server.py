@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+
+import numpy as np
+from aiohttp import web
+
+
+def make_records(rows, seed=0):
+    """Nested, slightly dirty JSON records (like a typical REST API's products/users)."""
+    rng = np.random.default_rng(seed)
+    cities = ["New York", "Chicago", None, "Houston"]
+    return [
+        {
+            "id": i,
+            "name": f"item {i}" if rng.random() > 0.05 else None,
+            "price": round(float(rng.normal(50, 15)), 2) if rng.random() > 0.05 else None,
+            "address": {"city": cities[i % len(cities)], "zip": f"{10000 + i % 97}"},
+            "tags": ["sale", "new"][: i % 3],
+        }
+        for i in range(rows)
+    ]
+
+
+class MockApi:
+    """
+    Local paginated JSON API for tests and benchmarks (aiohttp, in a background thread).
+      /page?page=&per_page=        {"data": [...], "total": n}
+      /offset?offset=&limit=       [...]
+      /cursor?cursor=&limit=       {"items": [...], "next": cursor or null}
+      /all                         every record in one top-level array
+    Every response waits `latency` seconds first, like a remote API.
+    """
+
+    def __init__(self, rows=1000, latency=0.0, port=0):
+        self.records = make_records(rows)
+        self.latency = latency
+        self.port = port
+        self.requests = 0
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    async def _respond(self, body):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.Response(body=json.dumps(body).encode("utf-8"), content_type="application/json")
+
+    async def page(self, request):
+        page, size = int(request.query.get("page", 1)), int(request.query.get("per_page", 100))
+        return await self._respond({"data": self.records[(page - 1) * size:page * size], "total": len(self.records)})
+
+    async def offset(self, request):
+        offset, limit = int(request.query.get("offset", 0)), int(request.query.get("limit", 100))
+        return await self._respond(self.records[offset:offset + limit])
+
+    async def cursor(self, request):
+        start, limit = int(request.query.get("cursor", 0)), int(request.query.get("limit", 100))
+        following = start + limit if start + limit < len(self.records) else None
+        return await self._respond({"items": self.records[start:start + limit], "next": following})
+
+    async def all(self, request):
+        return await self._respond(self.records)
+
+    def start(self):
+        """Starts serving; returns the base URL."""
+        started = threading.Event()
+
+        async def serve():
+            app = web.Application()
+            app.router.add_get("/page", self.page)
+            app.router.add_get("/offset", self.offset)
+            app.router.add_get("/cursor", self.cursor)
+            app.router.add_get("/all", self.all)
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+            started.set()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(serve(), self._loop)
+        started.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    api = MockApi(rows=1000, latency=0.05)
+    print(f"🌐 Mock API at {api.start()} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        api.stop()
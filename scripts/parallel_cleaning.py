@@ -0,0 +1,200 @@
+import os
+import shutil
+import tempfile
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scripts.cleaning_engines import _mode_value
+from scripts.data_cleaning import DataCleaning
+from scripts.deduplication import row_fingerprints
+
+# Frames smaller than this are cleaned serially; process startup would dominate
+PARALLEL_MIN_ROWS = int(os.getenv("PARALLEL_MIN_ROWS", "200000"))
+
+# tmpfs-backed when available, so Arrow IPC files below are shared memory, not disk
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+HASH = "__hash"
+NULL = "__null"
+
+
+# ----------------------- Arrow IPC Helpers -----------------------------
+# Partitions move between processes as Arrow IPC files on tmpfs. Readers memory-map them,
+# so slicing rows or selecting columns is zero-copy and no DataFrame is ever pickled.
+
+def _write_table(table, path):
+    import pyarrow as pa
+
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_table(path):
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def _to_table(df):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+# ----------------------- Worker Tasks -----------------------------
+
+def _fill_and_hash_rows(input_path, start, stop, strategy, fill_values, numeric_cols, output_path):
+    """Row partition: impute with the global fill values and fingerprint every row."""
+    chunk = _read_table(input_path).slice(start, stop - start).to_pandas()
+    null_rows = chunk.isna().any(axis=1).to_numpy()
+
+    cleaner = DataCleaning(engine="pandas", workers=1)
+    if strategy != "drop":
+        chunk = cleaner.handle_missing_values(chunk, strategy, fill_values=fill_values)
+
+    chunk[HASH] = row_fingerprints(chunk, numeric_cols)
+    chunk[NULL] = null_rows
+    _write_table(_to_table(chunk), output_path)
+    return output_path
+
+
+def _fix_type_columns(partition_paths, columns, keep_path, output_path):
+    """Column partition: gather the kept rows of some columns and run the shared type fixing."""
+    import pyarrow as pa
+
+    table = pa.concat_tables([_read_table(path).select(columns) for path in partition_paths])
+    keep = np.load(keep_path, mmap_mode="r")
+    frame = table.filter(pa.array(np.asarray(keep))).to_pandas()
+
+    cleaner = DataCleaning(engine="pandas", workers=1)
+    frame = cleaner.fix_data_types(frame)
+    # Arrow's pandas metadata restores category, float32/uint and nullable dtypes on read
+    _write_table(_to_table(frame), output_path)
+    return output_path, getattr(cleaner, "last_type_report", None)
+
+
+# ----------------------- Parallel Cleaner -----------------------------
+
+class ParallelCleaner:
+    """
+    Runs DataCleaning.clean_data across a process pool with the same results as the serial path.
+
+    1. Global fill values are computed once over the whole frame (Arrow kernels for median and
+       mode with pandas tie-breaking; pandas for the mean so float sums agree exactly).
+    2. Row partitions: each worker imputes its rows and writes a 64-bit fingerprint per row.
+       The parent keeps the first occurrence of every fingerprint across all partitions.
+    3. Column partitions: each worker takes the kept rows of its columns and fixes types, which
+       needs whole columns to stay consistent.
+
+    Scaling is unmeasured beyond one core. On a single-core host (2M rows, 'mean') the serial
+    path took 4.6s, workers=1 7.0s (the Arrow round trip alone) and workers=2 37s, so keep
+    CLEANING_WORKERS=1 unless scripts/benchmark_parallel_cleaning.py shows a speedup on the target host.
+    """
+
+    def __init__(self, workers=None, min_rows=PARALLEL_MIN_ROWS, mp_context="spawn"):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.mp_context = mp_context
+        self.stats = {}
+
+    def _fill_values(self, df, table, strategy):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if strategy not in ("mean", "median", "mode"):
+            return None
+
+        fill_values = {}
+        for position, (name, column) in enumerate(zip(table.column_names, table.columns)):
+            if column.null_count == 0:
+                continue
+            if strategy == "mode":
+                counts = pc.value_counts(column.drop_null()).flatten()
+                if len(counts[0]):
+                    fill_values[name] = _mode_value(counts[0].to_pylist(), counts[1].to_pylist())
+            elif pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+                if strategy == "mean":
+                    # pandas' own sum, so the fill value matches the serial path to the last bit
+                    fill_values[name] = float(df.iloc[:, position].mean())
+                else:
+                    fill_values[name] = pc.quantile(column, q=0.5, interpolation="linear")[0].as_py()
+        return fill_values
+
+    def clean_data(self, df, strategy="mean"):
+        """Parallel equivalent of DataCleaning.clean_data; the input frame is not modified."""
+        if self.workers <= 1 or len(df) < self.min_rows:
+            return DataCleaning(engine="pandas", workers=1).clean_data(df, strategy)
+
+        try:
+            table = _to_table(df)
+        except Exception as e:
+            # e.g. object columns mixing ints and strings have no Arrow equivalent
+            print(f"⚠️ Parallel cleaning unavailable ({e}); cleaning serially")
+            return DataCleaning(engine="pandas", workers=1).clean_data(df, strategy)
+
+        start = time.perf_counter()
+        workdir = tempfile.mkdtemp(prefix="parallel_clean_", dir=SHARED_DIR)
+        try:
+            input_path = os.path.join(workdir, "input.arrow")
+            _write_table(table, input_path)
+            fill_values = self._fill_values(df, table, strategy)
+            numeric_cols = [
+                col for col in df.columns
+                if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+            ]
+            del table
+
+            context = multiprocessing.get_context(self.mp_context)
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                # Phase 2: row partitions
+                bounds = np.linspace(0, len(df), self.workers + 1, dtype=np.int64)
+                row_jobs = [
+                    pool.submit(
+                        _fill_and_hash_rows, input_path, int(lo), int(hi), strategy, fill_values,
+                        numeric_cols, os.path.join(workdir, f"rows_{i}.arrow"),
+                    )
+                    for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])) if hi > lo
+                ]
+                partition_paths = [job.result() for job in row_jobs]
+
+                hashes = np.concatenate([
+                    _read_table(path).column(HASH).to_numpy() for path in partition_paths
+                ])
+                keep = ~pd.Series(hashes).duplicated().to_numpy()
+                if strategy == "drop":
+                    nulls = np.concatenate([
+                        _read_table(path).column(NULL).to_numpy(zero_copy_only=False) for path in partition_paths
+                    ])
+                    keep &= ~nulls
+                keep_path = os.path.join(workdir, "keep.npy")
+                np.save(keep_path, keep)
+
+                # Phase 3: column partitions
+                columns = [str(col) for col in df.columns]
+                groups = [group.tolist() for group in np.array_split(np.array(columns, dtype=object), self.workers) if len(group)]
+                column_jobs = [
+                    pool.submit(_fix_type_columns, partition_paths, group, keep_path, os.path.join(workdir, f"cols_{i}.arrow"))
+                    for i, group in enumerate(groups)
+                ]
+                results = [job.result() for job in column_jobs]
+
+            cleaned = pd.concat([_read_table(path).to_pandas() for path, _ in results], axis=1)
+            cleaned.columns = df.columns
+            cleaned.index = df.index[keep]
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.stats = {
+            "workers": self.workers,
+            "rows_in": len(df),
+            "rows_out": len(cleaned),
+            "seconds": round(time.perf_counter() - start, 3),
+            "type_changes": {k: v for _, report in results if report for k, v in report["columns"].items()},
+        }
+        print(f"✅ Parallel clean finished: {self.stats}")
+        return cleaned
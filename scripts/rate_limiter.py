@@ -0,0 +1,63 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe limiter for requests-per-minute and tokens-per-minute quotas.
+
+    Both quotas are token buckets that refill continuously, so bursts up to the
+    per-minute limit are allowed and the long-run rate never exceeds it.
+    A limit of None disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, clock=time.monotonic, sleep=time.sleep):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._request_budget = float(requests_per_minute or 0)
+        self._token_budget = float(tokens_per_minute or 0)
+        self._last_refill = clock()
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_budget = min(
+                float(self.requests_per_minute),
+                self._request_budget + elapsed * self.requests_per_minute / 60.0,
+            )
+        if self.tokens_per_minute:
+            self._token_budget = min(
+                float(self.tokens_per_minute),
+                self._token_budget + elapsed * self.tokens_per_minute / 60.0,
+            )
+
+    def acquire(self, tokens=0):
+        """Blocks until one request carrying `tokens` tokens fits in both quotas."""
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+
+        # A single request larger than the whole minute budget could never fit, so cap it
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+
+                wait_for = 0.0
+                if self.requests_per_minute and self._request_budget < 1:
+                    wait_for = max(wait_for, (1 - self._request_budget) * 60.0 / self.requests_per_minute)
+                if self.tokens_per_minute and self._token_budget < tokens:
+                    wait_for = max(wait_for, (tokens - self._token_budget) * 60.0 / self.tokens_per_minute)
+
+                if wait_for == 0.0:
+                    if self.requests_per_minute:
+                        self._request_budget -= 1
+                    if self.tokens_per_minute:
+                        self._token_budget -= tokens
+                    return
+
+            self._sleep(wait_for)
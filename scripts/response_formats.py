@@ -0,0 +1,176 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Accept header / ?format= value -> response format. arrow/parquet bodies are one frame each,
+# a plain Arrow IPC stream or Parquet file (see encode_result)
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+COLUMNS_MEDIA_TYPE = "application/vnd.columns+json"
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columns": COLUMNS_MEDIA_TYPE,
+    "arrow": ARROW_MEDIA_TYPE,
+    "parquet": PARQUET_MEDIA_TYPE,
+}
+# Older name some clients still send for Parquet
+MEDIA_TYPE_ALIASES = {"application/x-parquet": "parquet"}
+
+# Frame sent in an arrow/parquet body when the request doesn't pick one with ?frame=
+DEFAULT_FRAME = "cleaned_data"
+# Schema metadata keys: the frame's name, every frame of the result, and the result's other keys (JSON)
+FRAME_KEY = b"cleaning.frame"
+FRAMES_KEY = b"cleaning.frames"
+META_KEY = b"cleaning.meta"
+
+
+def to_records(df):
+    """JSON-safe records: NaN/NaT/<NA> from nullable and downcast dtypes become None."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def negotiate(accept=None, fmt=None):
+    """Response format from an explicit ?format= value, else the Accept header; json by default."""
+    if fmt:
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"Unknown format '{fmt}'. Use one of {', '.join(MEDIA_TYPES)}.")
+        return fmt
+    for part in (accept or "").split(","):
+        media_type = part.split(";")[0].strip().lower()
+        for name, candidate in MEDIA_TYPES.items():
+            if media_type == candidate and name != "json":
+                return name
+        if media_type in MEDIA_TYPE_ALIASES:
+            return MEDIA_TYPE_ALIASES[media_type]
+    return "json"
+
+
+# ----------------------- Encoding -----------------------------
+
+def _to_arrow(df):
+    import pyarrow as pa
+
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Object columns mixing types (e.g. ints and strings) have no Arrow type: send them as text
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _arrow_bytes(table):
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _parquet_bytes(table):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue()
+
+
+def _columns(df):
+    """{column: values}; numeric columns stay numpy arrays for orjson to encode natively."""
+    columns = {}
+    for col, values in df.items():
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "iubf":
+            # orjson writes NaN as null
+            columns[str(col)] = values.to_numpy()
+        else:
+            columns[str(col)] = values.astype(object).where(values.notna(), None).tolist()
+    return columns
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, default=lambda value: value.tolist() if isinstance(value, np.ndarray) else str(value)).encode("utf-8")
+
+
+def pick_frame(result, frame=None):
+    """Name of the frame an arrow/parquet body carries: `frame`, else DEFAULT_FRAME, else the first one."""
+    frames = [key for key, value in result.items() if isinstance(value, pd.DataFrame)]
+    if frame is None:
+        frame = DEFAULT_FRAME if DEFAULT_FRAME in frames or not frames else frames[0]
+    if frame not in frames:
+        raise KeyError(f"Unknown frame '{frame}'. Available: {', '.join(frames) or 'none'}.")
+    return frame
+
+
+def encode_result(result, fmt, frame=None):
+    """
+    Encodes a pipeline result (a dict whose DataFrame values are frames) as `fmt`.
+
+    json    - the default FastAPI body: frames as lists of records (the caller renders it)
+    columns - one orjson document; frames are {"columns": {name: [values]}, "rows": n}
+    arrow / parquet - one frame (see pick_frame) as a standard Arrow IPC stream or Parquet file,
+              readable by any Arrow client. Its schema metadata names the frame (FRAME_KEY), lists
+              every frame of the result (FRAMES_KEY, fetch the others with ?frame=) and carries the
+              other keys as JSON (META_KEY).
+    """
+    frames = {key: value for key, value in result.items() if isinstance(value, pd.DataFrame)}
+    rest = {key: value for key, value in result.items() if key not in frames}
+
+    if fmt == "json":
+        return {**rest, **{key: to_records(df) for key, df in frames.items()}}
+    if fmt == "columns":
+        return _dumps({**rest, **{key: {"columns": _columns(df), "rows": len(df)} for key, df in frames.items()}})
+
+    frame = pick_frame(result, frame)
+    table = _to_arrow(frames[frame])
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        FRAME_KEY: frame.encode("utf-8"),
+        FRAMES_KEY: json.dumps(list(frames)).encode("utf-8"),
+        META_KEY: _dumps(rest),
+    })
+    return bytes(_arrow_bytes(table) if fmt == "arrow" else _parquet_bytes(table))
+
+
+# ----------------------- Decoding (client side) -----------------------------
+
+def decode_result(content, media_type):
+    """
+    Response body -> dict of DataFrames (plus any other keys), for every format above.
+    An arrow/parquet body holds one frame; the names of the others are under "frames".
+    Arrow streams are read straight from the response buffer without copying it.
+    """
+    media_type = (media_type or "").split(";")[0].strip()
+    if media_type == COLUMNS_MEDIA_TYPE:
+        payload = orjson.loads(content) if orjson is not None else json.loads(content)
+        return {
+            key: pd.DataFrame(value["columns"]) if isinstance(value, dict) and "columns" in value else value
+            for key, value in payload.items()
+        }
+    if media_type not in (ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE, *MEDIA_TYPE_ALIASES):
+        payload = json.loads(content)
+        return {key: pd.DataFrame(value) if isinstance(value, list) else value for key, value in payload.items()}
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if media_type == ARROW_MEDIA_TYPE:
+        table = pa.ipc.open_stream(pa.py_buffer(content)).read_all()
+    else:
+        table = pq.read_table(pa.BufferReader(content))
+    metadata = table.schema.metadata or {}
+    result = json.loads(metadata.get(META_KEY, b"{}"))
+    frame = metadata.get(FRAME_KEY, DEFAULT_FRAME.encode("utf-8")).decode("utf-8")
+    result["frames"] = json.loads(metadata.get(FRAMES_KEY, json.dumps([frame])))
+    result[frame] = table.to_pandas(split_blocks=True, self_destruct=True)
+    return result
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from scripts.llm_cache import CACHE_DIR
+
+
+def make_run_id(batches, *parts):
+    """Deterministic id of an AI cleaning run: same batches and settings -> same run, so it resumes."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(f"{part}\x1f".encode("utf-8"))
+    for batch in batches:
+        digest.update(hashlib.sha256(batch.encode("utf-8")).digest())
+    return digest.hexdigest()[:32]
+
+
+class CheckpointStore:
+    """
+    SQLite store of validated per-batch LLM answers, keyed by (run_id, batch_index).
+    A rerun of an interrupted or partly failed run loads the finished batches from here and
+    only sends the rest. Runs untouched for `ttl_seconds` are purged.
+    """
+
+    def __init__(self, path=None, ttl_seconds=7 * 24 * 3600, clock=time.time):
+        self.path = path or os.path.join(CACHE_DIR, "run_checkpoints.sqlite")
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                total_batches INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS batches (
+                run_id TEXT NOT NULL,
+                batch_index INTEGER NOT NULL,
+                response TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, batch_index)
+            );
+            """
+        )
+        self._conn.commit()
+        self.purge()
+
+    def start_run(self, run_id, total_batches):
+        """Registers (or reopens) a run and returns {batch_index: response} already completed."""
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO runs (run_id, total_batches, status, created_at, updated_at) VALUES (?, ?, 'running', ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET status = 'running', total_batches = excluded.total_batches, updated_at = excluded.updated_at
+                """,
+                (run_id, total_batches, now, now),
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT batch_index, response FROM batches WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def save_batch(self, run_id, batch_index, response, attempts=1):
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO batches (run_id, batch_index, response, attempts, completed_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, batch_index, response, attempts, now),
+            )
+            self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+            self._conn.commit()
+
+    def finish_run(self, run_id, status):
+        """Marks a run 'completed' or 'failed'; its batches stay until the TTL purge."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, self._clock(), run_id)
+            )
+            self._conn.commit()
+
+    def run_status(self, run_id):
+        with self._lock:
+            run = self._conn.execute(
+                "SELECT total_batches, status, created_at, updated_at FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if run is None:
+                return None
+            done = self._conn.execute("SELECT COUNT(*) FROM batches WHERE run_id = ?", (run_id,)).fetchone()[0]
+        return {
+            "run_id": run_id,
+            "total_batches": run[0],
+            "completed_batches": done,
+            "status": run[1],
+            "created_at": run[2],
+            "updated_at": run[3],
+        }
+
+    def purge(self):
+        """Deletes runs (and their batches) not updated within the TTL."""
+        if not self.ttl_seconds:
+            return
+        cutoff = self._clock() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM batches WHERE run_id IN (SELECT run_id FROM runs WHERE updated_at < ?)", (cutoff,)
+            )
+            self._conn.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,))
+            self._conn.commit()
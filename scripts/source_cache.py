@@ -0,0 +1,218 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from scripts.csv_ingestion import table_to_frame
+from scripts.llm_cache import CACHE_DIR
+
+# Bump when a reader changes what it returns, so frames parsed by the old code are not served
+SOURCE_CACHE_VERSION = 2
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """BLAKE2b content hash of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_source_key(digest, reader, options):
+    """Content address of a parsed source: same bytes, reader and reader options -> same key."""
+    payload = f"{SOURCE_CACHE_VERSION}\x1f{digest}\x1f{reader}\x1f{sorted(options.items())!r}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SourceCache:
+    """
+    Disk cache of parsed sources (CSV, Excel, ...). Frames are stored as uncompressed Arrow IPC
+    (Feather v2) files that load back through a memory map, under a key of the file's content
+    hash and the reader options. A SQLite index holds the entries (LRU eviction beyond
+    `max_bytes`) and each path's last size/mtime, so an unchanged file is not hashed again.
+    """
+
+    def __init__(self, directory=None, max_bytes=1024 * 1024 * 1024, clock=time.time):
+        self.directory = directory or os.path.join(CACHE_DIR, "sources")
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                file TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    # ---- Fingerprints ----
+
+    def fingerprint(self, path):
+        """Content hash of `path`; recomputed only when its size or mtime changed since the last call."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime_ns, digest FROM fingerprints WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        digest = file_digest(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest),
+            )
+            self._conn.commit()
+        return digest
+
+    # ---- Entries ----
+
+    def _drop(self, key, file, size):
+        # Caller holds the lock
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._total_bytes -= size
+        try:
+            os.remove(os.path.join(self.directory, file))
+        except FileNotFoundError:
+            pass
+
+    def get(self, key):
+        """Returns the cached frame for `key`, or None on a miss."""
+        import pyarrow as pa
+
+        with self._lock:
+            row = self._conn.execute("SELECT file, size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                with pa.memory_map(os.path.join(self.directory, row[0]), "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+            except (OSError, pa.ArrowInvalid):
+                # File removed or damaged behind the index's back
+                self._drop(key, *row)
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (self._clock(), key))
+            self._conn.commit()
+            self.hits += 1
+        return table_to_frame(table)
+
+    def set(self, key, df):
+        """
+        Stores a frame and evicts least-recently-used entries beyond `max_bytes`. Frames Arrow
+        can't represent exactly (e.g. object columns mixing ints and strings) are not cached.
+        """
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return False
+
+        # Written under a temp name and renamed, so readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            file = f"{key}.arrow"
+            os.replace(tmp, os.path.join(self.directory, file))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        size = os.path.getsize(os.path.join(self.directory, file))
+        if self.max_bytes and size > self.max_bytes:
+            os.remove(os.path.join(self.directory, file))
+            return False
+
+        now = self._clock()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, file, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, file, size, now, now),
+            )
+            self._total_bytes += size
+
+            while self.max_bytes and self._total_bytes > self.max_bytes:
+                victims = self._conn.execute(
+                    "SELECT key, file, size FROM entries WHERE key != ? ORDER BY last_access LIMIT 64", (key,)
+                ).fetchall()
+                if not victims:
+                    break
+                for victim in victims:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    self._drop(*victim)
+                    self.evictions += 1
+
+            self._conn.commit()
+        return True
+
+    def load(self, path, loader, reader, **options):
+        """
+        The frame `loader()` parses from `path`, from the cache when the file's content, `reader`
+        (a name for the parser) and `options` match an earlier call. Misses are parsed and stored.
+        """
+        key = make_source_key(self.fingerprint(path), reader, options)
+        df = self.get(key)
+        if df is None:
+            df = loader()
+            if isinstance(df, pd.DataFrame):
+                self.set(key, df)
+        return df
+
+    def clear(self):
+        """Drops every cached frame and fingerprint."""
+        with self._lock:
+            for key, file, size in self._conn.execute("SELECT key, file, size FROM entries").fetchall():
+                self._drop(key, file, size)
+            self._conn.execute("DELETE FROM fingerprints")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current size of the cache."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
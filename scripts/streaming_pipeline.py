@@ -0,0 +1,239 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from scripts.data_cleaning import DataCleaning
+from scripts.deduplication import FingerprintSet, row_fingerprints
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+# ----------------------- Mergeable Column Summaries -----------------------------
+
+class ColumnSummary:
+    """
+    Mergeable per-column statistics gathered chunk by chunk.
+    Mean is exact, median comes from a fixed-size uniform (bottom-k) sample, and mode comes
+    from value counts pruned to the `max_distinct` most frequent values.
+    """
+
+    def __init__(self, sample_size=100_000, max_distinct=100_000, seed=0):
+        self.sample_size = sample_size
+        self.max_distinct = max_distinct
+        self._rng = np.random.default_rng(seed)
+        self.count = 0
+        self.total = 0.0
+        self.is_numeric = True
+        self.parses_as_numeric = True
+        self._sample_values = np.empty(0, dtype=np.float64)
+        self._sample_keys = np.empty(0, dtype=np.float64)
+        self.value_counts = pd.Series(dtype=np.int64)
+
+    def update(self, series):
+        non_null = series.dropna()
+        if non_null.empty:
+            # All-null chunks say nothing about the type (SQL returns them as object columns)
+            return
+        self._merge_counts(non_null.value_counts())
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = non_null.to_numpy(dtype=np.float64)
+            self.count += len(values)
+            self.total += float(values.sum())
+            self._merge_sample(values, self._rng.random(len(values)))
+        else:
+            self.is_numeric = False
+            if self.parses_as_numeric and len(non_null):
+                self.parses_as_numeric = bool(pd.to_numeric(non_null, errors="coerce").notna().all())
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.is_numeric = self.is_numeric and other.is_numeric
+        self.parses_as_numeric = self.parses_as_numeric and other.parses_as_numeric
+        self._merge_sample(other._sample_values, other._sample_keys)
+        self._merge_counts(other.value_counts)
+        return self
+
+    def _merge_sample(self, values, keys):
+        values = np.concatenate([self._sample_values, values])
+        keys = np.concatenate([self._sample_keys, keys])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            values, keys = values[keep], keys[keep]
+        self._sample_values, self._sample_keys = values, keys
+
+    def _merge_counts(self, counts):
+        if self.value_counts.empty:
+            self.value_counts = counts.astype(np.int64)
+        elif not counts.empty:
+            self.value_counts = self.value_counts.add(counts, fill_value=0).astype(np.int64)
+        if len(self.value_counts) > 2 * self.max_distinct:
+            self.value_counts = self.value_counts.nlargest(self.max_distinct)
+
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    def median(self):
+        return float(np.median(self._sample_values)) if len(self._sample_values) else np.nan
+
+    def mode(self):
+        return self.value_counts.idxmax() if not self.value_counts.empty else np.nan
+
+
+# ----------------------- Sinks -----------------------------
+
+class CsvSink:
+    """Appends cleaned chunks to a CSV file (or open text buffer), writing the header once."""
+
+    def __init__(self, path_or_buffer):
+        self.path_or_buffer = path_or_buffer
+        self._wrote_header = False
+
+    def write(self, chunk):
+        mode = "a" if self._wrote_header else "w"
+        if isinstance(self.path_or_buffer, (str, os.PathLike)):
+            chunk.to_csv(self.path_or_buffer, mode=mode, header=not self._wrote_header, index=False)
+        else:
+            chunk.to_csv(self.path_or_buffer, header=not self._wrote_header, index=False)
+        self._wrote_header = True
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    """Streams cleaned chunks into one Parquet file using the first chunk's schema (requires pyarrow)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+        self._schema = None
+
+    def write(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ListSink:
+    """Collects cleaned chunks in memory; `result()` concatenates them (for small inputs and tests)."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+
+    def close(self):
+        pass
+
+    def result(self):
+        return pd.concat(self.chunks, ignore_index=True) if self.chunks else pd.DataFrame()
+
+
+# ----------------------- Streaming Cleaner -----------------------------
+
+class StreamingCleaner:
+    """
+    Runs DataCleaning over a CSV (or any chunk source) in chunks so peak memory is bounded by the chunk size.
+
+    Pass 1 builds mergeable ColumnSummary objects (fill values and which columns are numeric).
+    Pass 2 imputes each chunk with the global fill values, drops rows whose fingerprint was
+    already seen in any earlier chunk, fixes types consistently and writes the chunk to a sink.
+    """
+
+    def __init__(self, cleaner=None, strategy="mean", chunksize=DEFAULT_CHUNKSIZE, dedupe=True):
+        self.cleaner = cleaner or DataCleaning()
+        self.strategy = strategy
+        self.chunksize = chunksize
+        self.dedupe = dedupe
+        self.stats = {}
+        self.summaries = {}
+
+    def _read_chunks(self, source, read_kwargs):
+        if callable(source):
+            # Chunk factory, e.g. lambda: read_sql_chunks(engine, query); called once per pass
+            return source()
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source, chunksize=self.chunksize, **read_kwargs)
+
+    def profile(self, source, **read_kwargs):
+        """First pass: returns {column: ColumnSummary} for the whole file."""
+        summaries = {}
+        for chunk in self._read_chunks(source, read_kwargs):
+            for col in chunk.columns:
+                summaries.setdefault(col, ColumnSummary()).update(chunk[col])
+        return summaries
+
+    def fill_values(self, summaries):
+        """Global fill values matching what DataCleaning.handle_missing_values would compute."""
+        if self.strategy == "mode":
+            return {col: summary.mode() for col, summary in summaries.items()}
+        if self.strategy in ("mean", "median"):
+            return {
+                col: getattr(summary, self.strategy)()
+                for col, summary in summaries.items()
+                if summary.is_numeric
+            }
+        return None
+
+    def run(self, source, sink, summaries=None, **read_kwargs):
+        """
+        Cleans `source` into `sink` and returns run statistics. `source` is a CSV path, a seekable
+        file, or a zero-argument callable returning an iterator of DataFrame chunks (it is called
+        twice, once per pass). `summaries` from earlier runs are merged with this source's, so
+        fill values cover both; the merged summaries are kept in `self.summaries`.
+        """
+        start = time.perf_counter()
+        new_summaries = self.profile(source, **read_kwargs)
+        summaries = dict(summaries or {})
+        for col, summary in new_summaries.items():
+            summaries[col] = summaries[col].merge(summary) if col in summaries else summary
+        self.summaries = summaries
+        fill_values = self.fill_values(summaries)
+        numeric_cols = [col for col, s in summaries.items() if s.is_numeric]
+        convert_cols = [col for col, s in summaries.items() if not s.is_numeric and s.parses_as_numeric]
+        # 8 bytes per distinct row seen so far, whatever the width of the rows
+        seen = FingerprintSet()
+
+        rows_in = rows_out = duplicates = chunks = 0
+        for chunk in self._read_chunks(source, read_kwargs):
+            chunks += 1
+            rows_in += len(chunk)
+
+            chunk = self.cleaner.handle_missing_values(chunk, self.strategy, fill_values=fill_values)
+
+            if self.dedupe and len(chunk):
+                keep = seen.add_new(row_fingerprints(chunk, numeric_cols))
+                duplicates += int((~keep).sum())
+                chunk = chunk[keep]
+
+            # Same conversions for every chunk, so the sink sees one stable schema
+            chunk = self.cleaner.fix_data_types(chunk, columns=convert_cols, downcast=False, categorize=False)
+            sink.write(chunk)
+            rows_out += len(chunk)
+
+        sink.close()
+        self.stats = {
+            "chunks": chunks,
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "duplicates_removed": duplicates,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        print(f"✅ Streaming clean finished: {self.stats}")
+        return self.stats